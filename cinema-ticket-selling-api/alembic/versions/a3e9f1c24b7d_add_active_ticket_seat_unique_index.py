@@ -0,0 +1,35 @@
+"""add_active_ticket_seat_unique_index
+
+Revision ID: a3e9f1c24b7d
+Revises: 5c81d3061078
+Create Date: 2026-10-16 09:12:41.503218
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3e9f1c24b7d'
+down_revision: Union[str, None] = '5c81d3061078'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # One active (non-cancelled) ticket per seat and screening.
+    # Existing duplicates must be cancelled before this index can be built.
+    op.create_index(
+        'uq_ticket_active_seat',
+        'ticket',
+        ['screening_id', 'seat_id'],
+        unique=True,
+        postgresql_where=sa.text("status <> 'cancelled'"),
+        sqlite_where=sa.text("status <> 'cancelled'"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('uq_ticket_active_seat', table_name='ticket')
@@ -0,0 +1,70 @@
+"""add_movie_full_text_search
+
+Revision ID: a7c4e2f90d36
+Revises: f3b8d0c2e915
+Create Date: 2026-10-16 19:02:55.174630
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7c4e2f90d36'
+down_revision: Union[str, None] = 'f3b8d0c2e915'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        # Generated column: maintained by PostgreSQL on every insert and update
+        op.execute(
+            "ALTER TABLE movie ADD COLUMN search_vector tsvector GENERATED ALWAYS AS ("
+            "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('english', coalesce(director, '')), 'B') || "
+            "setweight(to_tsvector('english', coalesce(genre::text, '')), 'B') || "
+            "setweight(to_tsvector('english', coalesce(description, '')), 'C')"
+            ") STORED"
+        )
+        op.execute('CREATE INDEX ix_movie_search_vector ON movie USING GIN (search_vector)')
+    elif dialect == 'sqlite':
+        # External-content FTS5 table kept in sync by triggers
+        op.execute(
+            "CREATE VIRTUAL TABLE movie_fts USING fts5("
+            "title, director, genre, description, "
+            "content='movie', content_rowid='id', "
+            "tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+        )
+        op.execute(
+            "CREATE TRIGGER movie_fts_after_insert AFTER INSERT ON movie BEGIN "
+            "INSERT INTO movie_fts(rowid, title, director, genre, description) "
+            "VALUES (new.id, new.title, new.director, new.genre, new.description); END"
+        )
+        op.execute(
+            "CREATE TRIGGER movie_fts_after_delete AFTER DELETE ON movie BEGIN "
+            "INSERT INTO movie_fts(movie_fts, rowid, title, director, genre, description) "
+            "VALUES ('delete', old.id, old.title, old.director, old.genre, old.description); END"
+        )
+        op.execute(
+            "CREATE TRIGGER movie_fts_after_update AFTER UPDATE ON movie BEGIN "
+            "INSERT INTO movie_fts(movie_fts, rowid, title, director, genre, description) "
+            "VALUES ('delete', old.id, old.title, old.director, old.genre, old.description); "
+            "INSERT INTO movie_fts(rowid, title, director, genre, description) "
+            "VALUES (new.id, new.title, new.director, new.genre, new.description); END"
+        )
+        op.execute("INSERT INTO movie_fts(movie_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == 'postgresql':
+        op.execute('DROP INDEX IF EXISTS ix_movie_search_vector')
+        op.execute('ALTER TABLE movie DROP COLUMN IF EXISTS search_vector')
+    elif dialect == 'sqlite':
+        for trigger in ('movie_fts_after_insert', 'movie_fts_after_delete', 'movie_fts_after_update'):
+            op.execute(f'DROP TRIGGER IF EXISTS {trigger}')
+        op.execute('DROP TABLE IF EXISTS movie_fts')
@@ -0,0 +1,68 @@
+"""add_movie_genre_table
+
+Revision ID: b5e1d8a3c720
+Revises: a7c4e2f90d36
+Create Date: 2026-10-17 09:42:18.604113
+
+"""
+import json
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5e1d8a3c720'
+down_revision: Union[str, None] = 'a7c4e2f90d36'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _normalize(raw):
+    # Older rows hold a bare string (or its JSON encoding) instead of a list
+    if isinstance(raw, str):
+        try:
+            raw = json.loads(raw)
+        except ValueError:
+            pass
+    if raw is None:
+        return None
+    if isinstance(raw, str):
+        raw = [raw]
+    names, seen = [], set()
+    for genre in raw:
+        if isinstance(genre, str) and genre.strip() and genre.strip().lower() not in seen:
+            seen.add(genre.strip().lower())
+            names.append(genre.strip())
+    return names or None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'movie_genre',
+        sa.Column('movie_id', sa.Integer(), nullable=False),
+        sa.Column('genre', sqlmodel.sql.sqltypes.AutoString(length=100), nullable=False),
+        sa.ForeignKeyConstraint(['movie_id'], ['movie.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('movie_id', 'genre')
+    )
+    op.create_index(op.f('ix_movie_genre_genre'), 'movie_genre', ['genre'], unique=False)
+
+    # Backfill: rewrite legacy genre values as lists and index every genre
+    connection = op.get_bind()
+    movie = sa.table('movie', sa.column('id', sa.Integer), sa.column('genre', sa.JSON(none_as_null=True)))
+    raw_movie = sa.table('movie', sa.column('id', sa.Integer), sa.column('genre', sa.Text))
+    movie_genre = sa.table('movie_genre', sa.column('movie_id', sa.Integer), sa.column('genre', sa.String))
+    rows = []
+    for movie_id, raw in connection.execute(sa.select(raw_movie.c.id, raw_movie.c.genre)).all():
+        genres = _normalize(raw)
+        connection.execute(movie.update().where(movie.c.id == movie_id).values(genre=genres))
+        rows.extend({'movie_id': movie_id, 'genre': genre.lower()} for genre in genres or [])
+    if rows:
+        connection.execute(movie_genre.insert(), rows)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_movie_genre_genre'), table_name='movie_genre')
+    op.drop_table('movie_genre')
@@ -0,0 +1,43 @@
+"""add_seat_hold_table
+
+Revision ID: b7d2e5f18a90
+Revises: a3e9f1c24b7d
+Create Date: 2026-10-16 11:04:27.318842
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7d2e5f18a90'
+down_revision: Union[str, None] = 'a3e9f1c24b7d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'seat_hold',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('screening_id', sa.Integer(), nullable=False),
+        sa.Column('seat_id', sa.Integer(), nullable=False),
+        sa.Column('expires_at', sa.DateTime(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['screening_id'], ['screening.id'], ),
+        sa.ForeignKeyConstraint(['seat_id'], ['seat.id'], ),
+        sa.ForeignKeyConstraint(['user_id'], ['user.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('screening_id', 'seat_id', name='uq_seat_hold_seat')
+    )
+    op.create_index(op.f('ix_seat_hold_user_id'), 'seat_hold', ['user_id'], unique=False)
+    op.create_index(op.f('ix_seat_hold_expires_at'), 'seat_hold', ['expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_seat_hold_expires_at'), table_name='seat_hold')
+    op.drop_index(op.f('ix_seat_hold_user_id'), table_name='seat_hold')
+    op.drop_table('seat_hold')
@@ -0,0 +1,56 @@
+"""add_seat_counters
+
+Revision ID: c4a8f2d61e3b
+Revises: b7d2e5f18a90
+Create Date: 2026-10-16 13:27:09.581402
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4a8f2d61e3b'
+down_revision: Union[str, None] = 'b7d2e5f18a90'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('room', sa.Column('capacity', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('screening', sa.Column('sold_count', sa.Integer(), nullable=False, server_default='0'))
+    op.create_table(
+        'screening_seat_sales',
+        sa.Column('screening_id', sa.Integer(), nullable=False),
+        sa.Column('seat_type', sqlmodel.sql.sqltypes.AutoString(length=50), nullable=False),
+        sa.Column('sold', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['screening_id'], ['screening.id'], ),
+        sa.PrimaryKeyConstraint('screening_id', 'seat_type')
+    )
+
+    # Backfill the counters from existing seats and active tickets
+    op.execute(
+        "UPDATE room SET capacity = "
+        "(SELECT COUNT(*) FROM seat WHERE seat.room_id = room.id)"
+    )
+    op.execute(
+        "UPDATE screening SET sold_count = "
+        "(SELECT COUNT(*) FROM ticket WHERE ticket.screening_id = screening.id "
+        "AND ticket.status <> 'cancelled')"
+    )
+    op.execute(
+        "INSERT INTO screening_seat_sales (screening_id, seat_type, sold) "
+        "SELECT ticket.screening_id, seat.seat_type, COUNT(*) FROM ticket "
+        "JOIN seat ON seat.id = ticket.seat_id "
+        "WHERE ticket.status <> 'cancelled' "
+        "GROUP BY ticket.screening_id, seat.seat_type"
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('screening_seat_sales')
+    op.drop_column('screening', 'sold_count')
+    op.drop_column('room', 'capacity')
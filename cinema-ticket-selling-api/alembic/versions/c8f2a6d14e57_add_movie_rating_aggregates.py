@@ -0,0 +1,41 @@
+"""add_movie_rating_aggregates
+
+Revision ID: c8f2a6d14e57
+Revises: b5e1d8a3c720
+Create Date: 2026-10-17 11:20:53.417902
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c8f2a6d14e57'
+down_revision: Union[str, None] = 'b5e1d8a3c720'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('movie', sa.Column('avg_rating', sa.Float(), nullable=True))
+    op.add_column('movie', sa.Column('review_count', sa.Integer(), nullable=False, server_default='0'))
+    op.create_index(op.f('ix_movie_avg_rating'), 'movie', ['avg_rating'], unique=False)
+    op.create_index(op.f('ix_movie_review_count'), 'movie', ['review_count'], unique=False)
+
+    # Backfill from the non-deleted reviews
+    op.execute(
+        'UPDATE movie SET '
+        'avg_rating = (SELECT AVG(reviews.rating) FROM reviews '
+        'WHERE reviews.movie_id = movie.id AND reviews.is_deleted = false), '
+        'review_count = (SELECT COUNT(reviews.id) FROM reviews '
+        'WHERE reviews.movie_id = movie.id AND reviews.is_deleted = false)'
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_movie_review_count'), table_name='movie')
+    op.drop_index(op.f('ix_movie_avg_rating'), table_name='movie')
+    op.drop_column('movie', 'review_count')
+    op.drop_column('movie', 'avg_rating')
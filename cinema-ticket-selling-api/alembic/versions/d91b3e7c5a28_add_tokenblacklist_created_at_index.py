@@ -0,0 +1,27 @@
+"""add_tokenblacklist_created_at_index
+
+Revision ID: d91b3e7c5a28
+Revises: c4a8f2d61e3b
+Create Date: 2026-10-16 15:48:33.027164
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd91b3e7c5a28'
+down_revision: Union[str, None] = 'c4a8f2d61e3b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Incremental refresh of the in-process revocation cache reads by created_at
+    op.create_index(op.f('ix_tokenblacklist_created_at'), 'tokenblacklist', ['created_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_tokenblacklist_created_at'), table_name='tokenblacklist')
@@ -0,0 +1,29 @@
+"""add_movie_pagination_indexes
+
+Revision ID: e2a7c94b1f06
+Revises: c8f2a6d14e57
+Create Date: 2026-10-17 16:05:12.481230
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2a7c94b1f06'
+down_revision: Union[str, None] = 'c8f2a6d14e57'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Keyset pagination seeks on (sort column, id) ranges of the movie listings
+    op.create_index('ix_movie_release_date_id', 'movie', ['release_date', 'id'], unique=False)
+    op.create_index('ix_movie_title_id', 'movie', ['title', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_movie_title_id', table_name='movie')
+    op.drop_index('ix_movie_release_date_id', table_name='movie')
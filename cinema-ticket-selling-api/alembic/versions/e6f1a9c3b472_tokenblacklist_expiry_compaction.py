@@ -0,0 +1,118 @@
+"""tokenblacklist_expiry_compaction
+
+Revision ID: e6f1a9c3b472
+Revises: d91b3e7c5a28
+Create Date: 2026-10-16 17:05:41.318250
+
+"""
+import os
+from datetime import datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e6f1a9c3b472'
+down_revision: Union[str, None] = 'd91b3e7c5a28'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Months of partitions created past today; the compactor keeps extending them
+PARTITION_MONTHS_AHEAD = 3
+
+
+def _partitioned() -> bool:
+    return (
+        op.get_bind().dialect.name == 'postgresql'
+        and os.getenv('TOKEN_BLACKLIST_PARTITIONED', 'false').lower() in ('1', 'true', 'yes')
+    )
+
+
+def _next_month(month: datetime) -> datetime:
+    return datetime(month.year + month.month // 12, month.month % 12 + 1, 1)
+
+
+def upgrade() -> None:
+    if not _partitioned():
+        # The batched purge selects expired rows by expires_at
+        op.create_index(op.f('ix_tokenblacklist_expires_at'), 'tokenblacklist', ['expires_at'], unique=False)
+        return
+
+    # Range-partition by month of expiry so the compactor can drop whole
+    # months. Unique constraints must include the partition key; a jti always
+    # has the same expiry, so (token_jti, expires_at) is still unique per token.
+    op.execute(
+        'CREATE TABLE tokenblacklist_partitioned ('
+        "id INTEGER NOT NULL DEFAULT nextval('tokenblacklist_id_seq'), "
+        'token_jti VARCHAR NOT NULL, '
+        'user_id INTEGER NOT NULL REFERENCES "user" (id), '
+        'expires_at TIMESTAMP WITHOUT TIME ZONE NOT NULL, '
+        'created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL, '
+        'PRIMARY KEY (id, expires_at)'
+        ') PARTITION BY RANGE (expires_at)'
+    )
+    op.execute('CREATE TABLE tokenblacklist_default PARTITION OF tokenblacklist_partitioned DEFAULT')
+
+    oldest = op.get_bind().execute(sa.text('SELECT MIN(expires_at) FROM tokenblacklist')).scalar()
+    today = datetime.utcnow()
+    month = datetime((oldest or today).year, (oldest or today).month, 1)
+    last = datetime(today.year, today.month, 1)
+    for _ in range(PARTITION_MONTHS_AHEAD):
+        last = _next_month(last)
+    while month <= last:
+        op.execute(
+            f'CREATE TABLE tokenblacklist_p{month:%Y%m} PARTITION OF tokenblacklist_partitioned '
+            f"FOR VALUES FROM ('{month:%Y-%m-%d}') TO ('{_next_month(month):%Y-%m-%d}')"
+        )
+        month = _next_month(month)
+
+    op.execute(
+        'INSERT INTO tokenblacklist_partitioned (id, token_jti, user_id, expires_at, created_at) '
+        'SELECT id, token_jti, user_id, expires_at, created_at FROM tokenblacklist'
+    )
+    op.execute('ALTER SEQUENCE tokenblacklist_id_seq OWNED BY NONE')
+    op.drop_table('tokenblacklist')
+    op.execute('ALTER TABLE tokenblacklist_partitioned RENAME TO tokenblacklist')
+    op.execute('ALTER SEQUENCE tokenblacklist_id_seq OWNED BY tokenblacklist.id')
+
+    op.create_index(op.f('ix_tokenblacklist_token_jti'), 'tokenblacklist', ['token_jti', 'expires_at'], unique=True)
+    op.create_index(op.f('ix_tokenblacklist_user_id'), 'tokenblacklist', ['user_id'], unique=False)
+    op.create_index(op.f('ix_tokenblacklist_created_at'), 'tokenblacklist', ['created_at'], unique=False)
+    op.create_index(op.f('ix_tokenblacklist_expires_at'), 'tokenblacklist', ['expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    is_partitioned = op.get_bind().execute(sa.text(
+        "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table JOIN pg_class ON pg_class.oid = partrelid "
+        "WHERE relname = 'tokenblacklist')"
+    )).scalar() if op.get_bind().dialect.name == 'postgresql' else False
+
+    if not is_partitioned:
+        op.drop_index(op.f('ix_tokenblacklist_expires_at'), table_name='tokenblacklist')
+        return
+
+    op.execute('ALTER SEQUENCE tokenblacklist_id_seq OWNED BY NONE')
+    op.execute('ALTER TABLE tokenblacklist RENAME TO tokenblacklist_partitioned')
+    for name in ('token_jti', 'user_id', 'created_at', 'expires_at'):
+        op.execute(f'DROP INDEX IF EXISTS ix_tokenblacklist_{name}')
+    op.execute(
+        'CREATE TABLE tokenblacklist ('
+        "id INTEGER NOT NULL DEFAULT nextval('tokenblacklist_id_seq') PRIMARY KEY, "
+        'token_jti VARCHAR NOT NULL, '
+        'user_id INTEGER NOT NULL REFERENCES "user" (id), '
+        'expires_at TIMESTAMP WITHOUT TIME ZONE NOT NULL, '
+        'created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL'
+        ')'
+    )
+    op.execute(
+        'INSERT INTO tokenblacklist (id, token_jti, user_id, expires_at, created_at) '
+        'SELECT id, token_jti, user_id, expires_at, created_at FROM tokenblacklist_partitioned'
+    )
+    op.execute('DROP TABLE tokenblacklist_partitioned CASCADE')
+    op.execute('ALTER SEQUENCE tokenblacklist_id_seq OWNED BY tokenblacklist.id')
+    op.create_index(op.f('ix_tokenblacklist_token_jti'), 'tokenblacklist', ['token_jti'], unique=True)
+    op.create_index(op.f('ix_tokenblacklist_user_id'), 'tokenblacklist', ['user_id'], unique=False)
+    op.create_index(op.f('ix_tokenblacklist_created_at'), 'tokenblacklist', ['created_at'], unique=False)
@@ -15,7 +15,37 @@ class Settings(BaseSettings):
     # Authentication
     SECRET_KEY: str = "your-secret-key-here-change-in-production-use-openssl-rand-hex-32"
     ALGORITHM: str = "HS256"
-    ACCESS_TOKEN_EXPIRE_MINUTES: int = 43200  # 30 days
+    ACCESS_TOKEN_EXPIRE_MINUTES: int = 15  # Short-lived; clients renew them with a refresh token
+    REFRESH_TOKEN_EXPIRE_DAYS: int = 30
+    BCRYPT_ROUNDS: int = 12  # bcrypt cost when calibration is disabled
+    BCRYPT_TARGET_HASH_MS: int = 0  # Calibrate the cost to this hashing time at startup (0 = off)
+    BCRYPT_MIN_ROUNDS: int = 10  # Calibration never picks a lower cost
+    PASSWORD_HASH_WORKERS: int = 2  # Processes dedicated to bcrypt
+    PASSWORD_HASH_MAX_PENDING: int = 32  # Queued password operations before returning 503
+    TOKEN_CLAIMS_CACHE_MAX_ENTRIES: int = 10000  # Verified tokens kept per worker
+    TOKEN_REVOCATION_REFRESH_SECONDS: int = 5  # Max delay before other workers' logouts apply
+    TOKEN_REVOCATION_OVERLAP_SECONDS: int = 60  # Re-read window for revocations committed late
+    TOKEN_BLACKLIST_PURGE_INTERVAL_SECONDS: int = 3600  # How often expired revocations are deleted
+    TOKEN_BLACKLIST_PURGE_BATCH_SIZE: int = 500  # Rows deleted per transaction
+    TOKEN_BLACKLIST_PARTITIONED: bool = False  # PostgreSQL only: monthly partitions by expires_at
+    USER_CACHE_TTL_SECONDS: int = 30  # Max age of a cached user in other worker processes
+    USER_CACHE_MAX_ENTRIES: int = 10000  # Users kept by the authentication cache
+    
+    # Catalog search
+    CATALOG_INDEX_ENABLED: bool = True  # Answer catalog search from the in-process index
+    CATALOG_INDEX_TTL_SECONDS: int = 300  # Max delay before other workers' catalog changes are searchable
+    FACET_CACHE_TTL_SECONDS: int = 60  # Max delay before other workers' catalog changes are counted
+    FACET_CACHE_MAX_ENTRIES: int = 1000  # Filter sets whose facet counts are kept per worker
+    
+    # Seat availability
+    SEAT_INDEX_TTL_SECONDS: int = 30  # Max age of a cached availability bitmap
+    SEAT_HOLD_MINUTES: int = 10  # Default duration of a seat hold
+    SEAT_HOLD_MAX_MINUTES: int = 30  # Longest hold a client may request
+    
+    # Booking queue (serializes bookings per screening in this process)
+    BOOKING_QUEUE_ENABLED: bool = False
+    BOOKING_QUEUE_BATCH_SIZE: int = 64  # Max bookings written per group commit
+    BOOKING_QUEUE_MAX_PENDING: int = 1000  # Queued bookings before returning 503
     
     model_config = SettingsConfigDict(
         env_file=".env",
@@ -1,7 +1,10 @@
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine
 from sqlmodel import SQLModel, create_engine, Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 from app.config import settings
 from app.models import (
-    User, Cinema, Room, Seat, Movie, Screening, Ticket, Review, Favorite, SearchHistory, TokenBlacklist
+    User, Cinema, Room, Seat, Movie, MovieGenre, Screening, ScreeningSeatSales, Ticket, SeatHold, Review, Favorite, SearchHistory, TokenBlacklist, RefreshToken
 )  
 
 # Create database engine
@@ -11,13 +14,51 @@ engine = create_engine(
     pool_pre_ping=True,   # Verify connections before using them
 )
 
+# Async drivers for the sync DATABASE_URL drivers
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def get_async_database_url(database_url: str) -> str:
+    """Translate a sync database URL to the matching async driver URL."""
+    url = make_url(database_url)
+    return url.set(drivername=ASYNC_DRIVERS.get(url.drivername, url.drivername)).render_as_string(
+        hide_password=False
+    )
+
+
+# Async engine for routes that must not block the event loop
+async_engine = create_async_engine(
+    get_async_database_url(settings.DATABASE_URL),
+    echo=settings.DEBUG,
+    pool_pre_ping=True,
+)
+
 
 def create_db_and_tables():
     """Create database tables based on SQLModel models."""
+    from app.services.movie_search import install_search_index
+    
     SQLModel.metadata.create_all(engine)
+    # Databases created before full-text search existed get their index here
+    with engine.begin() as connection:
+        install_search_index(connection)
 
 
 def get_session():
     """Dependency to get database session."""
     with Session(engine) as session:
         yield session
+
+
+async def get_async_session():
+    """Dependency to get an async database session.
+    
+    Objects are not expired on commit, so they can still be read afterwards
+    without triggering implicit (blocking) refreshes.
+    """
+    async with AsyncSession(async_engine, expire_on_commit=False) as session:
+        yield session
@@ -5,7 +5,13 @@ from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
 from app.config import settings
 from fastapi.middleware.cors import CORSMiddleware
-from app.database import create_db_and_tables
+from sqlmodel import Session
+
+from app.database import create_db_and_tables, engine
+from app.services.hold_reaper import hold_reaper
+from app.services.password_hasher import password_hasher
+from app.services.token_compaction import token_blacklist_compactor
+from app.services.token_revocation import revocation_cache
 from app.routers import (
     auth_router,
     cinema_router,
@@ -21,6 +27,7 @@ from app.routers import (
     recommendation_router,
     admin_router,
     cast_router,
+    search_router,
 )
 origins = [
     "http://localhost:4200",
@@ -44,6 +51,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Next-Cursor"],
 )
 
 # Mount static files for uploads
@@ -55,11 +63,26 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Next-Cursor"],
 )
 @app.on_event("startup")
 def on_startup():
     """Initialize database tables on application startup."""
     create_db_and_tables()
+    if settings.BCRYPT_TARGET_HASH_MS:
+        password_hasher.calibrate(settings.BCRYPT_TARGET_HASH_MS)
+    with Session(engine) as session:
+        revocation_cache.refresh(session)
+    hold_reaper.start(lambda: Session(engine))
+    token_blacklist_compactor.start(lambda: Session(engine))
+
+
+@app.on_event("shutdown")
+def on_shutdown():
+    """Stop background workers."""
+    hold_reaper.stop()
+    token_blacklist_compactor.stop()
+    password_hasher.shutdown()
 
 
 @app.get("/")
@@ -87,4 +110,5 @@ app.include_router(review_router)
 app.include_router(user_features_router)
 app.include_router(admin_router)
 app.include_router(cast_router)
+app.include_router(search_router)
 
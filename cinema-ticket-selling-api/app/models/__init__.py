@@ -3,13 +3,17 @@
 from app.models.user import User
 from app.models.cinema import Cinema, Room, Seat
 from app.models.movie import Movie
+from app.models.movie_genre import MovieGenre
 from app.models.screening import Screening
+from app.models.screening_seat_sales import ScreeningSeatSales
 from app.models.ticket import Ticket
+from app.models.seat_hold import SeatHold
 from app.models.cast import Cast
 from app.models.review import Review
 from app.models.favorite import Favorite
 from app.models.search_history import SearchHistory
 from app.models.token_blacklist import TokenBlacklist
+from app.models.refresh_token import RefreshToken
 
 __all__ = [
     "User",
@@ -17,10 +21,14 @@ __all__ = [
     "Room",
     "Seat",
     "Movie",
+    "MovieGenre",
     "Screening",
+    "ScreeningSeatSales",
     "Ticket",
+    "SeatHold",
     "Review",
     "Favorite",
     "SearchHistory",
     "TokenBlacklist",
+    "RefreshToken",
 ]
@@ -25,6 +25,7 @@ class Room(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
     name: str = Field(max_length=100)
     cinema_id: int = Field(foreign_key="cinema.id")
+    capacity: int = Field(default=0)  # Number of seats, maintained when seats are added
     created_at: datetime = Field(default_factory=datetime.utcnow)    
     cinema: Optional[Cinema] = Relationship()
 
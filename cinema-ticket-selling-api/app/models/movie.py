@@ -1,7 +1,7 @@
 from typing import Optional, List, Dict, Any
 from datetime import datetime, date
 from sqlmodel import SQLModel, Field, Column
-from sqlalchemy import JSON
+from sqlalchemy import JSON, Index
 
 
 class Movie(SQLModel, table=True):
@@ -15,6 +15,10 @@ class Movie(SQLModel, table=True):
     genre: Optional[List[str]] = Field(default=None, sa_column=Column(JSON))  
     rating: Optional[str] = Field(default=None, max_length=10)  # e.g., "PG-13", "R"
     
+    # Review aggregates, maintained by the review routes (see app/services/movie_ratings.py)
+    avg_rating: Optional[float] = Field(default=None, index=True)  # Average stars, None without reviews
+    review_count: int = Field(default=0, index=True)
+    
     cast: Optional[List[str]] = Field(default=None, sa_column=Column(JSON))  # List of actor names
     director: Optional[str] = Field(default=None, max_length=255)
     writers: Optional[List[str]] = Field(default=None, sa_column=Column(JSON))
@@ -44,3 +48,9 @@ class Movie(SQLModel, table=True):
     # Timestamps
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
+    
+    __table_args__ = (
+        # Keyset pagination seeks on (sort column, id) ranges (see app/services/pagination.py)
+        Index("ix_movie_release_date_id", "release_date", "id"),
+        Index("ix_movie_title_id", "title", "id"),
+    )
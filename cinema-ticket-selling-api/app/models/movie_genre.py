@@ -0,0 +1,84 @@
+"""MovieGenre model - indexed genre lookup for movies."""
+
+from typing import Iterable, List, Optional, Union
+
+from sqlalchemy import Column, ForeignKey, Integer, event, inspect
+from sqlmodel import SQLModel, Field, select
+
+from app.models.movie import Movie
+
+
+class MovieGenre(SQLModel, table=True):
+    """One row per (movie, genre); ``Movie.genre`` keeps the display names."""
+    __tablename__ = "movie_genre"
+
+    movie_id: int = Field(
+        sa_column=Column(Integer, ForeignKey("movie.id", ondelete="CASCADE"), primary_key=True)
+    )
+    genre: str = Field(max_length=100, primary_key=True, index=True)  # Lowercase genre name
+
+
+def genre_key(genre: str) -> str:
+    """Lookup key of a genre name (trimmed, lowercase)."""
+    return genre.strip().lower()
+
+
+def normalize_genres(genres: Union[None, str, Iterable[str]]) -> Optional[List[str]]:
+    """
+    Turn a genre value into a list of distinct, trimmed genre names.
+
+    A single string (as sent by older clients) becomes a one-item list;
+    empty names and case-insensitive duplicates are dropped.
+    """
+    if genres is None:
+        return None
+    if isinstance(genres, str):
+        genres = [genres]
+    names: List[str] = []
+    seen = set()
+    for genre in genres:
+        if not isinstance(genre, str) or not genre.strip() or genre_key(genre) in seen:
+            continue
+        seen.add(genre_key(genre))
+        names.append(genre.strip())
+    return names or None
+
+
+def in_genres(*genres: str):
+    """Filter clause matching movies with any of the given genres (exact, case-insensitive)."""
+    return Movie.id.in_(
+        select(MovieGenre.movie_id).where(MovieGenre.genre.in_([genre_key(genre) for genre in genres]))
+    )
+
+
+def _write_genres(connection, movie_id: int, genres: Optional[List[str]]) -> None:
+    table = MovieGenre.__table__
+    connection.execute(table.delete().where(table.c.movie_id == movie_id))
+    if genres:
+        connection.execute(table.insert(), [{"movie_id": movie_id, "genre": genre_key(genre)} for genre in genres])
+
+
+# The association rows are written with the movie in the same flush, so every
+# code path that saves a Movie keeps them in sync.
+@event.listens_for(Movie, "before_insert")
+@event.listens_for(Movie, "before_update")
+def _normalize_before_write(mapper, connection, target: Movie) -> None:
+    genres = normalize_genres(target.genre)
+    if genres != target.genre:
+        target.genre = genres
+
+
+@event.listens_for(Movie, "after_insert")
+def _insert_genres(mapper, connection, target: Movie) -> None:
+    _write_genres(connection, target.id, target.genre)
+
+
+@event.listens_for(Movie, "after_update")
+def _update_genres(mapper, connection, target: Movie) -> None:
+    if inspect(target).attrs.genre.history.has_changes():
+        _write_genres(connection, target.id, target.genre)
+
+
+@event.listens_for(Movie, "before_delete")
+def _delete_genres(mapper, connection, target: Movie) -> None:
+    _write_genres(connection, target.id, None)
@@ -0,0 +1,19 @@
+"""RefreshToken model for rotating refresh tokens."""
+
+from typing import Optional
+from datetime import datetime
+from sqlmodel import SQLModel, Field
+
+
+class RefreshToken(SQLModel, table=True):
+    """RefreshToken model - one opaque refresh token; each rotation adds a row to the same family."""
+    __tablename__ = "refresh_token"
+    
+    id: Optional[int] = Field(default=None, primary_key=True)
+    user_id: int = Field(foreign_key="user.id", index=True)
+    token_hash: str = Field(unique=True, index=True, max_length=64)  # SHA-256 of the token, never the token itself
+    family_id: str = Field(index=True, max_length=64)  # Shared by every token descended from one login
+    expires_at: datetime = Field(index=True)
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    used_at: Optional[datetime] = None  # Set once the token has been rotated
+    revoked_at: Optional[datetime] = None  # Set on logout, password change or detected reuse
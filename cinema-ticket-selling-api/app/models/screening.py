@@ -13,6 +13,12 @@ class Screening(SQLModel, table=True):
     room_id: int = Field(foreign_key="room.id")
     screening_time: datetime
     price: float = Field(gt=0)
+    sold_count: int = Field(default=0)  # Active (non-cancelled) tickets, maintained on booking
     created_at: datetime = Field(default_factory=datetime.utcnow)
     movie: Optional[Movie] = Relationship()
     room: Optional[Room] = Relationship()
+
+    @property
+    def available_seats_count(self) -> int:
+        """Seats left to sell, from the room capacity and the sold counter."""
+        return self.room.capacity - self.sold_count
@@ -0,0 +1,12 @@
+"""ScreeningSeatSales model for per-seat-type sales counters."""
+
+from sqlmodel import SQLModel, Field
+
+
+class ScreeningSeatSales(SQLModel, table=True):
+    """ScreeningSeatSales model - number of active tickets per screening and seat type."""
+    __tablename__ = "screening_seat_sales"
+    
+    screening_id: int = Field(foreign_key="screening.id", primary_key=True)
+    seat_type: str = Field(max_length=50, primary_key=True)
+    sold: int = Field(default=0)
@@ -0,0 +1,23 @@
+"""SeatHold model for temporary seat reservations."""
+
+from typing import Optional
+from datetime import datetime
+from sqlalchemy import UniqueConstraint
+from sqlmodel import SQLModel, Field
+
+
+class SeatHold(SQLModel, table=True):
+    """SeatHold model - reserves a seat for a screening until it expires or is booked."""
+    __tablename__ = "seat_hold"
+    
+    id: Optional[int] = Field(default=None, primary_key=True)
+    user_id: int = Field(foreign_key="user.id", index=True)
+    screening_id: int = Field(foreign_key="screening.id")
+    seat_id: int = Field(foreign_key="seat.id")
+    expires_at: datetime = Field(index=True)
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    
+    __table_args__ = (
+        # A seat can only be held by one user at a time per screening
+        UniqueConstraint("screening_id", "seat_id", name="uq_seat_hold_seat"),
+    )
@@ -1,5 +1,6 @@
 from typing import Optional
 from datetime import datetime
+from sqlalchemy import Index, text
 from sqlmodel import SQLModel, Field
 
 
@@ -14,6 +15,14 @@ class Ticket(SQLModel, table=True):
     booked_at: datetime = Field(default_factory=datetime.utcnow)
     confirmed_at: Optional[datetime] = None
     
-    class Config:
-        # Ensure one seat can only be booked once per screening
-        table_args = {"unique_together": [("screening_id", "seat_id")]}
+    __table_args__ = (
+        # Ensure one seat can only be booked once per screening (cancelled tickets excluded)
+        Index(
+            "uq_ticket_active_seat",
+            "screening_id",
+            "seat_id",
+            unique=True,
+            postgresql_where=text("status <> 'cancelled'"),
+            sqlite_where=text("status <> 'cancelled'"),
+        ),
+    )
@@ -10,5 +10,5 @@ class TokenBlacklist(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
     token_jti: str = Field(unique=True, index=True, max_length=255)  # JWT ID (jti claim)
     user_id: int = Field(foreign_key="user.id", index=True)
-    expires_at: datetime  # When the token naturally expires
-    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))  # When it was blacklisted
+    expires_at: datetime = Field(index=True)  # When the token naturally expires
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc), index=True)  # When it was blacklisted
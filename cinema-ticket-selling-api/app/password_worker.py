@@ -0,0 +1,20 @@
+"""bcrypt work run inside the password worker processes.
+
+The worker pool in ``app.services.password_hasher`` spawns fresh interpreters
+that import the functions they run by module path. This module lives outside
+the ``app.services`` package, whose ``__init__`` pulls in the database and
+every model, and imports nothing but bcrypt so that workers start quickly.
+"""
+
+import bcrypt
+
+
+def hash_password(password: str, rounds: int) -> str:
+    """Hash a password using bcrypt with the given cost."""
+    salt = bcrypt.gensalt(rounds=rounds)
+    return bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
+
+
+def check_password(password: str, hashed_password: str) -> bool:
+    """Verify a plain password against a bcrypt hash."""
+    return bcrypt.checkpw(password.encode('utf-8'), hashed_password.encode('utf-8'))
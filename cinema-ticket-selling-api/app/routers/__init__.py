@@ -13,6 +13,7 @@ from app.routers.favorite import router as favorite_router
 from app.routers.user_features import router as user_features_router, movie_router as recommendation_router
 from app.routers.admin import router as admin_router
 from app.routers.cast import router as cast_router
+from app.routers.search import router as search_router
 
 __all__ = [
     "auth_router",
@@ -29,5 +30,6 @@ __all__ = [
     "recommendation_router",
     "admin_router",
     "cast_router",
+    "search_router",
 ]
 
@@ -2,12 +2,14 @@
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
+from typing import Optional
 from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 from datetime import timedelta, datetime, timezone
-from jose import jwt, JWTError
+from jose import JWTError
 
 from app.config import settings
-from app.database import get_session
+from app.database import get_async_session, get_session
 from app.models.user import User
 from app.schemas.user import (
     UserCreate, 
@@ -21,30 +23,50 @@ from app.schemas.user import (
     PasswordResetResponse
 )
 from app.services.auth import (
-    get_password_hash,
-    authenticate_user,
+    authenticate_user_async,
     create_access_token,
+    decode_access_token,
     get_current_active_user,
     blacklist_token,
+    issue_refresh_token,
+    revoke_refresh_token,
+    revoke_refresh_tokens,
+    rotate_refresh_token,
     generate_reset_token,
     hash_reset_token,
     verify_reset_token,
     oauth2_scheme
 )
+from app.services.password_hasher import password_hasher
+from app.services.user_cache import user_cache
 
 router = APIRouter(prefix=f"{settings.API_V1_PREFIX}/auth", tags=["Authentication"])
 
 
+def _token_response(email: str, refresh_token: str) -> dict:
+    """Build the token response for a user with a fresh access token."""
+    access_token = create_access_token(
+        data={"sub": email},
+        expires_delta=timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    )
+    return {
+        "access_token": access_token,
+        "token_type": "bearer",
+        "refresh_token": refresh_token,
+        "expires_in": settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+    }
+
+
 @router.post(
     "/register",
     response_model=UserRead,
     status_code=status.HTTP_201_CREATED
 )
-def register_user(user: UserCreate, session: Session = Depends(get_session)):
+async def register_user(user: UserCreate, session: AsyncSession = Depends(get_async_session)):
     """Register a new user."""
     # Check if user already exists
     statement = select(User).where(User.email == user.email)
-    existing_user = session.exec(statement).first()
+    existing_user = (await session.exec(statement)).first()
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -55,21 +77,21 @@ def register_user(user: UserCreate, session: Session = Depends(get_session)):
     db_user = User(
         email=user.email,
         full_name=user.full_name,
-        hashed_password=get_password_hash(user.password)
+        hashed_password=await password_hasher.hash(user.password)
     )
     session.add(db_user)
-    session.commit()
-    session.refresh(db_user)
+    await session.commit()
+    await session.refresh(db_user)
     return db_user
 
 
 @router.post("/login", response_model=Token)
-def login(
+async def login(
     form_data: OAuth2PasswordRequestForm = Depends(),
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     """Login and get access token."""
-    user = authenticate_user(session, form_data.username, form_data.password)
+    user = await authenticate_user_async(session, form_data.username, form_data.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -77,12 +99,9 @@ def login(
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    # Create access token
-    access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    access_token = create_access_token(
-        data={"sub": user.email}, expires_delta=access_token_expires
-    )
-    return {"access_token": access_token, "token_type": "bearer"}
+    # Short-lived access token plus a refresh token starting a new family
+    refresh_token = await session.run_sync(issue_refresh_token, user.id)
+    return _token_response(user.email, refresh_token)
 
 
 @router.get("/me", response_model=UserRead)
@@ -101,17 +120,19 @@ def check_email_exists(email: str, session: Session = Depends(get_session)):
 
 @router.post("/logout", status_code=status.HTTP_200_OK)
 async def logout(
+    request: Optional[RefreshTokenRequest] = None,
     token: str = Depends(oauth2_scheme),
     session: Session = Depends(get_session),
     current_user: User = Depends(get_current_active_user)
 ):
     """
     Logout by blacklisting the current access token.
-    The token will be invalid for future requests.
+    The token will be invalid for future requests. If the refresh token is
+    sent as well, it is revoked together with every token rotated from it.
     """
     try:
         # Decode token to get jti and expiration
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        payload = decode_access_token(token)
         jti = payload.get("jti")
         exp = payload.get("exp")
         
@@ -127,6 +148,9 @@ async def logout(
         # Blacklist the token
         blacklist_token(session, jti, current_user.id, expires_at)
         
+        if request is not None:
+            revoke_refresh_token(session, current_user.id, request.token)
+        
         return {"message": "Successfully logged out"}
     
     except JWTError:
@@ -138,48 +162,16 @@ async def logout(
 
 @router.post("/refresh-token", response_model=Token)
 async def refresh_token(
-    token: str = Depends(oauth2_scheme),
-    session: Session = Depends(get_session)
+    request: RefreshTokenRequest,
+    session: AsyncSession = Depends(get_async_session)
 ):
     """
-    Refresh an access token by providing a valid non-expired token.
-    Returns a new access token with extended expiration.
+    Exchange a refresh token for a new access token and a new refresh token.
+    Each refresh token can only be used once; reusing one revokes every token
+    rotated from the same login.
     """
-    try:
-        # Decode and validate the token
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        email: str = payload.get("sub")
-        
-        if email is None:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid token"
-            )
-        
-        # Get user from database
-        statement = select(User).where(User.email == email)
-        user = session.exec(statement).first()
-        
-        if not user or not user.is_active:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="User not found or inactive"
-            )
-        
-        # Create new access token
-        access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-        new_access_token = create_access_token(
-            data={"sub": user.email}, 
-            expires_delta=access_token_expires
-        )
-        
-        return {"access_token": new_access_token, "token_type": "bearer"}
-    
-    except JWTError:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Could not validate token"
-        )
+    user, new_refresh_token = await session.run_sync(rotate_refresh_token, request.token)
+    return _token_response(user.email, new_refresh_token)
 
 
 @router.post("/forgot-password", response_model=PasswordResetResponse)
@@ -213,6 +205,7 @@ async def forgot_password(
     user.reset_token_expiry = datetime.now(timezone.utc) + timedelta(hours=1)
     session.add(user)
     session.commit()
+    user_cache.invalidate(user.email)
     
     # In production, send email here
     # For development, return the token
@@ -226,14 +219,14 @@ async def forgot_password(
 @router.post("/reset-password", status_code=status.HTTP_200_OK)
 async def reset_password(
     request: ResetPasswordRequest,
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     """
     Reset password using a valid reset token.
     The token must not be expired and can only be used once.
     """
     # Verify reset token and get user
-    user = verify_reset_token(session, request.token)
+    user = await session.run_sync(verify_reset_token, request.token)
     
     if not user:
         raise HTTPException(
@@ -242,14 +235,16 @@ async def reset_password(
         )
     
     # Update password
-    user.hashed_password = get_password_hash(request.new_password)
+    user.hashed_password = await password_hasher.hash(request.new_password)
     
     # Clear reset token (single use)
     user.reset_token = None
     user.reset_token_expiry = None
     
     session.add(user)
-    session.commit()
+    await session.commit()
+    user_cache.invalidate(user.email)
+    await session.run_sync(revoke_refresh_tokens, user.id)
     
     return {"message": "Password successfully reset"}
 
@@ -257,7 +252,7 @@ async def reset_password(
 @router.put("/change-password", status_code=status.HTTP_200_OK)
 async def change_password(
     request: ChangePasswordRequest,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_async_session),
     current_user: User = Depends(get_current_active_user)
 ):
     """
@@ -265,7 +260,8 @@ async def change_password(
     Requires the current password for verification.
     """
     # Verify current password
-    if not authenticate_user(session, current_user.email, request.current_password):
+    user = await authenticate_user_async(session, current_user.email, request.current_password)
+    if not user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Current password is incorrect"
@@ -279,11 +275,13 @@ async def change_password(
         )
     
     # Update password
-    current_user.hashed_password = get_password_hash(request.new_password)
-    current_user.updated_at = datetime.now(timezone.utc)
+    user.hashed_password = await password_hasher.hash(request.new_password)
+    user.updated_at = datetime.now(timezone.utc)
     
-    session.add(current_user)
-    session.commit()
+    session.add(user)
+    await session.commit()
+    user_cache.invalidate(user.email)
+    await session.run_sync(revoke_refresh_tokens, user.id)
     
     return {"message": "Password successfully changed"}
 
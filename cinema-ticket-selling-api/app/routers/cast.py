@@ -1,7 +1,7 @@
 """Cast routes for movie cast members."""
 
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlmodel import Session, select
 from datetime import datetime
 from app.config import settings
@@ -9,6 +9,9 @@ from app.database import get_session
 from app.models.cast import Cast
 from app.models.movie import Movie
 from app.schemas.cast import CastCreate, CastRead, CastUpdate
+from app.services.catalog_index import catalog_index
+from app.services.movie_facets import facet_cache
+from app.services.pagination import paginate, set_next_cursor
 
 router = APIRouter(prefix=f"{settings.API_V1_PREFIX}/casts", tags=["Casts"])
 
@@ -28,18 +31,23 @@ def create_cast(cast: CastCreate, session: Session = Depends(get_session)):
     session.add(db_cast)
     session.commit()
     session.refresh(db_cast)
+    catalog_index.refresh_movie(session, db_cast.movie_id)
+    facet_cache.clear()
     return db_cast
 
 
 @router.get("/", response_model=List[CastRead])
 def get_all_casts(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
     session: Session = Depends(get_session)
 ):
     """Get all cast members."""
-    statement = select(Cast).offset(skip).limit(limit)
-    casts = session.exec(statement).all()
+    order = [(Cast.id, False)]
+    casts = session.exec(paginate(select(Cast), order, cursor, skip, limit)).all()
+    set_next_cursor(response, casts, order, limit)
     return casts
 
 
@@ -93,6 +101,8 @@ def update_cast(
     session.add(db_cast)
     session.commit()
     session.refresh(db_cast)
+    catalog_index.refresh_movie(session, db_cast.movie_id)
+    facet_cache.clear()
     return db_cast
 
 
@@ -106,6 +116,9 @@ def delete_cast(cast_id: int, session: Session = Depends(get_session)):
             detail="Cast member not found"
         )
     
+    movie_id = cast.movie_id
     session.delete(cast)
     session.commit()
+    catalog_index.refresh_movie(session, movie_id)
+    facet_cache.clear()
     return None
@@ -1,7 +1,7 @@
 """Cinema and Room routes."""
 
 from collections import defaultdict
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, Response, status, Query
 from sqlmodel import Session, select, or_
 from typing import List, Optional
 from datetime import datetime, date
@@ -13,12 +13,14 @@ from app.models.screening import Screening
 from app.models.movie import Movie
 from app.models.user import User
 from app.schemas.cinema import CinemaCreate, CinemaRead, CinemaUpdate, CinemaListResponse, RoomCreate, RoomRead
-from app.schemas.movie import MovieRead, MovieListResponse
-from app.routers.movie import normalize_movie_genre
+from app.schemas.movie import MovieListResponse
 from app.schemas.screening import (
     MovieShowtimesRead,
 )
 from app.services.auth import get_current_admin_user
+from app.services.catalog_index import catalog_index, fetch_in_order
+from app.services.fast_json import movie_list_serializer
+from app.services.fieldsets import FIELDS_DESCRIPTION, load_fields, parse_fields
 
 router = APIRouter(prefix=settings.API_V1_PREFIX, tags=["Cinemas", "Rooms"])
 
@@ -44,6 +46,7 @@ def create_cinema(
     session.add(db_cinema)
     session.commit()
     session.refresh(db_cinema)
+    catalog_index.refresh_cinema(session, db_cinema.id)
     return db_cinema
 
 
@@ -69,7 +72,10 @@ def search_cinemas(
     ),
     session: Session = Depends(get_session),
 ):
-    """Search cinemas by name, city, or address."""
+    """Search cinemas by name, city, or address, most relevant first."""
+    if settings.CATALOG_INDEX_ENABLED:
+        return fetch_in_order(session, Cinema, catalog_index.search_cinemas(session, q))
+
     search_term = f"%{q}%"
     cinemas = session.exec(
         select(Cinema).where(
@@ -116,6 +122,7 @@ def update_cinema(
     session.add(cinema)
     session.commit()
     session.refresh(cinema)
+    catalog_index.refresh_cinema(session, cinema_id)
     return cinema
 
 
@@ -135,6 +142,7 @@ def delete_cinema(
     
     session.delete(cinema)
     session.commit()
+    catalog_index.refresh_cinema(session, cinema_id)
     return None
 
 
@@ -159,9 +167,11 @@ def get_cinema_movies(
     cinema_id: int,
     skip: int = 0,
     limit: int = 100,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
     session: Session = Depends(get_session)
 ):
     """Get all movies currently showing at a specific cinema."""
+    fieldset = parse_fields(fields)
     # Verify cinema exists
     cinema = session.get(Cinema, cinema_id)
     if not cinema:
@@ -189,12 +199,17 @@ def get_cinema_movies(
 
     # Get the actual movies with pagination
     movies = session.exec(
-        select(Movie).where(Movie.id.in_(movie_ids)).offset(skip).limit(limit)
+        select(Movie)
+        .options(*load_fields(Movie, fieldset))
+        .where(Movie.id.in_(movie_ids))
+        .offset(skip)
+        .limit(limit)
     ).all()
 
-    return MovieListResponse(
-        movies=[MovieRead(**normalize_movie_genre(movie)) for movie in movies],
-        total=total
+    # Same document as MovieListResponse, without validating every movie again
+    return Response(
+        content=b'{"movies":%s,"total":%d}' % (movie_list_serializer.dumps(movies, fieldset), total),
+        media_type="application/json"
     )
 
 
@@ -1,27 +1,27 @@
 """Movie routes."""
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlmodel import Session, select, or_
-from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Response, status, Query
+from sqlmodel import Session, select
+from typing import List, Optional, Union
 from datetime import datetime, date
 
 from app.config import settings
 from app.database import get_session
 from app.models.movie import Movie
+from app.models.movie_genre import in_genres
 from app.models.screening import Screening
 from app.models.user import User
 from app.models.cast import Cast
-from app.schemas.movie import MovieCreate, MovieRead, MovieUpdate
+from app.schemas.movie import MovieCreate, MovieFacetedListResponse, MovieRead, MovieUpdate
 from app.schemas.screening import ScreeningRead
 from app.schemas.cast import CastRead
 from app.services.auth import get_current_admin_user
-
-def normalize_movie_genre(movie: Movie) -> dict:
-    """Normalize movie data, converting genre string to list if needed."""
-    movie_dict = movie.model_dump()
-    if isinstance(movie_dict.get('genre'), str):
-        movie_dict['genre'] = [movie_dict['genre']] if movie_dict['genre'] else None
-    return movie_dict
+from app.services.catalog_index import catalog_index, fetch_in_order, ids_in
+from app.services.fast_json import movie_list_serializer
+from app.services.fieldsets import FIELDS_DESCRIPTION, load_fields, parse_fields
+from app.services.movie_facets import FACETS_DESCRIPTION, facet_cache, facet_key
+from app.services.movie_search import search_movies as search_movies_index
+from app.services.pagination import paginate, set_next_cursor
 
 router = APIRouter(prefix=f"{settings.API_V1_PREFIX}/movies", tags=["Movies"])
 
@@ -41,73 +41,78 @@ def create_movie(
     session.add(db_movie)
     session.commit()
     session.refresh(db_movie)
-    return normalize_movie_genre(db_movie)
+    catalog_index.refresh_movie(session, db_movie.id)
+    facet_cache.clear()
+    return db_movie
 
 
 @router.get("/", response_model=List[MovieRead])
 def list_movies(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
     session: Session = Depends(get_session)
 ):
     """List all movies."""
-    movies = session.exec(select(Movie).offset(skip).limit(limit)).all()
-    # Normalize genre fields for backward compatibility
-    return [MovieRead(**normalize_movie_genre(movie)) for movie in movies]
+    fieldset = parse_fields(fields)
+    order = [(Movie.id, False)]
+    query = select(Movie).options(*load_fields(Movie, fieldset))
+    movies = session.exec(paginate(query, order, cursor, skip, limit)).all()
+    set_next_cursor(response, movies, order, limit)
+    return movie_list_serializer.response(movies, response, fieldset)
 
 
 @router.get("/search", response_model=List[MovieRead])
 def search_movies(
-    q: str = Query(..., min_length=1, description="Search query for movie title, genre, cast, or director"),
+    q: str = Query(..., min_length=1, description="Search query for movie title, genre, director, or description"),
     skip: int = 0,
     limit: int = 100,
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
     session: Session = Depends(get_session)
 ):
-    """Search movies by title, genre, cast, or director."""
-    search_term = f"%{q.lower()}%"
-
-    # Search across multiple fields
-    statement = select(Movie).where(
-        or_(
-            Movie.title.ilike(search_term),
-            Movie.genre.ilike(search_term),
-            Movie.director.ilike(search_term),
-            Movie.description.ilike(search_term)
-        )
-    ).offset(skip).limit(limit)
-
-    movies = session.exec(statement).all()
-    # Normalize genre fields for backward compatibility
-    return [MovieRead(**normalize_movie_genre(movie)) for movie in movies]
+    """Search movies by title, genre, director, cast, or description, most relevant first."""
+    fieldset = parse_fields(fields)
+    options = load_fields(Movie, fieldset)
+    if settings.CATALOG_INDEX_ENABLED:
+        movie_ids = catalog_index.search_movies(session, q)
+        movies = fetch_in_order(session, Movie, movie_ids[skip:skip + limit], options)
+    else:
+        movies = search_movies_index(session, q, skip, limit, options)
+    return movie_list_serializer.response(movies, fields=fieldset)
 
 
-@router.get("/filter", response_model=List[MovieRead])
+@router.get("/filter", response_model=Union[List[MovieRead], MovieFacetedListResponse])
 def filter_movies(
+    response: Response,
     genre: Optional[str] = Query(None, description="Filter by genre"),
     rating: Optional[str] = Query(None, description="Filter by rating (e.g., PG, PG-13, R)"),
-    min_rating: Optional[float] = Query(None, ge=0, le=10, description="Minimum rating (0-10)"),
+    min_rating: Optional[float] = Query(None, ge=0, le=5, description="Minimum average review rating (1-5 stars)"),
     release_year: Optional[int] = Query(None, description="Filter by release year"),
     director: Optional[str] = Query(None, description="Filter by director"),
     country: Optional[str] = Query(None, description="Filter by country"),
     language: Optional[str] = Query(None, description="Filter by language"),
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
+    fields: Optional[str] = Query(None, description=FIELDS_DESCRIPTION),
+    facets: bool = Query(False, description=FACETS_DESCRIPTION),
     session: Session = Depends(get_session)
 ):
     """Filter movies by various criteria."""
+    fieldset = parse_fields(fields)
     query = select(Movie)
 
     # Apply filters
     if genre:
-        query = query.where(Movie.genre.ilike(f"%{genre}%"))
+        query = query.where(in_genres(genre))
 
     if rating:
         query = query.where(Movie.rating == rating)
 
     if min_rating is not None:
-        # Note: This assumes we might add a numeric rating field later
-        # For now, we'll filter by rating string presence
-        pass
+        query = query.where(Movie.avg_rating >= min_rating)
 
     if release_year:
         query = query.where(Movie.release_date >= date(release_year, 1, 1)).where(
@@ -123,18 +128,29 @@ def filter_movies(
     if language:
         query = query.where(Movie.language.ilike(f"%{language}%"))
 
-    # Order by release date (newest first)
-    query = query.order_by(Movie.release_date.desc())
-
-    movies = session.exec(query.offset(skip).limit(limit)).all()
-    # Normalize genre fields for backward compatibility
-    return [MovieRead(**normalize_movie_genre(movie)) for movie in movies]
-
-
-@router.get("/advanced-search", response_model=List[MovieRead])
+    facet_counts = None
+    if facets:
+        filters = {
+            "genre": genre, "rating": rating, "min_rating": min_rating, "release_year": release_year,
+            "director": director, "country": country, "language": language,
+        }
+        facet_counts = facet_cache.counts(session, facet_key("filter", filters), query)
+
+    # Order by release date (newest first); ties go the same way so the seek is one index range
+    order = [(Movie.release_date, True), (Movie.id, True)]
+    query = query.options(*load_fields(Movie, fieldset, Movie.release_date))
+    movies = session.exec(paginate(query, order, cursor, skip, limit)).all()
+    set_next_cursor(response, movies, order, limit)
+    if facet_counts is not None:
+        return movie_list_serializer.wrapped_response("movies", movies, {"facets": facet_counts}, response, fieldset)
+    return movie_list_serializer.response(movies, response, fieldset)
+
+
+@router.get("/advanced-search", response_model=Union[List[MovieRead], MovieFacetedListResponse])
 def advanced_search_movies(
+    response: Response,
     title: Optional[str] = Query(None, description="Search in movie title"),
-    genre: Optional[str] = Query(None, description="Search in movie genre"),
+    genre: Optional[str] = Query(None, description="Filter by genre"),
     director: Optional[str] = Query(None, description="Search in director name"),
     cast: Optional[str] = Query(None, description="Search in cast names"),
     description: Optional[str] = Query(None, description="Search in movie description"),
@@ -143,31 +159,49 @@ def advanced_search_movies(
     release_year_to: Optional[int] = Query(None, description="Release year to"),
     country: Optional[str] = Query(None, description="Filter by country"),
     language: Optional[str] = Query(None, description="Filter by language"),
-    sort_by: str = Query("release_date", description="Sort by: title, release_date, rating"),
+    sort_by: str = Query("release_date", description="Sort by: title, release_date, rating (average review rating)"),
     sort_order: str = Query("desc", description="Sort order: asc or desc"),
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
+    facets: bool = Query(False, description=FACETS_DESCRIPTION),
     session: Session = Depends(get_session)
 ):
     """Advanced search with multiple filters and sorting options."""
     query = select(Movie)
 
     # Apply search filters
-    if title:
-        query = query.where(Movie.title.ilike(f"%{title}%"))
-
     if genre:
-        query = query.where(Movie.genre.ilike(f"%{genre}%"))
+        query = query.where(in_genres(genre))
+
+    text_filters = {"title": title, "director": director, "cast": cast, "description": description}
+    if settings.CATALOG_INDEX_ENABLED:
+        # Each text filter only matches its own field of the catalog index; the
+        # matches are intersected in memory and passed on as inline IN lists
+        movie_ids = None
+        for field, value in text_filters.items():
+            if value:
+                matches = catalog_index.search_movies(session, value, fields=[field])
+                if movie_ids is None:
+                    movie_ids = matches
+                else:
+                    matching = set(matches)
+                    movie_ids = [movie_id for movie_id in movie_ids if movie_id in matching]
+        if movie_ids is not None:
+            query = query.where(ids_in(Movie.id, movie_ids))
+    else:
+        if title:
+            query = query.where(Movie.title.ilike(f"%{title}%"))
 
-    if director:
-        query = query.where(Movie.director.ilike(f"%{director}%"))
+        if director:
+            query = query.where(Movie.director.ilike(f"%{director}%"))
 
-    if cast:
-        # Join with Cast table to search in cast names
-        query = query.join(Cast, Movie.id == Cast.movie_id).where(Cast.actor_name.ilike(f"%{cast}%")).distinct()
+        if cast:
+            # Join with Cast table to search in cast names
+            query = query.join(Cast, Movie.id == Cast.movie_id).where(Cast.actor_name.ilike(f"%{cast}%")).distinct()
 
-    if description:
-        query = query.where(Movie.description.ilike(f"%{description}%"))
+        if description:
+            query = query.where(Movie.description.ilike(f"%{description}%"))
 
     if rating:
         query = query.where(Movie.rating == rating)
@@ -184,30 +218,33 @@ def advanced_search_movies(
     if language:
         query = query.where(Movie.language.ilike(f"%{language}%"))
 
+    facet_counts = None
+    if facets:
+        filters = {
+            "title": title, "genre": genre, "director": director, "cast": cast, "description": description,
+            "rating": rating, "release_year_from": release_year_from, "release_year_to": release_year_to,
+            "country": country, "language": language,
+        }
+        facet_counts = facet_cache.counts(session, facet_key("advanced-search", filters), query)
+
     # Apply sorting
+    descending = sort_order != "asc"
     if sort_by == "title":
-        if sort_order == "asc":
-            query = query.order_by(Movie.title.asc())
-        else:
-            query = query.order_by(Movie.title.desc())
-    elif sort_by == "release_date":
-        if sort_order == "asc":
-            query = query.order_by(Movie.release_date.asc())
-        else:
-            query = query.order_by(Movie.release_date.desc())
+        order = [(Movie.title, descending), (Movie.id, descending)]
     elif sort_by == "rating":
-        # For now, sort by title as fallback since we don't have numeric rating
-        if sort_order == "asc":
-            query = query.order_by(Movie.title.asc())
-        else:
-            query = query.order_by(Movie.title.desc())
+        # Movies without reviews come last
+        order = [(Movie.avg_rating, descending), (Movie.id, descending)]
+    elif sort_by == "release_date":
+        order = [(Movie.release_date, descending), (Movie.id, descending)]
     else:
         # Default sorting
-        query = query.order_by(Movie.release_date.desc())
+        order = [(Movie.release_date, True), (Movie.id, True)]
 
-    movies = session.exec(query.offset(skip).limit(limit)).all()
-    # Normalize genre fields for backward compatibility
-    return [MovieRead(**normalize_movie_genre(movie)) for movie in movies]
+    movies = session.exec(paginate(query, order, cursor, skip, limit)).all()
+    set_next_cursor(response, movies, order, limit)
+    if facet_counts is not None:
+        return movie_list_serializer.wrapped_response("movies", movies, {"facets": facet_counts}, response)
+    return movie_list_serializer.response(movies, response)
 
 
 @router.get("/{movie_id}", response_model=MovieRead)
@@ -219,7 +256,7 @@ def get_movie(movie_id: int, session: Session = Depends(get_session)):
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Movie with id {movie_id} not found"
         )
-    return normalize_movie_genre(movie)
+    return movie
 
 
 @router.get("/{movie_id}/cast", response_model=List[CastRead])
@@ -296,7 +333,9 @@ def update_movie(
     session.add(db_movie)
     session.commit()
     session.refresh(db_movie)
-    return normalize_movie_genre(db_movie)
+    catalog_index.refresh_movie(session, movie_id)
+    facet_cache.clear()
+    return db_movie
 
 
 @router.delete("/{movie_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -315,4 +354,6 @@ def delete_movie(
     
     session.delete(movie)
     session.commit()
+    catalog_index.refresh_movie(session, movie_id)
+    facet_cache.clear()
     return None
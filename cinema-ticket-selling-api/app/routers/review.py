@@ -1,12 +1,13 @@
 """Review routes for movie reviews."""
 
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlmodel import Session, select, func
+from sqlmodel import select, func
+from sqlmodel.ext.asyncio.session import AsyncSession
 from typing import Optional
 from datetime import datetime
 
 from app.config import settings
-from app.database import get_session
+from app.database import get_async_session
 from app.models.review import Review
 from app.models.movie import Movie
 from app.models.user import User
@@ -19,6 +20,8 @@ from app.schemas.review import (
     ReviewListResponse
 )
 from app.services.auth import get_current_active_user
+from app.services.movie_facets import facet_cache
+from app.services.movie_ratings import review_added, review_changed, review_removed
 
 router = APIRouter(prefix=f"{settings.API_V1_PREFIX}/movies", tags=["Reviews"])
 
@@ -28,11 +31,11 @@ async def create_review(
     movie_id: int,
     review_data: ReviewCreate,
     current_user: User = Depends(get_current_active_user),
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     """Create a new review for a movie."""
     # Check if movie exists
-    movie = session.get(Movie, movie_id)
+    movie = await session.get(Movie, movie_id)
     if not movie:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -40,13 +43,13 @@ async def create_review(
         )
     
     # Check if user already reviewed this movie
-    existing_review = session.exec(
+    existing_review = (await session.exec(
         select(Review).where(
             Review.user_id == current_user.id,
             Review.movie_id == movie_id,
             Review.is_deleted == False
         )
-    ).first()
+    )).first()
     
     if existing_review:
         raise HTTPException(
@@ -62,8 +65,10 @@ async def create_review(
     )
     
     session.add(review)
-    session.commit()
-    session.refresh(review)
+    await session.exec(review_added(movie_id, review.rating))
+    await session.commit()
+    facet_cache.invalidate_filter("min_rating")
+    await session.refresh(review)
     
     return ReviewRead(
         id=review.id,
@@ -88,11 +93,11 @@ async def get_movie_reviews(
     page_size: int = Query(10, ge=1, le=100, description="Items per page"),
     sort_by: str = Query("created_at", description="Sort by: created_at, rating, likes"),
     order: str = Query("desc", description="Order: asc or desc"),
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     """Get paginated reviews for a movie."""
     # Check if movie exists
-    movie = session.get(Movie, movie_id)
+    movie = await session.get(Movie, movie_id)
     if not movie:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -120,13 +125,13 @@ async def get_movie_reviews(
         Review.movie_id == movie_id,
         Review.is_deleted == False
     )
-    total = session.exec(count_query).one()
+    total = (await session.exec(count_query)).one()
     
     # Apply pagination
     offset = (page - 1) * page_size
     query = query.offset(offset).limit(page_size)
     
-    reviews_data = session.exec(query).all()
+    reviews_data = (await session.exec(query)).all()
     
     # Convert to ReviewRead objects with reviewer information
     reviews = []
@@ -158,11 +163,11 @@ async def get_movie_reviews(
 @router.get("/{movie_id}/reviews/summary", response_model=ReviewSummary)
 async def get_movie_reviews_summary(
     movie_id: int,
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     """Get review summary with rating breakdown for a movie."""
     # Check if movie exists
-    movie = session.get(Movie, movie_id)
+    movie = await session.get(Movie, movie_id)
     if not movie:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -170,12 +175,12 @@ async def get_movie_reviews_summary(
         )
     
     # Get all reviews for this movie
-    reviews = session.exec(
+    reviews = (await session.exec(
         select(Review).where(
             Review.movie_id == movie_id,
             Review.is_deleted == False
         )
-    ).all()
+    )).all()
     
     if not reviews:
         return ReviewSummary(
@@ -206,18 +211,18 @@ async def get_movie_reviews_summary(
 @router.get("/reviews/{review_id}", response_model=ReviewRead)
 async def get_review(
     review_id: int,
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     """Get a single review by ID."""
     # Query with user join
-    result = session.exec(
+    result = (await session.exec(
         select(Review, User.full_name, User.profile_picture_url).join(
             User, Review.user_id == User.id
         ).where(
             Review.id == review_id,
             Review.is_deleted == False
         )
-    ).first()
+    )).first()
     
     if not result:
         raise HTTPException(
@@ -248,10 +253,10 @@ async def update_review(
     review_id: int,
     review_update: ReviewUpdate,
     current_user: User = Depends(get_current_active_user),
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     """Update a review (only by the review author)."""
-    review = session.get(Review, review_id)
+    review = await session.get(Review, review_id)
     
     if not review or review.is_deleted:
         raise HTTPException(
@@ -267,14 +272,20 @@ async def update_review(
         )
     
     # Update review fields
+    old_rating = review.rating
     update_data = review_update.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(review, field, value)
     
     review.updated_at = datetime.utcnow()
     session.add(review)
-    session.commit()
-    session.refresh(review)
+    rating_changed = review.rating != old_rating
+    if rating_changed:
+        await session.exec(review_changed(review.movie_id, old_rating, review.rating))
+    await session.commit()
+    if rating_changed:
+        facet_cache.invalidate_filter("min_rating")
+    await session.refresh(review)
     
     return ReviewRead(
         id=review.id,
@@ -296,10 +307,10 @@ async def update_review(
 async def delete_review(
     review_id: int,
     current_user: User = Depends(get_current_active_user),
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     """Delete a review (soft delete, only by author)."""
-    review = session.get(Review, review_id)
+    review = await session.get(Review, review_id)
     
     if not review or review.is_deleted:
         raise HTTPException(
@@ -318,7 +329,9 @@ async def delete_review(
     review.is_deleted = True
     review.updated_at = datetime.utcnow()
     session.add(review)
-    session.commit()
+    await session.exec(review_removed(review.movie_id, review.rating))
+    await session.commit()
+    facet_cache.invalidate_filter("min_rating")
     
     return None
 
@@ -328,10 +341,10 @@ async def react_to_review(
     review_id: int,
     reaction: ReviewReaction,
     current_user: User = Depends(get_current_active_user),
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     """Add a like or dislike reaction to a review."""
-    review = session.get(Review, review_id)
+    review = await session.get(Review, review_id)
     
     if not review or review.is_deleted:
         raise HTTPException(
@@ -354,11 +367,11 @@ async def react_to_review(
     
     review.updated_at = datetime.utcnow()
     session.add(review)
-    session.commit()
-    session.refresh(review)
+    await session.commit()
+    await session.refresh(review)
     
     # Get user information for reviewer fields
-    user = session.get(User, review.user_id)
+    user = await session.get(User, review.user_id)
     
     return ReviewRead(
         id=review.id,
@@ -1,6 +1,7 @@
 """Screening routes."""
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, status, Query
+from sqlalchemy import delete
 from sqlmodel import Session, select
 from sqlalchemy.orm import selectinload
 from typing import List, Optional
@@ -11,10 +12,20 @@ from app.database import get_session
 from app.models.movie import Movie
 from app.models.cinema import Room, Seat
 from app.models.screening import Screening
+from app.models.screening_seat_sales import ScreeningSeatSales
 from app.models.user import User
-from app.schemas.screening import ScreeningCreate, ScreeningRead, ScreeningReadDetailed, ScreeningReadEnhanced
-from app.schemas.cinema import SeatRead
-from app.services.cinema import get_available_seats
+from app.schemas.screening import (
+    ScreeningCreate,
+    ScreeningRead,
+    ScreeningReadDetailed,
+    ScreeningReadEnhanced,
+    SeatMapRead,
+)
+from app.schemas.cinema import RoomLayoutRead, SeatRead
+from app.services.cinema import get_available_seats, get_seat_sales
+from app.services.http_cache import etag_matches, not_modified, quote_etag
+from app.services.pagination import paginate, set_next_cursor
+from app.services.seat_index import seat_index
 from app.services.auth import get_current_admin_user
 
 router = APIRouter(prefix=f"{settings.API_V1_PREFIX}/screenings", tags=["Screenings"])
@@ -56,12 +67,14 @@ def create_screening(
 
 @router.get("/", response_model=List[ScreeningReadDetailed])
 def list_screenings(
+    response: Response,
     movie_id: Optional[int] = Query(None, description="Filter by movie ID"),
     room_id: Optional[int] = Query(None, description="Filter by room ID"),
     cinema_id: Optional[int] = Query(None, description="Filter by cinema ID"),
     date: Optional[date] = Query(None, description="Filter by date (YYYY-MM-DD)"),
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
     session: Session = Depends(get_session)
 ):
     """List screenings with optional filters."""
@@ -89,7 +102,9 @@ def list_screenings(
             Screening.screening_time <= end_of_day
         )
     
-    screenings = session.exec(query.offset(skip).limit(limit)).all()
+    order = [(Screening.id, False)]
+    screenings = session.exec(paginate(query, order, cursor, skip, limit)).all()
+    set_next_cursor(response, screenings, order, limit)
     return screenings
 
 
@@ -110,10 +125,6 @@ def get_screening(screening_id: int, session: Session = Depends(get_session)):
             detail=f"Screening with id {screening_id} not found"
         )
     
-    # Get available seats count
-    available_seats = get_available_seats(session, screening_id)
-    available_seats_count = len(available_seats)
-    
     # Extract date from screening_time
     screening_date = screening.screening_time.date()
     
@@ -124,7 +135,8 @@ def get_screening(screening_id: int, session: Session = Depends(get_session)):
         screening_time=screening.screening_time,
         screening_date=screening_date,
         price=screening.price,
-        available_seats_count=available_seats_count,
+        available_seats_count=screening.available_seats_count,
+        sold_seats_by_type=get_seat_sales(session, screening_id),
         created_at=screening.created_at
     )
 
@@ -136,6 +148,40 @@ def get_screening_available_seats(screening_id: int, session: Session = Depends(
     return available_seats
 
 
+@router.get("/{screening_id}/seat-map", response_model=SeatMapRead)
+def get_screening_seat_map(
+    screening_id: int,
+    response: Response,
+    layout_version: Optional[str] = Query(None, description="Layout version already cached by the client"),
+    if_none_match: Optional[str] = Header(None),
+    session: Session = Depends(get_session)
+):
+    """Get the compact seat map of a screening (supports If-None-Match)."""
+    availability = seat_index.get(session, screening_id)
+    layout = availability.layout
+    include_layout = layout_version != layout.version
+    
+    # The body differs with and without the layout, so must the validator
+    etag = quote_etag(availability.etag + ("-layout" if include_layout else ""))
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "no-cache"
+    return SeatMapRead(
+        screening_id=screening_id,
+        layout_version=layout.version,
+        seat_count=len(layout.seats),
+        available_count=availability.available_count,
+        availability=availability.packed_availability(),
+        layout=RoomLayoutRead(
+            room_id=layout.room_id,
+            version=layout.version,
+            seats=list(layout.seats)
+        ) if include_layout else None
+    )
+
+
 @router.put("/{screening_id}", response_model=ScreeningRead)
 def update_screening(
     screening_id: int,
@@ -174,6 +220,7 @@ def update_screening(
     
     session.add(db_screening)
     session.commit()
+    seat_index.invalidate_screening(screening_id)
     session.refresh(db_screening)
     return db_screening
 
@@ -192,6 +239,8 @@ def delete_screening(
             detail=f"Screening with id {screening_id} not found"
         )
     
+    session.exec(delete(ScreeningSeatSales).where(ScreeningSeatSales.screening_id == screening_id))
     session.delete(db_screening)
     session.commit()
+    seat_index.invalidate_screening(screening_id)
     return None
@@ -0,0 +1,30 @@
+"""Catalog-wide search routes."""
+
+from fastapi import APIRouter, Depends, Query
+from sqlmodel import Session
+from typing import List
+
+from app.config import settings
+from app.database import get_session
+from app.schemas.search import SearchSuggestion
+from app.services.catalog_index import MAX_SUGGESTIONS, catalog_index
+
+router = APIRouter(prefix=f"{settings.API_V1_PREFIX}/search", tags=["Search"])
+
+
+@router.get("/suggest", response_model=List[SearchSuggestion])
+def suggest(
+    q: str = Query(..., min_length=1, description="What the user typed so far"),
+    limit: int = Query(10, ge=1, le=MAX_SUGGESTIONS, description="Maximum number of suggestions"),
+    session: Session = Depends(get_session)
+):
+    """
+    Typeahead suggestions among movie titles, actors, directors and cinema names.
+
+    Served from the in-process catalog index, so the database is only read
+    when the index is (re)built.
+    """
+    return [
+        SearchSuggestion(type=suggestion.kind, text=suggestion.text, id=suggestion.id)
+        for suggestion in catalog_index.suggest(session, q, limit)
+    ]
@@ -1,16 +1,18 @@
 """Seat routes."""
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Response, status
 from sqlmodel import Session, select
-from typing import List
+from typing import List, Optional
 
 from app.config import settings
 from app.database import get_session
-from app.models.cinema import Seat
+from app.models.cinema import Room, Seat
 from app.models.user import User
-from app.schemas.cinema import SeatRead, SeatBulkCreate
+from app.schemas.cinema import RoomLayoutRead, SeatRead, SeatBulkCreate
 from app.services.cinema import bulk_create_seats
 from app.services.auth import get_current_admin_user
+from app.services.http_cache import etag_matches, not_modified, quote_etag
+from app.services.seat_index import seat_index
 
 router = APIRouter(prefix=settings.API_V1_PREFIX, tags=["Seats"])
 
@@ -36,3 +38,29 @@ def list_room_seats(room_id: int, session: Session = Depends(get_session)):
     """List all seats in a room."""
     seats = session.exec(select(Seat).where(Seat.room_id == room_id)).all()
     return seats
+
+
+@router.get("/rooms/{room_id}/layout", response_model=RoomLayoutRead)
+def get_room_layout(
+    room_id: int,
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    session: Session = Depends(get_session)
+):
+    """Get the seat layout of a room, versioned for caching (supports If-None-Match)."""
+    # A cached layout answers conditional requests without a database query
+    layout = seat_index.cached_layout(room_id)
+    if layout is None:
+        if not session.get(Room, room_id):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Room with id {room_id} not found"
+            )
+        layout = seat_index.get_layout(session, room_id)
+    etag = quote_etag(layout.version)
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "no-cache"
+    return RoomLayoutRead(room_id=room_id, version=layout.version, seats=list(layout.seats))
@@ -1,6 +1,6 @@
 """Showtime routes - convenience endpoints for screenings."""
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, Response, status, Query
 from sqlmodel import Session, select
 from typing import List, Optional
 from datetime import datetime, date
@@ -12,17 +12,20 @@ from app.models.screening import Screening
 from app.schemas.screening import ScreeningRead
 from app.schemas.cinema import SeatRead
 from app.services.cinema import get_available_seats
+from app.services.pagination import paginate, set_next_cursor
 
 router = APIRouter(prefix=f"{settings.API_V1_PREFIX}/showtimes", tags=["Showtimes"])
 
 
 @router.get("/", response_model=List[ScreeningRead])
 def list_showtimes(
+    response: Response,
     date: Optional[date] = Query(None, description="Filter by date (YYYY-MM-DD)"),
     movie_id: Optional[int] = Query(None, description="Filter by movie ID"),
     cinema_id: Optional[int] = Query(None, description="Filter by cinema ID"),
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
     session: Session = Depends(get_session)
 ):
     """List all showtimes with optional filters (alias for screenings)."""
@@ -44,7 +47,9 @@ def list_showtimes(
             Screening.screening_time <= end_of_day
         )
     
-    screenings = session.exec(query.offset(skip).limit(limit)).all()
+    order = [(Screening.id, False)]
+    screenings = session.exec(paginate(query, order, cursor, skip, limit)).all()
+    set_next_cursor(response, screenings, order, limit)
     return screenings
 
 
@@ -63,11 +68,13 @@ def get_showtime(showtime_id: int, session: Session = Depends(get_session)):
 @router.get("/{showtime_id}/seats", response_model=List[SeatRead])
 def get_showtime_seats(showtime_id: int, session: Session = Depends(get_session)):
     """Get available seats for a showtime (alias for screening)."""
-    screening = session.get(Screening, showtime_id)
-    if not screening:
+    try:
+        available_seats = get_available_seats(session, showtime_id)
+    except HTTPException as exc:
+        if exc.status_code != status.HTTP_404_NOT_FOUND:
+            raise
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Showtime with id {showtime_id} not found"
         )
-    available_seats = get_available_seats(session, showtime_id)
     return available_seats
@@ -1,17 +1,37 @@
 """Ticket booking routes."""
 
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlmodel import Session, select
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Response, status, Query
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from typing import List, Optional
 from datetime import datetime
 
 from app.config import settings
-from app.database import get_session
+from app.database import get_async_session
 from app.models.user import User
 from app.models.ticket import Ticket
-from app.schemas.ticket import TicketCreate, TicketRead, TicketStatusUpdate, TicketConfirmPayment
+from app.schemas.ticket import (
+    BestSeatsBooking,
+    TicketCreate,
+    TicketRead,
+    TicketStatusUpdate,
+    TicketConfirmPayment,
+    SeatHoldCreate,
+    SeatHoldRead,
+)
 from app.services.auth import get_current_active_user, get_current_admin_user
-from app.services.cinema import book_tickets, cancel_ticket
+from app.services.booking_queue import booking_coordinator
+from app.services.seat_allocation import book_best_available
+from app.services.cinema import (
+    book_tickets,
+    cancel_ticket,
+    hold_seats,
+    record_seat_sales,
+    release_hold,
+)
+from app.services.pagination import paginate, set_next_cursor
+from app.services.seat_index import seat_index
 
 router = APIRouter(prefix=f"{settings.API_V1_PREFIX}/tickets", tags=["Tickets"])
 
@@ -24,11 +44,17 @@ router = APIRouter(prefix=f"{settings.API_V1_PREFIX}/tickets", tags=["Tickets"])
 async def book_tickets_endpoint(
     booking: TicketCreate,
     current_user: User = Depends(get_current_active_user),
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     """Book tickets for a screening (requires authentication)."""
-    tickets = book_tickets(
-        session=session,
+    if settings.BOOKING_QUEUE_ENABLED:
+        return await booking_coordinator.submit(
+            user_id=current_user.id,
+            screening_id=booking.screening_id,
+            seat_ids=booking.seat_ids
+        )
+    tickets = await session.run_sync(
+        book_tickets,
         user_id=current_user.id,
         screening_id=booking.screening_id,
         seat_ids=booking.seat_ids
@@ -36,15 +62,68 @@ async def book_tickets_endpoint(
     return tickets
 
 
+@router.post(
+    "/book-best",
+    response_model=List[TicketRead],
+    status_code=status.HTTP_201_CREATED
+)
+async def book_best_seats_endpoint(
+    booking: BestSeatsBooking,
+    current_user: User = Depends(get_current_active_user),
+    session: AsyncSession = Depends(get_async_session)
+):
+    """Book the best available block of adjacent seats (requires authentication)."""
+    tickets = await session.run_sync(
+        book_best_available,
+        user_id=current_user.id,
+        screening_id=booking.screening_id,
+        party_size=booking.party_size,
+        seat_type=booking.seat_type
+    )
+    return tickets
+
+
+@router.post(
+    "/hold",
+    response_model=List[SeatHoldRead],
+    status_code=status.HTTP_201_CREATED
+)
+async def hold_seats_endpoint(
+    hold: SeatHoldCreate,
+    current_user: User = Depends(get_current_active_user),
+    session: AsyncSession = Depends(get_async_session)
+):
+    """Hold seats for a few minutes before booking them (requires authentication)."""
+    holds = await session.run_sync(
+        hold_seats,
+        user_id=current_user.id,
+        screening_id=hold.screening_id,
+        seat_ids=hold.seat_ids,
+        minutes=hold.minutes
+    )
+    return holds
+
+
+@router.delete("/holds/{hold_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def release_hold_endpoint(
+    hold_id: int,
+    current_user: User = Depends(get_current_active_user),
+    session: AsyncSession = Depends(get_async_session)
+):
+    """Release a seat hold."""
+    await session.run_sync(release_hold, hold_id, current_user.id)
+    return None
+
+
 @router.get("/my-tickets", response_model=List[TicketRead])
 async def get_my_tickets(
     current_user: User = Depends(get_current_active_user),
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     """Get current user's tickets."""
-    tickets = session.exec(
+    tickets = (await session.exec(
         select(Ticket).where(Ticket.user_id == current_user.id)
-    ).all()
+    )).all()
     return tickets
 
 
@@ -52,10 +131,10 @@ async def get_my_tickets(
 async def get_ticket(
     ticket_id: int,
     current_user: User = Depends(get_current_active_user),
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     """Get a specific ticket by ID."""
-    ticket = session.get(Ticket, ticket_id)
+    ticket = await session.get(Ticket, ticket_id)
     if not ticket:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -76,10 +155,10 @@ async def get_ticket(
 async def cancel_ticket_endpoint(
     ticket_id: int,
     current_user: User = Depends(get_current_active_user),
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     """Cancel a ticket."""
-    cancel_ticket(session, ticket_id, current_user.id)
+    await session.run_sync(cancel_ticket, ticket_id, current_user.id)
     return None
 
 
@@ -88,10 +167,10 @@ async def confirm_payment(
     ticket_id: int,
     payment_data: TicketConfirmPayment,
     current_user: User = Depends(get_current_active_user),
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     """Confirm payment for a ticket and update status to confirmed."""
-    ticket = session.get(Ticket, ticket_id)
+    ticket = await session.get(Ticket, ticket_id)
     
     if not ticket:
         raise HTTPException(
@@ -118,19 +197,21 @@ async def confirm_payment(
     ticket.confirmed_at = datetime.utcnow()
     
     session.add(ticket)
-    session.commit()
-    session.refresh(ticket)
+    await session.commit()
+    await session.refresh(ticket)
     
     return ticket
 
 
 @router.get("/", response_model=List[TicketRead])
 async def list_all_tickets(
+    response: Response,
     skip: int = Query(0, ge=0, description="Number of records to skip"),
     limit: int = Query(100, ge=1, le=1000, description="Maximum number of records to return"),
+    cursor: Optional[str] = Query(None, description="Cursor from the X-Next-Cursor header of the previous page"),
     status_filter: str = Query(None, description="Filter by status: pending, confirmed, cancelled"),
     current_admin: User = Depends(get_current_admin_user),
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     """List all tickets (admin only endpoint)."""
     query = select(Ticket)
@@ -139,8 +220,9 @@ async def list_all_tickets(
     if status_filter:
         query = query.where(Ticket.status == status_filter)
     
-    query = query.offset(skip).limit(limit)
-    tickets = session.exec(query).all()
+    order = [(Ticket.id, False)]
+    tickets = (await session.exec(paginate(query, order, cursor, skip, limit))).all()
+    set_next_cursor(response, tickets, order, limit)
     
     return tickets
 
@@ -150,10 +232,10 @@ async def update_ticket_status(
     ticket_id: int,
     status_update: TicketStatusUpdate,
     current_admin: User = Depends(get_current_admin_user),
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     """Update ticket status (admin only endpoint)."""
-    ticket = session.get(Ticket, ticket_id)
+    ticket = await session.get(Ticket, ticket_id)
     
     if not ticket:
         raise HTTPException(
@@ -169,14 +251,31 @@ async def update_ticket_status(
             detail=f"Invalid status. Must be one of: {', '.join(valid_statuses)}"
         )
     
+    # Keep the sold counters in step when a ticket is cancelled or revived
+    was_active = ticket.status != "cancelled"
+    is_active = status_update.status != "cancelled"
+    if was_active != is_active:
+        await session.run_sync(
+            record_seat_sales, ticket.screening_id, [ticket.seat_id], 1 if is_active else -1
+        )
+    
     # Update status
     ticket.status = status_update.status
     if status_update.status == "confirmed" and not ticket.confirmed_at:
         ticket.confirmed_at = datetime.utcnow()
     
+    seat_id = ticket.seat_id
     session.add(ticket)
-    session.commit()
-    session.refresh(ticket)
+    try:
+        await session.commit()
+    except IntegrityError:
+        await session.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Seat {seat_id} is already booked for this screening"
+        )
+    seat_index.invalidate_screening(ticket.screening_id)
+    await session.refresh(ticket)
     
     return ticket
 
@@ -185,10 +284,10 @@ async def update_ticket_status(
 async def resend_ticket_confirmation(
     ticket_id: int,
     current_user: User = Depends(get_current_active_user),
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ):
     """Resend ticket confirmation email (simulated for now)."""
-    ticket = session.get(Ticket, ticket_id)
+    ticket = await session.get(Ticket, ticket_id)
     
     if not ticket:
         raise HTTPException(
@@ -2,15 +2,18 @@
 
 from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Query
 from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 from typing import Optional, List
 import os
 from datetime import datetime
 
 from app.config import settings
-from app.database import get_session
+from app.database import get_async_session, get_session
 from app.models.user import User
 from app.schemas.user import UserRead, UserUpdate, UserPreferences, UserPreferencesUpdate, UserCreate
-from app.services.auth import get_current_active_user, get_current_admin_user, get_password_hash
+from app.services.auth import get_current_active_user, get_current_admin_user
+from app.services.password_hasher import password_hasher
+from app.services.user_cache import user_cache
 
 router = APIRouter(prefix=f"{settings.API_V1_PREFIX}/users", tags=["Users"])
 
@@ -48,14 +51,14 @@ def list_all_users(
 
 
 @router.post("/admin/users/", response_model=UserRead, status_code=status.HTTP_201_CREATED)
-def create_admin_user(
+async def create_admin_user(
     user_data: UserCreate,
-    session: Session = Depends(get_session),
+    session: AsyncSession = Depends(get_async_session),
     current_admin: User = Depends(get_current_admin_user),
 ):
     """Create a new admin user (admin only)."""
     # Check if email already exists
-    existing_user = session.exec(select(User).where(User.email == user_data.email)).first()
+    existing_user = (await session.exec(select(User).where(User.email == user_data.email))).first()
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -65,13 +68,13 @@ def create_admin_user(
     new_admin = User(
         email=user_data.email,
         full_name=user_data.full_name,
-        hashed_password=get_password_hash(user_data.password),
+        hashed_password=await password_hasher.hash(user_data.password),
         is_admin=True,
         is_active=True,
     )
     session.add(new_admin)
-    session.commit()
-    session.refresh(new_admin)
+    await session.commit()
+    await session.refresh(new_admin)
     return new_admin
 
 
@@ -94,6 +97,7 @@ def update_user_status(
     user.updated_at = datetime.utcnow()
     session.add(user)
     session.commit()
+    user_cache.invalidate(user.email)
     session.refresh(user)
     return user
 
@@ -123,6 +127,7 @@ async def update_user_profile(
             )
 
     # Update user fields
+    previous_email = current_user.email
     update_data = user_update.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(current_user, field, value)
@@ -130,6 +135,7 @@ async def update_user_profile(
     current_user.updated_at = datetime.utcnow()
     session.add(current_user)
     session.commit()
+    user_cache.invalidate(previous_email, current_user.email)
     session.refresh(current_user)
 
     return current_user
@@ -149,6 +155,7 @@ async def update_user_preferences(
     current_user.updated_at = datetime.utcnow()
     session.add(current_user)
     session.commit()
+    user_cache.invalidate(current_user.email)
     session.refresh(current_user)
 
     return UserPreferences(
@@ -204,6 +211,7 @@ async def upload_profile_picture(
     current_user.updated_at = datetime.utcnow()
     session.add(current_user)
     session.commit()
+    user_cache.invalidate(current_user.email)
     session.refresh(current_user)
 
     return {
@@ -231,6 +239,7 @@ async def update_profile_picture_url(
     current_user.updated_at = datetime.utcnow()
     session.add(current_user)
     session.commit()
+    user_cache.invalidate(current_user.email)
     session.refresh(current_user)
 
     return {
@@ -250,6 +259,7 @@ async def delete_user_account(
     current_user.updated_at = datetime.utcnow()
     session.add(current_user)
     session.commit()
+    user_cache.invalidate(current_user.email)
 
     return None
 
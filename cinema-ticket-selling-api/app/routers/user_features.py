@@ -10,12 +10,12 @@ from app.database import get_session
 from app.models.search_history import SearchHistory
 from app.models.user import User
 from app.models.movie import Movie
-from app.models.review import Review
+from app.models.movie_genre import MovieGenre, in_genres
 from app.models.ticket import Ticket
 from app.schemas.search_history import SearchHistoryRead
 from app.schemas.movie import MovieRead
 from app.services.auth import get_current_active_user
-from app.routers.movie import normalize_movie_genre
+from app.services.fast_json import movie_list_serializer
 
 router = APIRouter(prefix=f"{settings.API_V1_PREFIX}/users/me", tags=["User"])
 
@@ -82,12 +82,9 @@ def get_recommended_movies(
     # Get genres from user's watched movies
     user_genres = set()
     if user_movies:
-        watched_movies = session.exec(
-            select(Movie).where(Movie.id.in_(user_movies))
-        ).all()
-        for movie in watched_movies:
-            if movie.genre:
-                user_genres.add(movie.genre.lower())
+        user_genres.update(session.exec(
+            select(MovieGenre.genre).where(MovieGenre.movie_id.in_(user_movies))
+        ).all())
     
     # Strategy 1: Get highly rated movies in user's preferred genres
     recommended_movies = []
@@ -98,7 +95,7 @@ def get_recommended_movies(
             movies_in_genre = session.exec(
                 select(Movie)
                 .where(
-                    Movie.genre.ilike(f"%{genre}%"),
+                    in_genres(genre),
                     Movie.id.not_in(user_movies) if user_movies else True
                 )
                 .limit(5)
@@ -107,25 +104,15 @@ def get_recommended_movies(
     
     # Strategy 2: Get highly rated movies from reviews
     highly_rated = session.exec(
-        select(Movie.id, func.avg(Review.rating).label('avg_rating'))
-        .join(Review, Review.movie_id == Movie.id)
-        .where(Review.is_deleted == False)
-        .group_by(Movie.id)
-        .having(func.avg(Review.rating) >= 4.0)
-        .order_by(func.avg(Review.rating).desc())
+        select(Movie)
+        .where(
+            Movie.avg_rating >= 4.0,
+            Movie.id.not_in(user_movies) if user_movies else True
+        )
+        .order_by(Movie.avg_rating.desc(), Movie.id)
         .limit(5)
     ).all()
-    
-    if highly_rated:
-        movie_ids = [movie_id for movie_id, _ in highly_rated]
-        movies = session.exec(
-            select(Movie)
-            .where(
-                Movie.id.in_(movie_ids),
-                Movie.id.not_in(user_movies) if user_movies else True
-            )
-        ).all()
-        recommended_movies.extend(movies)
+    recommended_movies.extend(highly_rated)
     
     # Strategy 3: Get popular movies (most booked)
     from app.models.screening import Screening
@@ -166,4 +153,4 @@ def get_recommended_movies(
         ).all()
         unique_movies.extend(recent)
     
-    return [MovieRead(**normalize_movie_genre(movie)) for movie in unique_movies[:limit]]
+    return movie_list_serializer.response(unique_movies[:limit])
@@ -44,6 +44,7 @@ class RoomRead(RoomBase):
     """Schema for reading a room."""
     id: int
     cinema_id: int
+    capacity: int = 0
     created_at: datetime
 
 class SeatBase(SQLModel):
@@ -66,5 +67,12 @@ class SeatBulkCreate(SQLModel):
     rows: int = Field(gt=0, description="Number of rows (e.g., 10 for rows A-J)")
     seats_per_row: int = Field(gt=0, description="Number of seats per row")
     seat_type: str = Field(default="standard", max_length=50)
+
+class RoomLayoutRead(SQLModel):
+    """Schema for the static seat layout of a room, in seat map bit order."""
+    room_id: int
+    version: str
+    seats: List[SeatRead]
+
 class RoomWithCinemaRead(RoomRead):
     cinema: CinemaRead
@@ -55,7 +55,7 @@ class MovieUpdate(SQLModel):
     title: Optional[str] = Field(default=None, max_length=255)
     description: Optional[str] = Field(default=None, max_length=2000)
     duration_minutes: Optional[int] = Field(default=None, gt=0)
-    genre: Optional[str] = Field(default=None, max_length=100)
+    genre: Optional[Union[str, List[str]]] = None  # A single genre is stored as a one-item list
     rating: Optional[str] = Field(default=None, max_length=10)
     
     cast: Optional[List[str]] = None
@@ -86,8 +86,10 @@ class MovieRead(SQLModel):
     title: str
     description: Optional[str] = None
     duration_minutes: int
-    genre: Optional[Union[str,List[str]]] = None  # Normalized to list
+    genre: Optional[List[str]] = None
     rating: Optional[str] = None
+    avg_rating: Optional[float] = None
+    review_count: int = 0
     
     # Cast & Crew
     cast: Optional[List[str]] = None
@@ -125,3 +127,9 @@ class MovieListResponse(SQLModel):
     """Schema for movie list with total count."""
     movies: List[MovieRead]
     total: int
+
+
+class MovieFacetedListResponse(SQLModel):
+    """Schema for a page of filtered movies with facet counts over all matches."""
+    movies: List[MovieRead]
+    facets: Dict[str, Dict[str, int]]  # Facet -> value -> number of matching movies
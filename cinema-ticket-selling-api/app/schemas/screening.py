@@ -1,9 +1,9 @@
 """Pydantic schemas for Screening-related API operations."""
 from datetime import datetime, date
-from typing import List
+from typing import Dict, List, Optional
 from sqlmodel import SQLModel, Field
 from app.schemas.movie import MovieRead
-from app.schemas.cinema import RoomWithCinemaRead
+from app.schemas.cinema import RoomLayoutRead, RoomWithCinemaRead
 
 
 class ScreeningBase(SQLModel):
@@ -27,6 +27,7 @@ class ScreeningReadDetailed(SQLModel):
     id: int
     screening_time: datetime
     price: float
+    available_seats_count: int
     movie: MovieRead
     room: RoomWithCinemaRead
 
@@ -40,9 +41,25 @@ class ScreeningReadEnhanced(SQLModel):
     screening_date: date
     price: float
     available_seats_count: int
+    sold_seats_by_type: Dict[str, int] = {}
     created_at: datetime
 
 
+class SeatMapRead(SQLModel):
+    """Compact seat availability of a screening.
+    
+    ``availability`` is a base64 bitmap over ``layout.seats``: bit ``i`` (least
+    significant bit of byte ``i // 8`` first) is set when seat ``i`` is free.
+    ``layout`` is omitted when the client already has ``layout_version``.
+    """
+    screening_id: int
+    layout_version: str
+    seat_count: int
+    available_count: int
+    availability: str
+    layout: Optional[RoomLayoutRead] = None
+
+
 class ShowtimeDetail(SQLModel):
     """Schema for showtime detail with ID and time."""
     id: int
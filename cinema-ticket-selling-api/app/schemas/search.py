@@ -0,0 +1,11 @@
+"""Schemas for catalog-wide search."""
+
+from typing import Optional
+from sqlmodel import SQLModel
+
+
+class SearchSuggestion(SQLModel):
+    """Schema for a typeahead suggestion."""
+    type: str  # movie, actor, director or cinema
+    text: str
+    id: Optional[int] = None  # Movie or cinema ID (None for people)
@@ -19,6 +19,13 @@ class TicketCreate(SQLModel):
     seat_ids: List[int]  # Can book multiple seats at once
 
 
+class BestSeatsBooking(SQLModel):
+    """Schema for booking the best available block of adjacent seats."""
+    screening_id: int
+    party_size: int = Field(gt=0, le=20, description="Number of adjacent seats to book")
+    seat_type: Optional[str] = Field(None, max_length=50, description="Only use seats of this type")
+
+
 class TicketRead(SQLModel):
     """Schema for reading a ticket."""
     id: int
@@ -31,6 +38,23 @@ class TicketRead(SQLModel):
     confirmed_at: Optional[datetime] = None
 
 
+class SeatHoldCreate(SQLModel):
+    """Schema for holding seats before booking them."""
+    screening_id: int
+    seat_ids: List[int]
+    minutes: Optional[int] = Field(None, gt=0, description="Hold duration in minutes")
+
+
+class SeatHoldRead(SQLModel):
+    """Schema for reading a seat hold."""
+    id: int
+    user_id: int
+    screening_id: int
+    seat_id: int
+    expires_at: datetime
+    created_at: datetime
+
+
 class TicketStatusUpdate(SQLModel):
     """Schema for updating ticket status."""
     status: str = Field(description="New status: pending, confirmed, or cancelled")
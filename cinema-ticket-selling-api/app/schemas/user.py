@@ -63,6 +63,8 @@ class Token(SQLModel):
     """Schema for token response."""
     access_token: str
     token_type: str
+    refresh_token: Optional[str] = None
+    expires_in: Optional[int] = None  # Access token lifetime in seconds
 
 
 class TokenData(SQLModel):
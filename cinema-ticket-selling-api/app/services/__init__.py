@@ -5,10 +5,12 @@ from app.services.auth import (
     get_password_hash,
     create_access_token,
     authenticate_user,
+    authenticate_user_async,
     get_current_user,
     get_current_active_user,
     oauth2_scheme,
 )
+from app.services.password_hasher import password_hasher
 from app.services.cinema import (
     bulk_create_seats,
     get_available_seats,
@@ -22,9 +24,11 @@ __all__ = [
     "get_password_hash",
     "create_access_token",
     "authenticate_user",
+    "authenticate_user_async",
     "get_current_user",
     "get_current_active_user",
     "oauth2_scheme",
+    "password_hasher",
     # Cinema
     "bulk_create_seats",
     "get_available_seats",
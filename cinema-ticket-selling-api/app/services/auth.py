@@ -1,33 +1,37 @@
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from typing import Optional, Tuple
 from jose import JWTError, jwt
-import bcrypt
 import secrets
 import hashlib
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy import update
 from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.config import settings
-from app.database import get_session
+from app.database import get_async_session
 from app.models.user import User
 from app.models.token_blacklist import TokenBlacklist
+from app.models.refresh_token import RefreshToken
 from app.schemas.user import TokenData
+from app.services.password_hasher import check_password, hash_password, password_hasher
+from app.services.token_claims import claims_cache
+from app.services.token_revocation import revocation_cache
+from app.services.user_cache import user_cache
 
 # OAuth2 scheme for token extraction
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl=f"{settings.API_V1_PREFIX}/auth/login")
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verify a plain password against a hashed password."""
-    return bcrypt.checkpw(plain_password.encode('utf-8'), hashed_password.encode('utf-8'))
+    """Verify a plain password against a hashed password (blocking; see password_hasher)."""
+    return check_password(plain_password, hashed_password)
 
 
 def get_password_hash(password: str) -> str:
-    """Hash a password using bcrypt."""
-    salt = bcrypt.gensalt()
-    hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
-    return hashed.decode('utf-8')
+    """Hash a password using bcrypt (blocking; see password_hasher)."""
+    return hash_password(password, password_hasher.rounds)
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
@@ -54,10 +58,32 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     return encoded_jwt
 
 
+def decode_access_token(token: str) -> dict:
+    """
+    Verify a JWT access token and return its claims.
+    
+    Verified claims are cached per token until it expires, so the signature
+    is only checked once per token in each worker process.
+    
+    Args:
+        token: Encoded JWT token string
+        
+    Returns:
+        Token claims
+        
+    Raises:
+        JWTError: If the token is invalid or expired
+    """
+    return claims_cache.decode(token)
+
+
 def authenticate_user(session: Session, email: str, password: str) -> Optional[User]:
     """
     Authenticate a user by email and password.
     
+    A stored hash created with a lower bcrypt cost than the current one is
+    replaced on success.
+    
     Args:
         session: Database session
         email: User email
@@ -73,6 +99,47 @@ def authenticate_user(session: Session, email: str, password: str) -> Optional[U
         return None
     if not verify_password(password, user.hashed_password):
         return None
+    if password_hasher.needs_rehash(user.hashed_password):
+        # Upgrade the stored hash to the current cost while the password is known
+        user.hashed_password = get_password_hash(password)
+        session.add(user)
+        session.commit()
+        user_cache.invalidate(user.email)
+    return user
+
+
+async def authenticate_user_async(session: AsyncSession, email: str, password: str) -> Optional[User]:
+    """
+    Authenticate a user without blocking the event loop.
+    
+    The user is loaded with the async session and the bcrypt check runs in
+    the password worker pool. A stored hash created with a lower bcrypt cost
+    than the current one is replaced on success.
+    
+    Args:
+        session: Async database session
+        email: User email
+        password: Plain password
+        
+    Returns:
+        User object if authentication successful, None otherwise
+        
+    Raises:
+        HTTPException: 503 if the password workers are overloaded
+    """
+    statement = select(User).where(User.email == email)
+    user = (await session.exec(statement)).first()
+    
+    if not user:
+        return None
+    if not await password_hasher.verify(password, user.hashed_password):
+        return None
+    if password_hasher.needs_rehash(user.hashed_password):
+        # Upgrade the stored hash to the current cost while the password is known
+        user.hashed_password = await password_hasher.hash(password)
+        session.add(user)
+        await session.commit()
+        user_cache.invalidate(user.email)
     return user
 
 
@@ -80,6 +147,9 @@ def is_token_blacklisted(session: Session, jti: str) -> bool:
     """
     Check if a token is blacklisted.
     
+    Answered from the in-process revocation cache; the session is only used
+    when the cache is due for its periodic refresh.
+    
     Args:
         session: Database session
         jti: JWT ID (jti claim)
@@ -87,9 +157,9 @@ def is_token_blacklisted(session: Session, jti: str) -> bool:
     Returns:
         True if token is blacklisted, False otherwise
     """
-    statement = select(TokenBlacklist).where(TokenBlacklist.token_jti == jti)
-    blacklisted = session.exec(statement).first()
-    return blacklisted is not None
+    if revocation_cache.needs_refresh():
+        revocation_cache.refresh(session)
+    return revocation_cache.is_revoked(jti)
 
 
 def blacklist_token(session: Session, jti: str, user_id: int, expires_at: datetime) -> None:
@@ -109,6 +179,148 @@ def blacklist_token(session: Session, jti: str, user_id: int, expires_at: dateti
     )
     session.add(blacklist_entry)
     session.commit()
+    revocation_cache.add(jti, expires_at)
+
+
+def hash_refresh_token(token: str) -> str:
+    """
+    Hash a refresh token for storage and lookup.
+    
+    Args:
+        token: Plain refresh token
+        
+    Returns:
+        SHA256 hash of the token
+    """
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def issue_refresh_token(session: Session, user_id: int, family_id: Optional[str] = None) -> str:
+    """
+    Create and store a new opaque refresh token.
+    
+    Args:
+        session: Database session
+        user_id: User ID
+        family_id: Family of the token being rotated (a new family for a fresh login)
+        
+    Returns:
+        The plain refresh token (only its hash is stored)
+    """
+    token = secrets.token_urlsafe(48)
+    session.add(RefreshToken(
+        user_id=user_id,
+        token_hash=hash_refresh_token(token),
+        family_id=family_id or secrets.token_hex(16),
+        expires_at=datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+    ))
+    session.commit()
+    return token
+
+
+def revoke_refresh_tokens(session: Session, user_id: int, family_id: Optional[str] = None) -> int:
+    """
+    Revoke the active refresh tokens of a user, or of one of their token families.
+    
+    Args:
+        session: Database session
+        user_id: User ID
+        family_id: Only revoke this family (all families if None)
+        
+    Returns:
+        Number of tokens revoked
+    """
+    statement = update(RefreshToken).where(
+        RefreshToken.user_id == user_id,
+        RefreshToken.revoked_at.is_(None)
+    )
+    if family_id is not None:
+        statement = statement.where(RefreshToken.family_id == family_id)
+    revoked = session.exec(statement.values(revoked_at=datetime.utcnow())).rowcount
+    session.commit()
+    return revoked
+
+
+def revoke_refresh_token(session: Session, user_id: int, token: str) -> int:
+    """
+    Revoke a user's refresh token and every token rotated from the same login.
+    
+    Args:
+        session: Database session
+        user_id: ID of the user the token must belong to
+        token: Plain refresh token
+        
+    Returns:
+        Number of tokens revoked (0 if the token is unknown or not the user's)
+    """
+    stored = session.exec(
+        select(RefreshToken).where(RefreshToken.token_hash == hash_refresh_token(token))
+    ).first()
+    if stored is None or stored.user_id != user_id:
+        return 0
+    return revoke_refresh_tokens(session, user_id, stored.family_id)
+
+
+def rotate_refresh_token(session: Session, token: str) -> Tuple[User, str]:
+    """
+    Exchange a refresh token for a new one in the same family.
+    
+    Every refresh token can be used once. Presenting a token that was already
+    rotated means it was copied, so the whole family is revoked and the
+    legitimate holder has to log in again.
+    
+    Args:
+        session: Database session
+        token: Plain refresh token
+        
+    Returns:
+        Tuple of (user, new plain refresh token)
+        
+    Raises:
+        HTTPException: If the token is unknown, expired, reused or revoked,
+            or the user is inactive
+    """
+    now = datetime.utcnow()
+    stored = session.exec(
+        select(RefreshToken).where(RefreshToken.token_hash == hash_refresh_token(token))
+    ).first()
+    if stored is None or stored.expires_at <= now:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid or expired refresh token"
+        )
+    user_id, family_id = stored.user_id, stored.family_id
+    
+    # Claim the token atomically so two concurrent refreshes cannot both succeed
+    claimed = False
+    if stored.used_at is None and stored.revoked_at is None:
+        result = session.exec(
+            update(RefreshToken)
+            .where(
+                RefreshToken.id == stored.id,
+                RefreshToken.used_at.is_(None),
+                RefreshToken.revoked_at.is_(None)
+            )
+            .values(used_at=now)
+        )
+        claimed = result.rowcount == 1
+    if not claimed:
+        session.rollback()
+        revoke_refresh_tokens(session, user_id, family_id)
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Refresh token has already been used"
+        )
+    
+    user = session.get(User, user_id)
+    if not user or not user.is_active:
+        session.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="User not found or inactive"
+        )
+    
+    return user, issue_refresh_token(session, user_id, family_id)
 
 
 def generate_reset_token() -> str:
@@ -156,14 +368,18 @@ def verify_reset_token(session: Session, token: str) -> Optional[User]:
 
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
-    session: Session = Depends(get_session)
+    session: AsyncSession = Depends(get_async_session)
 ) -> User:
     """
     Get the current user from the JWT token.
     
+    The user is loaded without blocking the event loop (or taken from the
+    user cache) and returned detached, so routes can attach it to their own
+    (sync or async) session.
+    
     Args:
         token: JWT token from Authorization header
-        session: Database session
+        session: Async database session
         
     Returns:
         Current user object
@@ -178,7 +394,7 @@ async def get_current_user(
     )
     
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        payload = decode_access_token(token)
         email: str = payload.get("sub")
         jti: str = payload.get("jti")
         
@@ -186,7 +402,9 @@ async def get_current_user(
             raise credentials_exception
         
         # Check if token is blacklisted
-        if is_token_blacklisted(session, jti):
+        if revocation_cache.needs_refresh():
+            await session.run_sync(revocation_cache.refresh)
+        if revocation_cache.is_revoked(jti):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Token has been revoked",
@@ -197,11 +415,17 @@ async def get_current_user(
     except JWTError:
         raise credentials_exception
     
+    user = user_cache.get(token_data.email)
+    if user is not None:
+        return user
+    
     statement = select(User).where(User.email == token_data.email)
-    user = session.exec(statement).first()
+    user = (await session.exec(statement)).first()
     
     if user is None:
         raise credentials_exception
+    session.expunge(user)
+    user_cache.put(user)
     return user
 
 
@@ -0,0 +1,208 @@
+"""Single-writer booking queue for hot screenings.
+
+When ``settings.BOOKING_QUEUE_ENABLED`` is set, booking requests are routed
+through one in-process queue per screening instead of racing each other in
+the database. A worker drains the queue in batches, checks every request
+against the cached availability bitmap (and the seats already claimed earlier
+in the same batch) and writes all non-conflicting tickets in a single commit.
+
+Requests that the cached state cannot decide on their own (seats that look
+taken, unknown seats, duplicates) go through the regular ``book_tickets``
+path, so clients get exactly the same errors as without the queue. The
+partial unique index on active tickets stays the final arbiter: if a group
+commit collides with a booking made by another process, the batch is retried
+request by request.
+"""
+
+import asyncio
+from collections import deque
+from datetime import datetime
+from typing import Callable, Deque, Dict, List, Optional
+
+from fastapi import HTTPException, status
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session, select
+
+from app.config import settings
+from app.models.seat_hold import SeatHold
+from app.models.ticket import Ticket
+from app.services.cinema import _get_bookable_screening, book_tickets, record_seat_sales
+from app.services.seat_index import seat_index
+
+
+class BookingRequest:
+    """A pending booking and the future its caller is waiting on."""
+
+    __slots__ = ("user_id", "seat_ids", "future")
+
+    def __init__(self, user_id: int, seat_ids: List[int], future: asyncio.Future):
+        self.user_id = user_id
+        self.seat_ids = seat_ids
+        self.future = future
+
+
+class BookingCoordinator:
+    """Serializes bookings per screening and group-commits their tickets."""
+
+    def __init__(self, session_factory: Optional[Callable[[], Session]] = None):
+        self.session_factory = session_factory
+        self._queues: Dict[int, Deque[BookingRequest]] = {}
+        self._workers: Dict[int, asyncio.Task] = {}
+
+    def _new_session(self) -> Session:
+        if self.session_factory is not None:
+            return self.session_factory()
+        from app.database import engine
+        return Session(engine)
+
+    @property
+    def pending(self) -> int:
+        """Number of queued requests across all screenings."""
+        return sum(len(queue) for queue in self._queues.values())
+
+    async def submit(self, user_id: int, screening_id: int, seat_ids: List[int]) -> List[Ticket]:
+        """
+        Queue a booking and wait for its outcome.
+
+        Args:
+            user_id: ID of the user booking tickets
+            screening_id: ID of the screening
+            seat_ids: List of seat IDs to book
+
+        Returns:
+            List of created tickets
+
+        Raises:
+            HTTPException: Same errors as ``book_tickets``, or 503 if the
+                queue is full
+        """
+        if self.pending >= settings.BOOKING_QUEUE_MAX_PENDING:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Booking queue is full, please retry"
+            )
+
+        future = asyncio.get_running_loop().create_future()
+        self._queues.setdefault(screening_id, deque()).append(
+            BookingRequest(user_id, list(seat_ids), future)
+        )
+        if screening_id not in self._workers:
+            self._workers[screening_id] = asyncio.create_task(self._run(screening_id))
+        return await future
+
+    async def _run(self, screening_id: int) -> None:
+        queue = self._queues[screening_id]
+        while True:
+            batch = [queue.popleft() for _ in range(min(len(queue), settings.BOOKING_QUEUE_BATCH_SIZE))]
+            try:
+                results = await asyncio.to_thread(self._process_batch, screening_id, batch)
+            except Exception as exc:
+                results = [exc] * len(batch)
+
+            # Retire the worker before waking callers so a new submit never
+            # lands in a queue nobody drains
+            finished = not queue
+            if finished:
+                del self._queues[screening_id]
+                del self._workers[screening_id]
+            for request, result in zip(batch, results):
+                if request.future.done():
+                    continue
+                if isinstance(result, BaseException):
+                    request.future.set_exception(result)
+                else:
+                    request.future.set_result(result)
+            if finished:
+                return
+
+    def _process_batch(self, screening_id: int, batch: List[BookingRequest]) -> List[object]:
+        """Book a batch of requests for one screening; returns tickets or exceptions."""
+        results: List[object] = [None] * len(batch)
+        with self._new_session() as session:
+            try:
+                screening = _get_bookable_screening(session, screening_id)
+                availability = seat_index.get(session, screening_id)
+            except HTTPException as exc:
+                return [exc] * len(batch)
+
+            # Holds created by other processes are not in the bitmap yet
+            requested_seat_ids = {seat_id for request in batch for seat_id in request.seat_ids}
+            held_seat_ids = set(session.exec(
+                select(SeatHold.seat_id).where(
+                    SeatHold.screening_id == screening_id,
+                    SeatHold.seat_id.in_(requested_seat_ids),
+                    SeatHold.expires_at > datetime.utcnow()
+                )
+            ).all())
+
+            claimed = availability.booked
+            grouped: List[int] = []
+            fallback: List[int] = []
+            for index, request in enumerate(batch):
+                mask = availability.layout.mask_for(request.seat_ids)
+                clean = (
+                    request.seat_ids
+                    and len(set(request.seat_ids)) == len(request.seat_ids)
+                    and mask.bit_count() == len(request.seat_ids)
+                    and not mask & claimed
+                    and held_seat_ids.isdisjoint(request.seat_ids)
+                )
+                if clean:
+                    claimed |= mask
+                    grouped.append(index)
+                else:
+                    fallback.append(index)
+
+            tickets_by_request = {
+                index: [
+                    Ticket(
+                        user_id=batch[index].user_id,
+                        screening_id=screening_id,
+                        seat_id=seat_id,
+                        price=screening.price,
+                        status="booked"
+                    )
+                    for seat_id in batch[index].seat_ids
+                ]
+                for index in grouped
+            }
+            grouped_seat_ids = [seat_id for index in grouped for seat_id in batch[index].seat_ids]
+            for tickets in tickets_by_request.values():
+                session.add_all(tickets)
+            try:
+                session.flush()
+                ticket_ids = [ticket.id for tickets in tickets_by_request.values() for ticket in tickets]
+                record_seat_sales(session, screening_id, grouped_seat_ids, 1)
+                session.commit()
+            except IntegrityError:
+                # Another process booked one of these seats: fall back to
+                # booking every request on its own
+                session.rollback()
+                seat_index.invalidate_screening(screening_id)
+                fallback = sorted(fallback + grouped)
+                tickets_by_request = {}
+            else:
+                seat_index.mark_booked(screening_id, grouped_seat_ids)
+                session.exec(select(Ticket).where(Ticket.id.in_(ticket_ids))).all()
+                for index, tickets in tickets_by_request.items():
+                    results[index] = self._detach(session, tickets)
+
+            for index in fallback:
+                request = batch[index]
+                try:
+                    tickets = book_tickets(session, request.user_id, screening_id, request.seat_ids)
+                    results[index] = self._detach(session, tickets)
+                except Exception as exc:
+                    session.rollback()
+                    results[index] = exc
+        return results
+
+    @staticmethod
+    def _detach(session: Session, tickets: List[Ticket]) -> List[Ticket]:
+        """Keep loaded tickets intact across the batch's later commits and rollbacks."""
+        for ticket in tickets:
+            session.expunge(ticket)
+        return tickets
+
+
+booking_coordinator = BookingCoordinator()
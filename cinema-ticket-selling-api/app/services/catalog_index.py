@@ -0,0 +1,646 @@
+"""In-process search index over the movie and cinema catalog.
+
+The catalog is small and read far more often than it is written, so it is
+held in memory: an inverted index maps every word of the searchable fields to
+the documents containing it, and a trigram index over the vocabulary finds
+the words a misspelled query term probably meant.
+
+A query term matches, in order of preference, the same word, words it is a
+prefix of, or (when neither exists) words within a small edit distance found
+through shared trigrams. Every term must match; documents are ranked by the
+weights of the fields that matched and the quality of each match.
+
+Typeahead suggestions (movie titles, actors, directors and cinema names) come
+from a sorted array of normalized names searched with ``bisect``: every word
+of a name starts a key, so "han" suggests "Tom Hanks" as well as "Hannibal".
+
+The index is built lazily from the database, patched by the admin write
+routes after they commit, and rebuilt every
+``settings.CATALOG_INDEX_TTL_SECONDS`` so that changes made by other worker
+processes show up within a bounded delay. The rebuild runs in one background
+thread while requests keep using the stale index, and changes committed
+during the rebuild are replayed onto its result. With
+``settings.CATALOG_INDEX_ENABLED`` off, search falls back to the database.
+"""
+
+import bisect
+import heapq
+import math
+import re
+import threading
+import time
+import unicodedata
+from collections import defaultdict
+from typing import (
+    Any, Callable, Collection, Dict, Hashable, Iterable, List, NamedTuple, Optional, Sequence, Set, Tuple, Type,
+    TypeVar, Union
+)
+
+from sqlalchemy import bindparam, or_
+from sqlmodel import Session, SQLModel, select
+
+from app.config import settings
+from app.models.cast import Cast
+from app.models.cinema import Cinema
+from app.models.movie import Movie
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+MOVIE_FIELD_WEIGHTS = {"title": 4.0, "director": 2.0, "genre": 2.0, "cast": 2.0, "description": 0.5}
+CINEMA_FIELD_WEIGHTS = {"name": 4.0, "city": 2.0, "address": 1.0}
+
+# Match quality of a query term against an indexed word
+EXACT_MATCH = 1.0
+PREFIX_MATCH = 0.75
+FUZZY_MATCH = 0.5
+
+# Longest prefix expansion considered for one term
+MAX_PREFIX_EXPANSIONS = 64
+
+SUGGESTION_KIND_WEIGHTS = {"movie": 4.0, "cinema": 3.0, "director": 2.0, "actor": 2.0}
+# Score factor of a name matched from a later word ("hanks" in "Tom Hanks")
+INNER_WORD_MATCH = 0.5
+# Most suggestions returned for one prefix
+MAX_SUGGESTIONS = 50
+# Rankings of prefixes matching more names than this are memoized, this deep
+MEMO_DEPTH = 2 * MAX_SUGGESTIONS
+
+# Longest IN list built from index matches
+IN_LIST_CHUNK_SIZE = 1000
+
+FieldValue = Union[None, str, Iterable[Optional[str]]]
+ModelT = TypeVar("ModelT", bound=SQLModel)
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase words with accents removed."""
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    return _WORD.findall("".join(char for char in decomposed if not unicodedata.combining(char)))
+
+
+def trigrams(word: str) -> Set[str]:
+    """Padded character trigrams of a word (``"  w"``, ``" wo"``, ..., ``"rd "``)."""
+    padded = f"  {word} "
+    return {padded[index:index + 3] for index in range(len(padded) - 2)}
+
+
+def max_typos(term: str) -> int:
+    """Edit distance tolerated for a query term of this length."""
+    if len(term) < 4:
+        return 0
+    return 1 if len(term) < 8 else 2
+
+
+def edit_distance(first: str, second: str, limit: int) -> int:
+    """
+    Optimal string alignment distance (insertions, deletions, substitutions
+    and adjacent transpositions), or ``limit + 1`` once it exceeds ``limit``.
+    """
+    if abs(len(first) - len(second)) > limit:
+        return limit + 1
+    previous_previous: List[int] = []
+    previous = list(range(len(second) + 1))
+    for i in range(1, len(first) + 1):
+        current = [i] + [0] * len(second)
+        for j in range(1, len(second) + 1):
+            cost = first[i - 1] != second[j - 1]
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and first[i - 1] == second[j - 2] and first[i - 2] == second[j - 1]:
+                current[j] = min(current[j], previous_previous[j - 2] + 1)
+        if min(current) > limit:
+            return limit + 1
+        previous_previous, previous = previous, current
+    return previous[-1]
+
+
+class SearchCollection:
+    """Inverted and trigram index over the documents of one kind."""
+
+    def __init__(self, field_weights: Dict[str, float]):
+        self.field_weights = field_weights
+        # word -> document ID -> field -> field weight
+        self._postings: Dict[str, Dict[int, Dict[str, float]]] = {}
+        self._documents: Dict[int, Set[str]] = {}
+        self._vocabulary: List[str] = []
+        self._trigrams: Dict[str, Set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def add(self, doc_id: int, fields: Dict[str, FieldValue]) -> None:
+        """Index a document, replacing its previous version."""
+        self.remove(doc_id)
+        words: Set[str] = set()
+        for field, value in fields.items():
+            weight = self.field_weights[field]
+            values = [value] if value is None or isinstance(value, str) else value
+            for text in values:
+                for word in tokenize(text or ""):
+                    postings = self._postings.get(word)
+                    if postings is None:
+                        postings = self._postings[word] = {}
+                        self._add_word(word)
+                    postings.setdefault(doc_id, {})[field] = weight
+                    words.add(word)
+        self._documents[doc_id] = words
+
+    def remove(self, doc_id: int) -> None:
+        """Drop a document from the index."""
+        for word in self._documents.pop(doc_id, ()):
+            postings = self._postings[word]
+            postings.pop(doc_id, None)
+            if not postings:
+                del self._postings[word]
+                self._remove_word(word)
+
+    def _add_word(self, word: str) -> None:
+        bisect.insort(self._vocabulary, word)
+        for trigram in trigrams(word):
+            self._trigrams.setdefault(trigram, set()).add(word)
+
+    def _remove_word(self, word: str) -> None:
+        del self._vocabulary[bisect.bisect_left(self._vocabulary, word)]
+        for trigram in trigrams(word):
+            words = self._trigrams[trigram]
+            words.discard(word)
+            if not words:
+                del self._trigrams[trigram]
+
+    def expand(self, term: str) -> Dict[str, float]:
+        """Return the indexed words a query term stands for, with their match quality."""
+        matches: Dict[str, float] = {}
+        if term in self._postings:
+            matches[term] = EXACT_MATCH
+        start = bisect.bisect_left(self._vocabulary, term)
+        for word in self._vocabulary[start:start + MAX_PREFIX_EXPANSIONS]:
+            if not word.startswith(term):
+                break
+            matches.setdefault(word, PREFIX_MATCH)
+        if matches:
+            return matches
+
+        limit = max_typos(term)
+        if not limit:
+            return matches
+        candidates = set()
+        for trigram in trigrams(term):
+            candidates.update(self._trigrams.get(trigram, ()))
+        for word in candidates:
+            distance = edit_distance(term, word, limit)
+            if distance <= limit:
+                matches[word] = FUZZY_MATCH / distance
+        return matches
+
+    def search(self, query: str, fields: Optional[Collection[str]] = None) -> List[int]:
+        """
+        Find the documents matching every word of a query.
+
+        Args:
+            query: Free-text query
+            fields: Only match these fields (all fields if None)
+
+        Returns:
+            Matching document IDs, best match first
+        """
+        scores: Optional[Dict[int, float]] = None
+        for term in tokenize(query):
+            term_scores: Dict[int, float] = {}
+            for word, quality in self.expand(term).items():
+                for doc_id, field_weights in self._postings[word].items():
+                    weight = max(
+                        (weight for field, weight in field_weights.items() if fields is None or field in fields),
+                        default=0.0
+                    )
+                    score = quality * weight
+                    if score > term_scores.get(doc_id, 0.0):
+                        term_scores[doc_id] = score
+            if scores is None:
+                scores = term_scores
+            else:
+                scores = {doc_id: score + term_scores[doc_id] for doc_id, score in scores.items() if doc_id in term_scores}
+            if not scores:
+                return []
+        if scores is None:
+            return []
+        return sorted(scores, key=lambda doc_id: (-scores[doc_id], doc_id))
+
+
+class Suggestion(NamedTuple):
+    """A typeahead suggestion."""
+    kind: str
+    text: str
+    id: Optional[int]
+
+
+# (kind, entity ID or None, normalized name)
+EntryKey = Tuple[str, Optional[int], str]
+# Sort key of a suggestion for a prefix: best score, then shortest name
+Rank = Tuple[float, int, str, EntryKey]
+
+
+class _SuggestionEntry:
+    __slots__ = ("text", "keys", "kind_weight", "sources", "weight")
+
+    def __init__(self, kind: str, text: str, keys: List[str]):
+        self.text = text
+        self.keys = keys
+        self.kind_weight = SUGGESTION_KIND_WEIGHTS[kind]
+        # Number of documents naming this entry (e.g. the movies of a director)
+        self.sources = 0
+        self.weight = 0.0
+
+    def count(self, delta: int) -> None:
+        self.sources += delta
+        if self.sources:
+            self.weight = self.kind_weight * (1.0 + math.log(self.sources))
+
+
+class Suggester:
+    """
+    Prefix index over the names of catalog entities, ranked by kind and popularity.
+
+    Names live in a sorted array with one key per word, searched with
+    ``bisect``. Scanning the range of a short prefix ("t") would touch a large
+    part of the catalog, so the top ``MEMO_DEPTH`` ranking of any prefix
+    matching more names than that is memoized and patched as names change. A
+    memoized ranking is the exact top of the prefix, so names ranking past its
+    end are left out; it is dropped once removals leave it shorter than
+    ``MAX_SUGGESTIONS``.
+
+    A new suggester is loaded in bulk: keys are appended unsorted and sorted
+    once on the first lookup, or by ``warm``.
+    """
+
+    def __init__(self):
+        self._entries: Dict[EntryKey, _SuggestionEntry] = {}
+        # Sorted (key, position of its first word in the name, entry key)
+        self._keys: List[Tuple[str, int, EntryKey]] = []
+        # Entries named by each document, to undo them when it changes
+        self._documents: Dict[Hashable, Set[EntryKey]] = {}
+        # Prefix -> sorted best ranks, for wide prefixes
+        self._memo: Dict[str, List[Rank]] = {}
+        self._bulk = True
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add(self, doc_key: Hashable, names: Iterable[Tuple[str, Optional[str], Optional[int]]]) -> None:
+        """
+        Record the names a document contributes, replacing its previous ones.
+
+        Args:
+            doc_key: Key of the source document, e.g. ``("movie", 1)``
+            names: ``(kind, text, id)`` triples; entities with an ID are
+                suggested one per ID, the others (people) one per name
+        """
+        texts: Dict[EntryKey, str] = {}
+        for kind, text, entity_id in names:
+            normalized = " ".join(tokenize(text or ""))
+            if normalized:
+                texts.setdefault((kind, entity_id, normalized), text.strip())
+        previous = self._documents.get(doc_key, set())
+        for entry_key in previous - texts.keys():
+            self._release(entry_key)
+        for entry_key in texts.keys() - previous:
+            entry = self._entries.get(entry_key)
+            if entry is None:
+                words = entry_key[2].split(" ")
+                keys = [" ".join(words[position:]) for position in range(len(words))]
+                entry = self._entries[entry_key] = _SuggestionEntry(entry_key[0], texts[entry_key], keys)
+                for position, key in enumerate(keys):
+                    if self._bulk:
+                        self._keys.append((key, position, entry_key))
+                    else:
+                        bisect.insort(self._keys, (key, position, entry_key))
+            entry.count(1)
+            self._patch_memo(entry_key, entry, worse=False)
+        if texts:
+            self._documents[doc_key] = set(texts)
+        else:
+            self._documents.pop(doc_key, None)
+
+    def remove(self, doc_key: Hashable) -> None:
+        """Drop the names a document contributed."""
+        for entry_key in self._documents.pop(doc_key, ()):
+            self._release(entry_key)
+
+    def _release(self, entry_key: EntryKey) -> None:
+        self._sort()
+        entry = self._entries[entry_key]
+        entry.count(-1)
+        if not entry.sources:
+            del self._entries[entry_key]
+            for position, key in enumerate(entry.keys):
+                del self._keys[bisect.bisect_left(self._keys, (key, position, entry_key))]
+        self._patch_memo(entry_key, entry, worse=True)
+
+    def _sort(self) -> None:
+        if self._bulk:
+            self._keys.sort()
+            self._bulk = False
+
+    def warm(self) -> None:
+        """Finish a bulk load: sort the keys and memoize single-character prefixes."""
+        self._sort()
+        for character in {key[0] for key, _, _ in self._keys}:
+            if character not in self._memo:
+                self._scan(character)
+
+    @staticmethod
+    def _rank(entry_key: EntryKey, entry: _SuggestionEntry, prefix: str) -> Rank:
+        weight = entry.weight if entry.keys[0].startswith(prefix) else entry.weight * INNER_WORD_MATCH
+        return (-weight, len(entry.text), entry.text, entry_key)
+
+    def _patch_memo(self, entry_key: EntryKey, entry: _SuggestionEntry, worse: bool) -> None:
+        """Update the memoized rankings of the prefixes of a name whose score changed."""
+        if not self._memo:
+            return
+        live = entry_key in self._entries
+        prefixes = {key[:length] for key in entry.keys for length in range(1, len(key) + 1)}
+        for prefix in prefixes & self._memo.keys():
+            ranked = self._memo[prefix]
+            index = next((index for index, rank in enumerate(ranked) if rank[3] == entry_key), None)
+            if worse and index is None:
+                continue
+            if index is not None:
+                del ranked[index]
+            if live:
+                rank = self._rank(entry_key, entry, prefix)
+                # Past the end, the name may trail names that were never memoized
+                if ranked and rank < ranked[-1]:
+                    bisect.insort(ranked, rank)
+                    del ranked[MEMO_DEPTH:]
+            if len(ranked) < MAX_SUGGESTIONS:
+                del self._memo[prefix]
+
+    def suggest(self, prefix: str, limit: int = 10) -> List[Suggestion]:
+        """
+        Find the names with a word starting with the prefix.
+
+        Args:
+            prefix: What the user typed so far
+            limit: Maximum number of suggestions (at most ``MAX_SUGGESTIONS``)
+
+        Returns:
+            Suggestions, best first: names starting with the prefix rank above
+            names with a later word matching it
+        """
+        query = " ".join(tokenize(prefix))
+        if not query:
+            return []
+        self._sort()
+        ranked = self._memo.get(query)
+        if ranked is None:
+            ranked = self._scan(query)
+        return [
+            Suggestion(entry_key[0], self._entries[entry_key].text, entry_key[1])
+            for _, _, _, entry_key in ranked[:limit]
+        ]
+
+    def _scan(self, query: str) -> List[Rank]:
+        end = bisect.bisect_left(self._keys, (query,))
+        ranks: Dict[EntryKey, Rank] = {}
+        while end < len(self._keys) and self._keys[end][0].startswith(query):
+            entry_key = self._keys[end][2]
+            if entry_key not in ranks:
+                ranks[entry_key] = self._rank(entry_key, self._entries[entry_key], query)
+            end += 1
+        if len(ranks) <= MEMO_DEPTH:
+            return sorted(ranks.values())
+        ranked = self._memo[query] = heapq.nsmallest(MEMO_DEPTH, ranks.values())
+        return ranked
+
+
+def _movie_fields(movie: Movie, cast_names: Iterable[str]) -> Dict[str, FieldValue]:
+    return {
+        "title": movie.title,
+        "director": movie.director,
+        "genre": movie.genre,
+        "cast": [*(movie.cast or []), *cast_names],
+        "description": movie.description,
+    }
+
+
+def _cinema_fields(cinema: Cinema) -> Dict[str, FieldValue]:
+    return {"name": cinema.name, "city": cinema.city, "address": cinema.address}
+
+
+def _movie_names(movie: Movie, cast_names: Iterable[str]) -> List[Tuple[str, Optional[str], Optional[int]]]:
+    names = [("movie", movie.title, movie.id), ("director", movie.director, None)]
+    names.extend(("actor", name, None) for name in [*(movie.cast or []), *cast_names])
+    return names
+
+
+def ids_in(column, ids: Sequence[int]):
+    """
+    ``column IN ids`` for any number of integer IDs.
+
+    Index matches can cover the whole catalog, so the IDs are rendered inline
+    rather than bound (no bind-parameter limit applies) and split into IN
+    lists of at most ``IN_LIST_CHUNK_SIZE`` values.
+    """
+    ids = sorted(ids)
+    if len(ids) <= IN_LIST_CHUNK_SIZE:
+        return column.in_(bindparam(None, ids, expanding=True, literal_execute=True))
+    return or_(*(
+        column.in_(bindparam(None, ids[start:start + IN_LIST_CHUNK_SIZE], expanding=True, literal_execute=True))
+        for start in range(0, len(ids), IN_LIST_CHUNK_SIZE)
+    ))
+
+
+def fetch_in_order(session: Session, model: Type[ModelT], ids: List[int], options: Sequence[Any] = ()) -> List[ModelT]:
+    """Load rows by primary key, keeping the order of ``ids`` (``options`` are loader options)."""
+    if not ids:
+        return []
+    rows = {row.id: row for row in session.exec(select(model).options(*options).where(ids_in(model.id, ids))).all()}
+    return [rows[row_id] for row_id in ids if row_id in rows]
+
+
+class _Collections(NamedTuple):
+    movies: SearchCollection
+    cinemas: SearchCollection
+    suggestions: Suggester
+
+
+MovieEntry = Tuple[Dict[str, FieldValue], List[Tuple[str, Optional[str], Optional[int]]]]
+
+
+def _movie_entry(movie: Optional[Movie], cast_names: Iterable[str]) -> Optional[MovieEntry]:
+    if movie is None:
+        return None
+    cast_names = list(cast_names)
+    return _movie_fields(movie, cast_names), _movie_names(movie, cast_names)
+
+
+def _index_movie(collections: _Collections, movie_id: int, entry: Optional[MovieEntry]) -> None:
+    if entry is None:
+        collections.movies.remove(movie_id)
+        collections.suggestions.remove(("movie", movie_id))
+    else:
+        collections.movies.add(movie_id, entry[0])
+        collections.suggestions.add(("movie", movie_id), entry[1])
+
+
+def _index_cinema(collections: _Collections, cinema_id: int, fields: Optional[Dict[str, FieldValue]]) -> None:
+    if fields is None:
+        collections.cinemas.remove(cinema_id)
+        collections.suggestions.remove(("cinema", cinema_id))
+    else:
+        collections.cinemas.add(cinema_id, fields)
+        collections.suggestions.add(("cinema", cinema_id), [("cinema", fields["name"], cinema_id)])
+
+
+class CatalogIndex:
+    """Per-process search and typeahead index over movies (with their cast members) and cinemas."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._collections: Optional[_Collections] = None
+        self._built_at = 0.0
+        # Bumped by clear() so a build racing with it is discarded
+        self._generation = 0
+        # Held by the (single) build in progress
+        self._build_lock = threading.Lock()
+        # Changes committed while a build is running, replayed onto its result
+        self._pending: Optional[List[Callable[[_Collections], None]]] = None
+
+    def _get(self, session: Session) -> _Collections:
+        collections = self._collections
+        if collections is None:
+            with self._build_lock:
+                collections = self._collections
+                if collections is None:
+                    collections = self._build(session)
+            return collections
+        if (
+            time.monotonic() - self._built_at >= settings.CATALOG_INDEX_TTL_SECONDS
+            and self._build_lock.acquire(blocking=False)
+        ):
+            # Keep serving the stale index while one thread rebuilds it
+            try:
+                threading.Thread(
+                    target=self._refresh, args=(session.get_bind(),), name="catalog-index-refresh", daemon=True
+                ).start()
+            except Exception:
+                self._build_lock.release()
+                raise
+        return collections
+
+    def _refresh(self, bind) -> None:
+        try:
+            with Session(bind) as session:
+                self._build(session)
+        except Exception:
+            # Keep the stale index; the next request past the TTL retries
+            pass
+        finally:
+            self._build_lock.release()
+
+    def _build(self, session: Session) -> _Collections:
+        with self._lock:
+            generation = self._generation
+            self._pending = []
+        try:
+            cast_names = defaultdict(list)
+            for movie_id, actor_name in session.exec(select(Cast.movie_id, Cast.actor_name)).all():
+                cast_names[movie_id].append(actor_name)
+            collections = _Collections(
+                SearchCollection(MOVIE_FIELD_WEIGHTS), SearchCollection(CINEMA_FIELD_WEIGHTS), Suggester()
+            )
+            for movie in session.exec(select(Movie)).all():
+                _index_movie(collections, movie.id, _movie_entry(movie, cast_names[movie.id]))
+            for cinema in session.exec(select(Cinema)).all():
+                _index_cinema(collections, cinema.id, _cinema_fields(cinema))
+            collections.suggestions.warm()
+
+            with self._lock:
+                # Writes committed after the rows above were read are not lost
+                for change in self._pending:
+                    change(collections)
+                if self._generation == generation:
+                    self._collections = collections
+                    self._built_at = time.monotonic()
+        finally:
+            with self._lock:
+                self._pending = None
+        return collections
+
+    def search_movies(self, session: Session, query: str, fields: Optional[Collection[str]] = None) -> List[int]:
+        """
+        Search movies by title, director, genre, cast and description.
+
+        Args:
+            session: Database session (only used when the index must be built)
+            query: Free-text query
+            fields: Only match these fields (all fields if None)
+
+        Returns:
+            Matching movie IDs, most relevant first
+        """
+        collections = self._get(session)
+        with self._lock:
+            return collections.movies.search(query, fields)
+
+    def search_cinemas(self, session: Session, query: str) -> List[int]:
+        """
+        Search cinemas by name, city and address.
+
+        Args:
+            session: Database session (only used when the index must be built)
+            query: Free-text query
+
+        Returns:
+            Matching cinema IDs, most relevant first
+        """
+        collections = self._get(session)
+        with self._lock:
+            return collections.cinemas.search(query)
+
+    def suggest(self, session: Session, prefix: str, limit: int = 10) -> List[Suggestion]:
+        """
+        Typeahead suggestions among movie titles, actors, directors and cinema names.
+
+        Args:
+            session: Database session (only used when the index must be built)
+            prefix: What the user typed so far
+            limit: Maximum number of suggestions
+
+        Returns:
+            Suggestions, best first
+        """
+        collections = self._get(session)
+        with self._lock:
+            return collections.suggestions.suggest(prefix, limit)
+
+    def refresh_movie(self, session: Session, movie_id: int) -> None:
+        """Re-index a movie and its cast after a committed change (or drop it if deleted)."""
+        if self._collections is None and self._pending is None:
+            return
+        cast_names = session.exec(select(Cast.actor_name).where(Cast.movie_id == movie_id)).all()
+        entry = _movie_entry(session.get(Movie, movie_id), cast_names)
+        self._apply(lambda collections: _index_movie(collections, movie_id, entry))
+
+    def refresh_cinema(self, session: Session, cinema_id: int) -> None:
+        """Re-index a cinema after a committed change (or drop it if deleted)."""
+        if self._collections is None and self._pending is None:
+            return
+        cinema = session.get(Cinema, cinema_id)
+        fields = None if cinema is None else _cinema_fields(cinema)
+        self._apply(lambda collections: _index_cinema(collections, cinema_id, fields))
+
+    def _apply(self, change: Callable[[_Collections], None]) -> None:
+        with self._lock:
+            if self._collections is not None:
+                change(self._collections)
+            if self._pending is not None:
+                self._pending.append(change)
+
+    def clear(self) -> None:
+        """Drop the index so it is rebuilt on next access."""
+        with self._lock:
+            self._generation += 1
+            self._collections = None
+            self._built_at = 0.0
+
+
+catalog_index = CatalogIndex()
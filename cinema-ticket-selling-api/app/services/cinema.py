@@ -1,14 +1,22 @@
-from typing import List, Optional
+from typing import Dict, List, Optional
+from sqlalchemy import and_, delete, func, or_, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
 from sqlmodel import Session, select
 from fastapi import HTTPException, status
-from datetime import datetime
+from datetime import datetime, timedelta
 
+from app.config import settings
 from app.models.cinema import Cinema, Room, Seat
 from app.models.movie import Movie
 from app.models.screening import Screening
+from app.models.screening_seat_sales import ScreeningSeatSales
+from app.models.seat_hold import SeatHold
 from app.models.ticket import Ticket
-from app.schemas.cinema import SeatBulkCreate
+from app.schemas.cinema import SeatBulkCreate, SeatRead
 from app.schemas.ticket import TicketCreate
+from app.services.hold_reaper import hold_reaper
+from app.services.seat_index import seat_index
 
 
 def bulk_create_seats(session: Session, room_id: int, data: SeatBulkCreate) -> List[Seat]:
@@ -46,7 +54,10 @@ def bulk_create_seats(session: Session, room_id: int, data: SeatBulkCreate) -> L
             seats.append(seat)
             session.add(seat)
     
+    room.capacity += len(seats)
+    session.add(room)
     session.commit()
+    seat_index.invalidate_room(room_id)
     # Refresh all seats to get IDs
     for seat in seats:
         session.refresh(seat)
@@ -54,10 +65,13 @@ def bulk_create_seats(session: Session, room_id: int, data: SeatBulkCreate) -> L
     return seats
 
 
-def get_available_seats(session: Session, screening_id: int) -> List[Seat]:
+def get_available_seats(session: Session, screening_id: int) -> List[SeatRead]:
     """
     Get all available (unbooked) seats for a screening.
     
+    Answered from the in-process availability bitmap, which is built from the
+    database on first access.
+    
     Args:
         session: Database session
         screening_id: ID of the screening
@@ -65,7 +79,98 @@ def get_available_seats(session: Session, screening_id: int) -> List[Seat]:
     Returns:
         List of available seats
     """
-    # Get the screening
+    return seat_index.get(session, screening_id).available_seats()
+
+
+def record_seat_sales(session: Session, screening_id: int, seat_ids: List[int], delta: int) -> None:
+    """
+    Adjust the sold-seat counters of a screening in the current transaction.
+    
+    Both the screening's total ``sold_count`` and its per-seat-type rows in
+    ``screening_seat_sales`` are updated with atomic increments, so the
+    counters commit or roll back together with the tickets they describe.
+    
+    Args:
+        session: Database session
+        screening_id: ID of the screening
+        seat_ids: Seats whose tickets became active (or inactive)
+        delta: +1 when the seats were sold, -1 when they were released
+    """
+    if not seat_ids:
+        return
+    
+    session.exec(
+        update(Screening)
+        .where(Screening.id == screening_id)
+        .values(sold_count=Screening.sold_count + delta * len(seat_ids))
+    )
+    
+    counts_by_type = session.exec(
+        select(Seat.seat_type, func.count(Seat.id))
+        .where(Seat.id.in_(seat_ids))
+        .group_by(Seat.seat_type)
+    ).all()
+    dialect = session.get_bind().dialect.name
+    for seat_type, count in counts_by_type:
+        if dialect in ("postgresql", "sqlite"):
+            insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+            stmt = insert(ScreeningSeatSales).values(
+                screening_id=screening_id, seat_type=seat_type, sold=delta * count
+            )
+            session.exec(stmt.on_conflict_do_update(
+                index_elements=["screening_id", "seat_type"],
+                set_={"sold": ScreeningSeatSales.sold + stmt.excluded.sold},
+            ))
+        else:
+            sales = session.get(ScreeningSeatSales, (screening_id, seat_type))
+            if sales is None:
+                sales = ScreeningSeatSales(screening_id=screening_id, seat_type=seat_type)
+            sales.sold += delta * count
+            session.add(sales)
+
+
+def get_seat_sales(session: Session, screening_id: int) -> Dict[str, int]:
+    """Return the number of sold seats per seat type for a screening."""
+    rows = session.exec(
+        select(ScreeningSeatSales.seat_type, ScreeningSeatSales.sold)
+        .where(ScreeningSeatSales.screening_id == screening_id)
+    ).all()
+    return {seat_type: sold for seat_type, sold in rows if sold}
+
+
+def rebuild_seat_counters(session: Session) -> None:
+    """
+    Recompute room capacities and screening sales counters from scratch.
+    
+    Meant for seeding and repair scripts that insert seats or tickets
+    without going through the booking services.
+    """
+    seat_count = select(func.count(Seat.id)).where(Seat.room_id == Room.id).scalar_subquery()
+    session.exec(update(Room).values(capacity=seat_count))
+    
+    sold_count = (
+        select(func.count(Ticket.id))
+        .where(Ticket.screening_id == Screening.id, Ticket.status != "cancelled")
+        .scalar_subquery()
+    )
+    session.exec(update(Screening).values(sold_count=sold_count))
+    
+    session.exec(delete(ScreeningSeatSales))
+    sales = session.exec(
+        select(Ticket.screening_id, Seat.seat_type, func.count(Ticket.id))
+        .join(Seat, Seat.id == Ticket.seat_id)
+        .where(Ticket.status != "cancelled")
+        .group_by(Ticket.screening_id, Seat.seat_type)
+    ).all()
+    session.add_all(
+        ScreeningSeatSales(screening_id=screening_id, seat_type=seat_type, sold=sold)
+        for screening_id, seat_type, sold in sales
+    )
+    session.commit()
+
+
+def _get_bookable_screening(session: Session, screening_id: int) -> Screening:
+    """Load a screening and check that seats can still be sold for it."""
     screening = session.get(Screening, screening_id)
     if not screening:
         raise HTTPException(
@@ -73,21 +178,87 @@ def get_available_seats(session: Session, screening_id: int) -> List[Seat]:
             detail=f"Screening with id {screening_id} not found"
         )
     
-    # Get all seats in the room
-    all_seats_stmt = select(Seat).where(Seat.room_id == screening.room_id)
-    all_seats = session.exec(all_seats_stmt).all()
+    # Verify screening hasn't already happened
+    if screening.screening_time < datetime.utcnow():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Cannot book tickets for past screenings"
+        )
+    return screening
+
+
+def _validate_seats(
+    session: Session,
+    screening: Screening,
+    seat_ids: List[int],
+    user_id: int,
+    now: datetime
+) -> None:
+    """
+    Check that seats exist, belong to the screening's room and are free.
     
-    # Get booked seat IDs for this screening
-    booked_seats_stmt = select(Ticket.seat_id).where(
-        Ticket.screening_id == screening_id,
-        Ticket.status == "booked"
-    )
-    booked_seat_ids = set(session.exec(booked_seats_stmt).all())
+    Every seat, its active ticket and its unexpired hold are fetched with a
+    single query. Seats held by ``user_id`` itself count as free.
     
-    # Filter out booked seats
-    available_seats = [seat for seat in all_seats if seat.id not in booked_seat_ids]
+    Raises:
+        HTTPException: 400/404 for invalid seats, 409 if any seat is taken
+    """
+    # Reject duplicates up front: they would collide with each other on insert
+    if len(set(seat_ids)) != len(seat_ids):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Each seat can only be booked once per request"
+        )
+    
+    seat_rows = session.exec(
+        select(Seat.id, Seat.room_id, Ticket.id, SeatHold.user_id)
+        .outerjoin(
+            Ticket,
+            and_(
+                Ticket.seat_id == Seat.id,
+                Ticket.screening_id == screening.id,
+                Ticket.status != "cancelled",
+            ),
+        )
+        .outerjoin(
+            SeatHold,
+            and_(
+                SeatHold.seat_id == Seat.id,
+                SeatHold.screening_id == screening.id,
+                SeatHold.expires_at > now,
+            ),
+        )
+        .where(Seat.id.in_(seat_ids))
+    ).all()
+    seats_by_id = {row[0]: row[1:] for row in seat_rows}
+    
+    for seat_id in seat_ids:
+        if seat_id not in seats_by_id:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Seat with id {seat_id} not found"
+            )
+        if seats_by_id[seat_id][0] != screening.room_id:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Seat {seat_id} does not belong to the screening's room"
+            )
     
-    return available_seats
+    taken_seat_ids = [
+        seat_id for seat_id in seat_ids
+        if seats_by_id[seat_id][1] is not None
+        or seats_by_id[seat_id][2] not in (None, user_id)
+    ]
+    if taken_seat_ids:
+        raise _seats_already_booked(taken_seat_ids)
+
+
+def _seats_already_booked(seat_ids: List[int]) -> HTTPException:
+    """Build the 409 error returned when seats are taken for a screening."""
+    return HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail=f"Seats {seat_ids} are already booked"
+    )
 
 
 def book_tickets(
@@ -99,6 +270,10 @@ def book_tickets(
     """
     Book multiple tickets for a screening.
     
+    All seats are validated with a single query and the tickets are created
+    in one transaction, so a booking either succeeds for every seat or for
+    none of them. Holds the user has on these seats are promoted to tickets.
+    
     Args:
         session: Database session
         user_id: ID of the user booking tickets
@@ -109,73 +284,175 @@ def book_tickets(
         List of created tickets
         
     Raises:
-        HTTPException: If validation fails
+        HTTPException: If validation fails, or 409 if any seat is already booked
     """
-    # Verify screening exists
-    screening = session.get(Screening, screening_id)
-    if not screening:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Screening with id {screening_id} not found"
-        )
+    now = datetime.utcnow()
+    screening = _get_bookable_screening(session, screening_id)
+    _validate_seats(session, screening, seat_ids, user_id, now)
     
-    # Verify screening hasn't already happened
-    if screening.screening_time < datetime.utcnow():
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Cannot book tickets for past screenings"
+    # Promote the user's own holds and clear expired ones on these seats
+    session.exec(
+        delete(SeatHold).where(
+            SeatHold.screening_id == screening_id,
+            SeatHold.seat_id.in_(seat_ids),
+            or_(SeatHold.user_id == user_id, SeatHold.expires_at <= now),
         )
+    )
     
-    # Verify all seats exist and belong to the screening's room
-    seats = []
-    for seat_id in seat_ids:
-        seat = session.get(Seat, seat_id)
-        if not seat:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Seat with id {seat_id} not found"
-            )
-        if seat.room_id != screening.room_id:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Seat {seat_id} does not belong to the screening's room"
+    # Create all tickets in a single transaction; the partial unique index on
+    # active (screening_id, seat_id) rejects concurrent double bookings
+    tickets = [
+        Ticket(
+            user_id=user_id,
+            screening_id=screening_id,
+            seat_id=seat_id,
+            price=screening.price,
+            status="booked"
+        )
+        for seat_id in seat_ids
+    ]
+    session.add_all(tickets)
+    try:
+        session.flush()
+        ticket_ids = [ticket.id for ticket in tickets]
+        record_seat_sales(session, screening_id, seat_ids, 1)
+        session.commit()
+    except IntegrityError:
+        session.rollback()
+        contested_seat_ids = session.exec(
+            select(Ticket.seat_id).where(
+                Ticket.screening_id == screening_id,
+                Ticket.seat_id.in_(seat_ids),
+                Ticket.status != "cancelled"
             )
-        seats.append(seat)
+        ).all()
+        raise _seats_already_booked(sorted(contested_seat_ids) or seat_ids)
+    seat_index.mark_booked(screening_id, seat_ids)
     
-    # Check if any seats are already booked
-    existing_tickets_stmt = select(Ticket).where(
-        Ticket.screening_id == screening_id,
-        Ticket.seat_id.in_(seat_ids),
-        Ticket.status == "booked"
-    )
-    existing_tickets = session.exec(existing_tickets_stmt).all()
+    # Reload the committed tickets with one query instead of a refresh per ticket
+    session.exec(select(Ticket).where(Ticket.id.in_(ticket_ids))).all()
+    return tickets
+
+
+def hold_seats(
+    session: Session,
+    user_id: int,
+    screening_id: int,
+    seat_ids: List[int],
+    minutes: Optional[int] = None
+) -> List[SeatHold]:
+    """
+    Hold seats for a screening for a limited time.
     
-    if existing_tickets:
-        booked_seat_ids = [ticket.seat_id for ticket in existing_tickets]
+    Held seats are unavailable to other users until the hold is booked,
+    released or expires. Holding seats the user already holds extends them.
+    
+    Args:
+        session: Database session
+        user_id: ID of the user holding the seats
+        screening_id: ID of the screening
+        seat_ids: List of seat IDs to hold
+        minutes: Hold duration (defaults to SEAT_HOLD_MINUTES)
+        
+    Returns:
+        List of created holds
+        
+    Raises:
+        HTTPException: If validation fails, or 409 if any seat is taken
+    """
+    minutes = minutes or settings.SEAT_HOLD_MINUTES
+    if minutes > settings.SEAT_HOLD_MAX_MINUTES:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"Seats {booked_seat_ids} are already booked"
+            detail=f"Seats can be held for at most {settings.SEAT_HOLD_MAX_MINUTES} minutes"
         )
     
-    # Create tickets
-    tickets = []
-    for seat_id in seat_ids:
-        ticket = Ticket(
+    now = datetime.utcnow()
+    screening = _get_bookable_screening(session, screening_id)
+    _validate_seats(session, screening, seat_ids, user_id, now)
+    
+    # Replace the user's previous holds and expired holds on these seats
+    session.exec(
+        delete(SeatHold).where(
+            SeatHold.screening_id == screening_id,
+            SeatHold.seat_id.in_(seat_ids),
+            or_(SeatHold.user_id == user_id, SeatHold.expires_at <= now),
+        )
+    )
+    
+    expires_at = now + timedelta(minutes=minutes)
+    holds = [
+        SeatHold(
             user_id=user_id,
             screening_id=screening_id,
             seat_id=seat_id,
-            price=screening.price,
-            status="booked"
+            expires_at=expires_at
+        )
+        for seat_id in seat_ids
+    ]
+    session.add_all(holds)
+    try:
+        session.flush()
+        hold_ids = [hold.id for hold in holds]
+        session.commit()
+    except IntegrityError:
+        session.rollback()
+        booked_seat_ids = session.exec(
+            select(Ticket.seat_id).where(
+                Ticket.screening_id == screening_id,
+                Ticket.seat_id.in_(seat_ids),
+                Ticket.status != "cancelled"
+            )
+        ).all()
+        held_seat_ids = session.exec(
+            select(SeatHold.seat_id).where(
+                SeatHold.screening_id == screening_id,
+                SeatHold.seat_id.in_(seat_ids),
+                SeatHold.user_id != user_id,
+                SeatHold.expires_at > now
+            )
+        ).all()
+        contested_seat_ids = sorted({*booked_seat_ids, *held_seat_ids}) or seat_ids
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Seats {contested_seat_ids} were just taken by another user"
         )
-        tickets.append(ticket)
-        session.add(ticket)
+    seat_index.mark_booked(screening_id, seat_ids)
     
-    session.commit()
-    # Refresh all tickets to get IDs
-    for ticket in tickets:
-        session.refresh(ticket)
+    holds = session.exec(select(SeatHold).where(SeatHold.id.in_(hold_ids))).all()
+    hold_reaper.schedule(holds)
+    return list(holds)
+
+
+def release_hold(session: Session, hold_id: int, user_id: int) -> None:
+    """
+    Release a seat hold before it expires.
     
-    return tickets
+    Args:
+        session: Database session
+        hold_id: ID of the hold
+        user_id: ID of the user (for authorization)
+        
+    Raises:
+        HTTPException: If hold not found or user unauthorized
+    """
+    hold = session.get(SeatHold, hold_id)
+    if not hold:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Seat hold with id {hold_id} not found"
+        )
+    
+    if hold.user_id != user_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You can only release your own seat holds"
+        )
+    
+    screening_id, seat_id = hold.screening_id, hold.seat_id
+    session.delete(hold)
+    session.commit()
+    seat_index.mark_released(screening_id, [seat_id])
 
 
 def cancel_ticket(session: Session, ticket_id: int, user_id: int) -> Ticket:
@@ -217,7 +494,9 @@ def cancel_ticket(session: Session, ticket_id: int, user_id: int) -> Ticket:
     # Update ticket status
     ticket.status = "cancelled"
     session.add(ticket)
+    record_seat_sales(session, ticket.screening_id, [ticket.seat_id], -1)
     session.commit()
     session.refresh(ticket)
+    seat_index.mark_released(ticket.screening_id, [ticket.seat_id])
     
     return ticket
@@ -0,0 +1,113 @@
+"""Direct JSON serialization for hot list endpoints.
+
+Returning ORM rows with ``response_model`` makes FastAPI validate every row
+into the response schema, dump the result to Python objects and then encode
+those again with ``json.dumps``: three passes over wide rows with several
+JSON columns. Rows loaded from a table model are already valid, so the hot
+catalog endpoints hand them to a pydantic-core serializer compiled once per
+model, which writes the JSON bytes in a single pass.
+
+The route keeps its ``response_model`` for the OpenAPI schema; the serializer
+checks at import time that the table model has every field of that schema,
+so both paths produce the same document. ``benchmarks/movie_serialization.py``
+compares the two.
+"""
+
+from typing import Any, Collection, Dict, Generic, List, Optional, Sequence, Type, TypeVar
+
+from fastapi import Response
+from pydantic import TypeAdapter
+from pydantic_core import to_json
+from sqlalchemy import inspect
+from sqlmodel import SQLModel
+
+from app.models.movie import Movie
+from app.schemas.movie import MovieRead
+
+RowT = TypeVar("RowT", bound=SQLModel)
+
+# Headers of the injected response that describe its own (empty) body
+_BODY_HEADERS = {"content-length", "content-type"}
+
+
+class RowListSerializer(Generic[RowT]):
+    """Precompiled serializer of a list of table-model rows to a response schema."""
+
+    def __init__(self, model: Type[RowT], schema: Type[SQLModel]):
+        missing = set(schema.model_fields) - set(model.model_fields)
+        if missing:
+            raise TypeError(f"{model.__name__} lacks fields of {schema.__name__}: {sorted(missing)}")
+        extra = set(model.model_fields) - set(schema.model_fields)
+        self._include = {"__all__": set(schema.model_fields)} if extra else None
+        self._adapter = TypeAdapter(List[model])
+
+    def dumps(self, rows: Sequence[RowT], fields: Optional[Collection[str]] = None) -> bytes:
+        """
+        Serialize rows to a JSON array.
+
+        Args:
+            rows: Rows to serialize
+            fields: Only output these fields (every schema field if None); the
+                rows may have been loaded with just these columns
+        """
+        for row in rows:
+            # The serializer reads loaded values only; expired rows would come out empty
+            if inspect(row).expired_attributes:
+                getattr(row, "id")
+        include = {"__all__": set(fields)} if fields is not None else self._include
+        return self._adapter.dump_json(list(rows), include=include)
+
+    def response(
+        self,
+        rows: Sequence[RowT],
+        response: Optional[Response] = None,
+        fields: Optional[Collection[str]] = None
+    ) -> Response:
+        """
+        Build a JSON response for rows, bypassing ``response_model`` processing.
+
+        Args:
+            rows: Rows to return
+            response: Injected response whose headers (e.g. X-Next-Cursor) are kept
+            fields: Only output these fields (every schema field if None)
+
+        Returns:
+            The JSON response
+        """
+        return self._json_response(self.dumps(rows, fields), response)
+
+    def wrapped_response(
+        self,
+        key: str,
+        rows: Sequence[RowT],
+        extra: Dict[str, Any],
+        response: Optional[Response] = None,
+        fields: Optional[Collection[str]] = None
+    ) -> Response:
+        """
+        Build a JSON response of an object holding the rows under ``key``
+        alongside the (plain JSON) values of ``extra``.
+
+        Args:
+            key: Member holding the rows
+            rows: Rows to return
+            extra: Other members of the object
+            response: Injected response whose headers (e.g. X-Next-Cursor) are kept
+            fields: Only output these fields (every schema field if None)
+
+        Returns:
+            The JSON response
+        """
+        members = [to_json(key) + b":" + self.dumps(rows, fields)]
+        members.extend(to_json(name) + b":" + to_json(value) for name, value in extra.items())
+        return self._json_response(b"{" + b",".join(members) + b"}", response)
+
+    @staticmethod
+    def _json_response(content: bytes, response: Optional[Response]) -> Response:
+        headers = {}
+        if response is not None:
+            headers = {key: value for key, value in response.headers.items() if key not in _BODY_HEADERS}
+        return Response(content=content, media_type="application/json", headers=headers)
+
+
+movie_list_serializer = RowListSerializer(Movie, MovieRead)
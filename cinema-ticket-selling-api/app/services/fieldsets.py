@@ -0,0 +1,76 @@
+"""Sparse fieldsets for movie listings.
+
+List pages usually need a handful of columns, but ``select(Movie)`` loads
+every column, including the description and the JSON blobs (details, awards,
+writers, ...). Listing endpoints accept ``fields=``: a comma-separated list
+of ``MovieRead`` field names and/or presets such as ``card``. Only those
+columns (plus ``id`` and the sort columns) are selected; the rest stay
+deferred and are left out of the response.
+"""
+
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy.orm import load_only
+
+from app.schemas.movie import MovieRead
+
+MOVIE_FIELD_PRESETS: Dict[str, Tuple[str, ...]] = {
+    "card": ("id", "title", "image_url", "genre", "rating"),
+}
+
+FIELDS_DESCRIPTION = (
+    "Comma-separated fields to return, or a preset: "
+    + ", ".join(f"'{name}' ({', '.join(fields)})" for name, fields in MOVIE_FIELD_PRESETS.items())
+)
+
+
+def parse_fields(fields: Optional[str]) -> Optional[Tuple[str, ...]]:
+    """
+    Resolve a ``fields`` query parameter to movie field names.
+
+    Args:
+        fields: Comma-separated field names and presets (None for every field)
+
+    Returns:
+        The requested field names, always including ``id``, or None for every field
+
+    Raises:
+        HTTPException: If a name is neither a field nor a preset
+    """
+    if not fields:
+        return None
+    names = ["id"]
+    for name in fields.split(","):
+        name = name.strip()
+        if not name:
+            continue
+        if name in MOVIE_FIELD_PRESETS:
+            names.extend(MOVIE_FIELD_PRESETS[name])
+        elif name in MovieRead.model_fields:
+            names.append(name)
+        else:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown field '{name}'"
+            )
+    return tuple(dict.fromkeys(names))
+
+
+def load_fields(model: Any, fields: Optional[Sequence[str]], *columns: Any) -> Tuple[Any, ...]:
+    """
+    Loader options restricting a query to the requested fields.
+
+    Args:
+        model: Table model being selected
+        fields: Field names from ``parse_fields`` (None loads every column)
+        columns: Extra columns the endpoint needs, e.g. its sort columns
+
+    Returns:
+        Options to pass to ``select(...).options()``
+    """
+    if fields is None:
+        return ()
+    attributes = {name: getattr(model, name) for name in fields}
+    attributes.update((column.key, column) for column in columns)
+    return (load_only(*attributes.values()),)
@@ -0,0 +1,134 @@
+"""Background expiry of seat holds.
+
+Pending holds are kept in a min-heap ordered by expiry time. A daemon thread
+sleeps until the earliest deadline, then deletes exactly the holds that are
+due, so expiry never requires scanning the ``seat_hold`` table.
+"""
+
+import heapq
+import threading
+from datetime import datetime, timedelta
+from typing import Callable, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import delete
+from sqlmodel import Session, select
+
+from app.models.seat_hold import SeatHold
+from app.services.seat_index import seat_index
+
+
+def expire_holds(session: Session, hold_ids: List[int], now: datetime) -> int:
+    """
+    Delete the given holds if they have expired.
+
+    Holds that were promoted or released in the meantime are simply gone;
+    holds whose expiry was extended are left untouched.
+
+    Args:
+        session: Database session
+        hold_ids: IDs of the holds that are due
+        now: Current UTC time
+
+    Returns:
+        Number of holds deleted
+    """
+    expired = session.exec(
+        select(SeatHold.id, SeatHold.screening_id).where(
+            SeatHold.id.in_(hold_ids),
+            SeatHold.expires_at <= now
+        )
+    ).all()
+    if not expired:
+        return 0
+
+    session.exec(delete(SeatHold).where(SeatHold.id.in_([hold_id for hold_id, _ in expired])))
+    session.commit()
+    for screening_id in {screening_id for _, screening_id in expired}:
+        seat_index.invalidate_screening(screening_id)
+    return len(expired)
+
+
+class HoldReaper:
+    """Expires seat holds at their deadline using a heap of (expires_at, hold_id)."""
+
+    RETRY_DELAY_SECONDS = 30
+
+    def __init__(self):
+        self._heap: List[Tuple[datetime, int]] = []
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+        self._session_factory: Optional[Callable[[], Session]] = None
+
+    def schedule(self, holds: Iterable[SeatHold]) -> None:
+        """Register holds so they are deleted once they expire."""
+        with self._condition:
+            earliest = self._heap[0][0] if self._heap else None
+            for hold in holds:
+                heapq.heappush(self._heap, (hold.expires_at, hold.id))
+            if self._heap and (earliest is None or self._heap[0][0] < earliest):
+                self._condition.notify()
+
+    def pop_due(self, now: datetime) -> List[int]:
+        """Remove and return the IDs of all scheduled holds due at ``now``."""
+        due: Set[int] = set()
+        with self._condition:
+            while self._heap and self._heap[0][0] <= now:
+                due.add(heapq.heappop(self._heap)[1])
+        return sorted(due)
+
+    def start(self, session_factory: Callable[[], Session]) -> None:
+        """Load the outstanding holds and start the reaper thread."""
+        if self._thread is not None:
+            return
+        self._session_factory = session_factory
+        with session_factory() as session:
+            self.schedule(session.exec(select(SeatHold)).all())
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name="seat-hold-reaper", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the reaper thread."""
+        with self._condition:
+            self._stopping = True
+            self._condition.notify()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def clear(self) -> None:
+        """Forget every scheduled hold."""
+        with self._condition:
+            self._heap.clear()
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._stopping:
+                    if self._heap:
+                        delay = (self._heap[0][0] - datetime.utcnow()).total_seconds()
+                        if delay <= 0:
+                            break
+                        self._condition.wait(timeout=delay)
+                    else:
+                        self._condition.wait()
+                if self._stopping:
+                    return
+
+            due = self.pop_due(datetime.utcnow())
+            if not due:
+                continue
+            try:
+                with self._session_factory() as session:
+                    expire_holds(session, due, datetime.utcnow())
+            except Exception:
+                # Keep the thread alive and retry later; expired holds are
+                # ignored by the booking path in the meantime
+                retry_at = datetime.utcnow() + timedelta(seconds=self.RETRY_DELAY_SECONDS)
+                with self._condition:
+                    for hold_id in due:
+                        heapq.heappush(self._heap, (retry_at, hold_id))
+
+
+hold_reaper = HoldReaper()
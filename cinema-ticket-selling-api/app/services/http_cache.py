@@ -0,0 +1,38 @@
+"""Helpers for conditional GET requests (ETag / If-None-Match)."""
+
+from typing import Optional
+
+from fastapi import Response, status
+
+
+def quote_etag(tag: str) -> str:
+    """Format an opaque tag as a strong ETag header value."""
+    return f'"{tag}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Check an If-None-Match header against a strong ETag.
+    
+    Args:
+        if_none_match: Raw If-None-Match header value (may list several tags)
+        etag: Quoted ETag of the current representation
+        
+    Returns:
+        True if the client already holds the current representation
+    """
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    # Weak comparison is what RFC 9110 prescribes for If-None-Match
+    return "*" in candidates or any(
+        candidate.removeprefix("W/") == etag for candidate in candidates
+    )
+
+
+def not_modified(etag: str, cache_control: str = "no-cache") -> Response:
+    """Build an empty 304 response carrying the validator."""
+    return Response(
+        status_code=status.HTTP_304_NOT_MODIFIED,
+        headers={"ETag": etag, "Cache-Control": cache_control}
+    )
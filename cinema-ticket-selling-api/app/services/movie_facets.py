@@ -0,0 +1,135 @@
+"""Facet counts for the movie filter endpoints.
+
+The filter sidebar shows, for every facet value (each genre, language,
+country, rating and release year), how many movies match the current
+filters. Instead of one ``COUNT`` query per value, the facet columns of all
+matching movies are read in one query and tallied in a single pass.
+
+Counts depend only on the filters, not on paging or sorting, so they are
+cached per normalized filter set in a bounded LRU cache for
+``settings.FACET_CACHE_TTL_SECONDS``. The routes that write movies and
+cast members clear the cache after committing, and the review routes drop
+the counts filtered by average rating; other worker processes pick the
+change up once their entries expire.
+"""
+
+import threading
+import time
+from collections import Counter, OrderedDict
+from typing import Any, Dict, Hashable, Mapping, Optional, Tuple
+
+from sqlmodel import Session, select
+
+from app.config import settings
+from app.models.movie import Movie
+from app.models.movie_genre import genre_key
+
+FACETS = ("genre", "language", "country", "rating", "release_year")
+FACETS_DESCRIPTION = (
+    "Also return the number of matching movies per " + ", ".join(FACETS)
+    + ' (the response becomes {"movies": [...], "facets": {...}})'
+)
+
+FacetCounts = Dict[str, Dict[str, int]]
+
+
+def facet_key(endpoint: str, filters: Mapping[str, Any]) -> Tuple[Hashable, ...]:
+    """
+    Cache key of a filter set: unset filters are dropped and text is trimmed
+    and lowercased, since every text filter is case-insensitive.
+    """
+    normalized = []
+    for name, value in filters.items():
+        if isinstance(value, str):
+            value = value.strip().lower()
+        if value is None or value == "":
+            continue
+        normalized.append((name, value))
+    return (endpoint, *sorted(normalized))
+
+
+def count_facets(session: Session, statement) -> FacetCounts:
+    """
+    Count the movies matching a filtered movie query per facet value.
+
+    Args:
+        session: Database session
+        statement: The endpoint's filtered ``select(Movie)``, before paging
+
+    Returns:
+        Facet -> value -> number of movies, most common values first
+    """
+    matching = statement.with_only_columns(Movie.id).order_by(None)
+    rows = session.exec(
+        select(Movie.genre, Movie.language, Movie.country, Movie.rating, Movie.release_date)
+        .where(Movie.id.in_(matching))
+        .order_by(Movie.id)
+    ).all()
+
+    counts = {facet: Counter() for facet in FACETS}
+    # Genres are counted case-insensitively, under their first spelling seen
+    genre_names: Dict[str, str] = {}
+    for genres, language, country, rating, release_date in rows:
+        for genre in genres or ():
+            counts["genre"][genre_names.setdefault(genre_key(genre), genre.strip())] += 1
+        for facet, value in (("language", language), ("country", country), ("rating", rating)):
+            if value and value.strip():
+                counts[facet][value.strip()] += 1
+        if release_date is not None:
+            counts["release_year"][str(release_date.year)] += 1
+
+    return {
+        facet: dict(sorted(values.items(), key=lambda item: (-item[1], item[0])))
+        for facet, values in counts.items()
+    }
+
+
+class FacetCache:
+    """LRU + TTL cache of facet counts, keyed by normalized filter set."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[Hashable, Tuple[float, FacetCounts]]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[FacetCounts]:
+        """Get the cached counts of a filter set (None if missing or expired)."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            cached_at, counts = entry
+            if time.monotonic() - cached_at >= settings.FACET_CACHE_TTL_SECONDS:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return counts
+
+    def put(self, key: Hashable, counts: FacetCounts) -> None:
+        """Cache the counts of a filter set."""
+        with self._lock:
+            self._entries[key] = (time.monotonic(), counts)
+            self._entries.move_to_end(key)
+            while len(self._entries) > settings.FACET_CACHE_MAX_ENTRIES:
+                self._entries.popitem(last=False)
+
+    def counts(self, session: Session, key: Hashable, statement) -> FacetCounts:
+        """Cached counts of a filter set, computed with ``count_facets`` on a miss."""
+        counts = self.get(key)
+        if counts is None:
+            counts = count_facets(session, statement)
+            self.put(key, counts)
+        return counts
+
+    def invalidate_filter(self, name: str) -> None:
+        """Drop the cached counts of the filter sets using filter ``name``."""
+        with self._lock:
+            for key in [key for key in self._entries if any(item[0] == name for item in key[1:])]:
+                del self._entries[key]
+
+    def clear(self) -> None:
+        """Drop every cached count, e.g. after the catalog changed."""
+        with self._lock:
+            self._entries.clear()
+
+
+facet_cache = FacetCache()
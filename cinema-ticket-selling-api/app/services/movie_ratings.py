@@ -0,0 +1,73 @@
+"""Incrementally maintained review aggregates on ``Movie``.
+
+``Movie.avg_rating`` and ``Movie.review_count`` summarize the movie's
+non-deleted reviews, so rating filters and sorts are plain indexed column
+lookups instead of ``AVG(Review.rating)`` over every review.
+
+The review routes execute one of the UPDATE statements below in the same
+transaction as the review change. Each statement derives the new values from
+the current row inside the database (SET expressions see the old values),
+so concurrent reviews of the same movie cannot overwrite each other's update.
+``recompute_movie_ratings`` rebuilds the aggregates from the reviews.
+"""
+
+from typing import Optional
+
+from sqlalchemy import case, func, select, update
+from sqlalchemy.sql import Update
+
+from app.models.movie import Movie
+from app.models.review import Review
+
+
+def review_added(movie_id: int, rating: int) -> Update:
+    """Statement folding a new review into the movie's aggregates."""
+    return (
+        update(Movie)
+        .where(Movie.id == movie_id)
+        .values(
+            avg_rating=(func.coalesce(Movie.avg_rating, 0.0) * Movie.review_count + rating) / (Movie.review_count + 1),
+            review_count=Movie.review_count + 1,
+        )
+    )
+
+
+def review_removed(movie_id: int, rating: int) -> Update:
+    """Statement taking a deleted review out of the movie's aggregates."""
+    return (
+        update(Movie)
+        .where(Movie.id == movie_id, Movie.review_count > 0)
+        .values(
+            avg_rating=case(
+                (Movie.review_count <= 1, None),
+                else_=(Movie.avg_rating * Movie.review_count - rating) / (Movie.review_count - 1),
+            ),
+            review_count=Movie.review_count - 1,
+        )
+    )
+
+
+def review_changed(movie_id: int, old_rating: int, new_rating: int) -> Update:
+    """Statement applying an edited review rating to the movie's aggregates."""
+    return (
+        update(Movie)
+        .where(Movie.id == movie_id, Movie.review_count > 0)
+        .values(avg_rating=Movie.avg_rating + float(new_rating - old_rating) / Movie.review_count)
+    )
+
+
+def recompute_movie_ratings(movie_id: Optional[int] = None) -> Update:
+    """
+    Statement rebuilding the aggregates from the reviews table.
+
+    Args:
+        movie_id: Only rebuild this movie (every movie if None)
+    """
+    live_reviews = (Review.movie_id == Movie.id) & (Review.is_deleted == False)
+    statement = update(Movie).values(
+        avg_rating=select(func.avg(Review.rating)).where(live_reviews).scalar_subquery(),
+        review_count=select(func.count(Review.id)).where(live_reviews).scalar_subquery(),
+    )
+    if movie_id is not None:
+        statement = statement.where(Movie.id == movie_id)
+    return statement
@@ -0,0 +1,150 @@
+"""Full-text search over movies.
+
+Matching ``ilike '%q%'`` against several columns cannot use an index, so
+movies are searched through the database's full-text engine instead:
+
+* PostgreSQL: a generated ``movie.search_vector`` tsvector column (title and
+  director weighted above genre and description) with a GIN index.
+* SQLite: an external-content FTS5 table ``movie_fts`` kept in sync with
+  ``movie`` by triggers.
+
+Both are maintained by the database itself, so every insert, update and
+delete of a movie is reflected immediately, whichever code path made it.
+Results are ordered by relevance. Other databases fall back to ``ilike``.
+
+Every word of the query must match, and the last word may be incomplete, so
+results can be shown while the user is still typing.
+"""
+
+import re
+from typing import Any, List, Sequence
+
+from sqlalchemy import Float, Integer, event, func, literal_column, text
+from sqlalchemy.engine import Connection
+from sqlmodel import Session, or_, select
+
+from app.models.movie import Movie
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+SQLITE_SEARCH_DDL = [
+    "CREATE VIRTUAL TABLE movie_fts USING fts5("
+    "title, director, genre, description, "
+    "content='movie', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+    "CREATE TRIGGER movie_fts_after_insert AFTER INSERT ON movie BEGIN "
+    "INSERT INTO movie_fts(rowid, title, director, genre, description) "
+    "VALUES (new.id, new.title, new.director, new.genre, new.description); END",
+    "CREATE TRIGGER movie_fts_after_delete AFTER DELETE ON movie BEGIN "
+    "INSERT INTO movie_fts(movie_fts, rowid, title, director, genre, description) "
+    "VALUES ('delete', old.id, old.title, old.director, old.genre, old.description); END",
+    "CREATE TRIGGER movie_fts_after_update AFTER UPDATE ON movie BEGIN "
+    "INSERT INTO movie_fts(movie_fts, rowid, title, director, genre, description) "
+    "VALUES ('delete', old.id, old.title, old.director, old.genre, old.description); "
+    "INSERT INTO movie_fts(rowid, title, director, genre, description) "
+    "VALUES (new.id, new.title, new.director, new.genre, new.description); END",
+    "INSERT INTO movie_fts(movie_fts) VALUES ('rebuild')",
+]
+
+POSTGRES_SEARCH_DDL = [
+    "ALTER TABLE movie ADD COLUMN IF NOT EXISTS search_vector tsvector GENERATED ALWAYS AS ("
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(director, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(genre::text, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'C')"
+    ") STORED",
+    "CREATE INDEX IF NOT EXISTS ix_movie_search_vector ON movie USING GIN (search_vector)",
+]
+
+# bm25 weights of the movie_fts columns: title, director, genre, description
+SQLITE_COLUMN_WEIGHTS = "10.0, 5.0, 5.0, 1.0"
+
+
+def install_search_index(connection: Connection) -> None:
+    """
+    Create the full-text index of movies if it does not exist yet.
+
+    Args:
+        connection: Connection to the database holding the movie table
+    """
+    dialect = connection.dialect.name
+    if dialect == "sqlite":
+        exists = connection.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'movie_fts'")
+        ).first()
+        if not exists:
+            for statement in SQLITE_SEARCH_DDL:
+                connection.execute(text(statement))
+    elif dialect == "postgresql":
+        for statement in POSTGRES_SEARCH_DDL:
+            connection.execute(text(statement))
+
+
+@event.listens_for(Movie.__table__, "after_create")
+def _install_after_create(target, connection, **kwargs) -> None:
+    install_search_index(connection)
+
+
+def search_terms(query: str) -> List[str]:
+    """Split a search query into lowercase words, dropping punctuation."""
+    return _WORD.findall(query.lower())
+
+
+def search_movies(
+    session: Session,
+    query: str,
+    skip: int = 0,
+    limit: int = 100,
+    options: Sequence[Any] = ()
+) -> List[Movie]:
+    """
+    Search movies by title, director, genre and description.
+
+    Args:
+        session: Database session
+        query: Free-text query; the last word is matched as a prefix
+        skip: Number of results to skip
+        limit: Maximum number of results
+        options: Loader options for the Movie query (e.g. ``load_only``)
+
+    Returns:
+        Matching movies, most relevant first
+    """
+    terms = search_terms(query)
+    if not terms:
+        return []
+
+    dialect = session.get_bind().dialect.name
+    if dialect == "sqlite":
+        # Quoted terms keep FTS5 operators in the input from being interpreted
+        match = " ".join(f'"{term}"' for term in terms[:-1]) + f' "{terms[-1]}"*'
+        ranked = text(
+            f"SELECT rowid AS id, bm25(movie_fts, {SQLITE_COLUMN_WEIGHTS}) AS rank "
+            "FROM movie_fts WHERE movie_fts MATCH :match"
+        ).bindparams(match=match.strip()).columns(id=Integer, rank=Float).subquery()
+        statement = (
+            select(Movie)
+            .join(ranked, ranked.c.id == Movie.id)
+            .order_by(ranked.c.rank, Movie.id)
+        )
+    elif dialect == "postgresql":
+        ts_query = func.to_tsquery("english", " & ".join(terms[:-1] + [f"{terms[-1]}:*"]))
+        search_vector = literal_column("movie.search_vector")
+        statement = (
+            select(Movie)
+            .where(search_vector.op("@@")(ts_query))
+            .order_by(func.ts_rank_cd(search_vector, ts_query).desc(), Movie.id)
+        )
+    else:
+        statement = select(Movie)
+        for term in terms:
+            pattern = f"%{term}%"
+            statement = statement.where(or_(
+                Movie.title.ilike(pattern),
+                Movie.genre.ilike(pattern),
+                Movie.director.ilike(pattern),
+                Movie.description.ilike(pattern)
+            ))
+        statement = statement.order_by(Movie.id)
+
+    return session.exec(statement.options(*options).offset(skip).limit(limit)).all()
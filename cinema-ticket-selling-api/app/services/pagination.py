@@ -0,0 +1,194 @@
+"""Keyset (cursor) pagination for listing endpoints.
+
+``offset(skip)`` makes the database read and discard every earlier row, so
+deep pages get slower the further a client goes. With keyset pagination the
+client passes back an opaque cursor holding the sort values of the last row
+it received, and the next page starts with a ``WHERE (sort columns) > (last
+values)`` seek that an index can answer directly, whatever the depth.
+
+Listing endpoints accept ``cursor`` next to ``skip``/``limit`` and return the
+cursor of the following page in the ``X-Next-Cursor`` response header when
+the page is full. Pages are ordered by the endpoint's sort columns, then by
+``id`` so every position is unique. NULL sort values are ordered last in
+both directions, the same way on every database.
+
+When every sort column goes the same direction, the seek is a single
+row-value comparison, ``(release_date, id) < (:date, :id)``, which a
+composite index on the sort columns answers with a range scan. A nullable
+leading sort column splits the rows into two partitions, the non-NULL values
+and then the NULLs; each partition is read with its own index range scan and
+limit, and only the (at most ``2 * limit``) keys they return are merged in
+sort order. Mixed directions fall back to an OR of per-column seeks.
+"""
+
+import base64
+import hashlib
+import json
+from datetime import date, datetime
+from typing import Any, List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException, Response, status
+from sqlalchemy import and_, false, or_, select, tuple_, union_all
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+# (column, descending) pairs; the last one must be unique, normally ``id``
+SortOrder = Sequence[Tuple[Any, bool]]
+
+
+def _signature(order: SortOrder) -> str:
+    description = ",".join(f"{column}:{'desc' if descending else 'asc'}" for column, descending in order)
+    return hashlib.sha256(description.encode()).hexdigest()[:12]
+
+
+def _dump_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"d": value.isoformat()}
+    return value
+
+
+def _load_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        if "dt" in value:
+            return datetime.fromisoformat(value["dt"])
+        return date.fromisoformat(value["d"])
+    return value
+
+
+def encode_cursor(order: SortOrder, values: Sequence[Any]) -> str:
+    """Build the opaque cursor of a position in the given sort order."""
+    payload = json.dumps({"s": _signature(order), "v": [_dump_value(value) for value in values]})
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(order: SortOrder, cursor: str) -> List[Any]:
+    """
+    Read the sort values back from a cursor.
+
+    Raises:
+        HTTPException: If the cursor is malformed or belongs to another sort order
+    """
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if payload["s"] != _signature(order) or len(payload["v"]) != len(order):
+            raise ValueError("cursor does not match the sort order")
+        return [_load_value(value) for value in payload["v"]]
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor"
+        )
+
+
+def _after(column, descending: bool, value: Any):
+    # NULLs sort last, so nothing comes after a NULL and NULLs come after any value
+    if value is None:
+        return false()
+    return or_(column < value if descending else column > value, column.is_(None))
+
+
+def _same(column, value: Any):
+    return column.is_(None) if value is None else column == value
+
+
+def _seek_any(order: SortOrder, values: Sequence[Any]):
+    """Rows after ``values`` in any sort order, as an OR of per-column seeks."""
+    return or_(*[
+        and_(
+            *[_same(column, value) for (column, _), value in zip(order[:index], values)],
+            _after(order[index][0], order[index][1], values[index])
+        )
+        for index in range(len(order))
+    ])
+
+
+def _seek(columns: Sequence[Any], descending: bool, values: Sequence[Any]):
+    """Rows after non-NULL ``values`` when every column goes the same direction."""
+    if len(columns) == 1:
+        return columns[0] < values[0] if descending else columns[0] > values[0]
+    if descending:
+        return tuple_(*columns) < tuple_(*values)
+    return tuple_(*columns) > tuple_(*values)
+
+
+def _nullable(column) -> bool:
+    return bool(getattr(column.expression, "nullable", True))
+
+
+def _order_by(column, descending: bool):
+    # NULLS LAST is spelled out for nullable columns only: on others it would
+    # keep the database from reading the order off an index
+    clause = column.desc() if descending else column.asc()
+    return clause.nulls_last() if _nullable(column) else clause
+
+
+def _partition_keys(statement, order: SortOrder, limit: int, *criteria):
+    """The sort values of the first ``limit`` rows of one partition, as a subquery."""
+    return (
+        statement.with_only_columns(*[column for column, _ in order])
+        .where(*criteria)
+        .order_by(*[column.desc() if descending else column.asc() for column, descending in order])
+        .limit(limit)
+        .subquery()
+    )
+
+
+def paginate(statement, order: SortOrder, cursor: Optional[str], skip: int, limit: int):
+    """
+    Order a query and select one page of it.
+
+    Args:
+        statement: Select statement to paginate
+        order: Sort columns as (column, descending) pairs, ending with a unique,
+            non-nullable column
+        cursor: Cursor returned with the previous page (``skip`` is ignored when given)
+        skip: Number of rows to skip when no cursor is given
+        limit: Maximum number of rows
+
+    Returns:
+        The statement for the requested page
+    """
+    ordering = [_order_by(column, descending) for column, descending in order]
+    values = decode_cursor(order, cursor) if cursor else None
+    if values is None and skip:
+        return statement.order_by(*ordering).offset(skip).limit(limit)
+
+    columns = [column for column, _ in order]
+    descending = order[0][1]
+    if any(direction != descending for _, direction in order) or any(map(_nullable, columns[1:])):
+        if values is not None:
+            statement = statement.where(_seek_any(order, values))
+        return statement.order_by(*ordering).limit(limit)
+
+    if not _nullable(columns[0]):
+        if values is not None:
+            statement = statement.where(_seek(columns, descending, values))
+        return statement.order_by(*ordering).limit(limit)
+
+    leading, key = columns[0], columns[-1]
+    if values is not None and values[0] is None:
+        # Already among the NULLs: seek on the remaining columns
+        return statement.where(leading.is_(None), _seek(columns[1:], descending, values[1:])).order_by(
+            *ordering
+        ).limit(limit)
+
+    non_null = [leading.is_not(None)]
+    if values is not None:
+        non_null.append(_seek(columns, descending, values))
+    partitions = [
+        _partition_keys(statement, order, limit, *non_null),
+        _partition_keys(statement, order, limit, leading.is_(None)),
+    ]
+    keys = union_all(*[select(partition.c[key.key]) for partition in partitions])
+    return statement.where(key.in_(keys)).order_by(*ordering).limit(limit)
+
+
+def set_next_cursor(response: Response, rows: Sequence[Any], order: SortOrder, limit: int) -> None:
+    """Advertise the cursor of the following page when this page is full."""
+    if rows and len(rows) >= limit:
+        last = rows[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(
+            order, [getattr(last, column.key) for column, _ in order]
+        )
@@ -0,0 +1,157 @@
+"""Bounded process pool for bcrypt hashing and verification.
+
+bcrypt is deliberately CPU-expensive. Running it on the event loop stalls
+every in-flight request, and running it in the shared threadpool takes slots
+meant for database work. Async routes therefore hand password operations to
+a small dedicated process pool. Operations beyond
+``settings.PASSWORD_HASH_MAX_PENDING`` are rejected immediately with a 503,
+so a login storm cannot queue up unbounded work.
+
+The bcrypt cost comes from ``settings.BCRYPT_ROUNDS``, or, when
+``settings.BCRYPT_TARGET_HASH_MS`` is set, from a calibration run at startup
+that picks the highest cost hashing within that time on this machine. Stored
+hashes with a lower cost are upgraded on the next successful login (see
+``needs_rehash``); hashes with a higher cost are kept, so workers that
+calibrated to different costs do not keep rewriting each other's hashes.
+
+The functions the workers run live in ``app.password_worker``, outside this
+package, so that spawned worker processes only import bcrypt.
+"""
+
+import asyncio
+import math
+import multiprocessing
+import statistics
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional
+
+from fastapi import HTTPException, status
+
+from app.config import settings
+from app.password_worker import check_password, hash_password
+
+
+# bcrypt accepts costs up to 31, but every step doubles the hashing time
+MAX_CALIBRATED_ROUNDS = 16
+# Calibration uses the median of this many timed hashes
+CALIBRATION_SAMPLES = 5
+
+
+def hash_rounds(hashed_password: str) -> int:
+    """Return the cost a bcrypt hash was created with (``$2b$<cost>$...``)."""
+    return int(hashed_password.split("$")[2])
+
+
+class PasswordHasher:
+    """Runs bcrypt in a dedicated process pool with a bounded backlog."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._pending = 0
+        self.rounds = settings.BCRYPT_ROUNDS
+
+    def calibrate(self, target_ms: float) -> int:
+        """
+        Pick the highest bcrypt cost that hashes within ``target_ms`` here.
+
+        ``CALIBRATION_SAMPLES`` hashes are timed at ``settings.BCRYPT_MIN_ROUNDS``
+        and their median is kept; every extra cost step doubles the time, so
+        the rest is extrapolated. The result never goes below the minimum
+        cost.
+
+        Args:
+            target_ms: Target hashing latency in milliseconds
+
+        Returns:
+            The selected cost, also used for every new hash from now on
+        """
+        min_rounds = settings.BCRYPT_MIN_ROUNDS
+        samples = []
+        for _ in range(CALIBRATION_SAMPLES):
+            started = time.perf_counter()
+            hash_password("calibration", min_rounds)
+            samples.append((time.perf_counter() - started) * 1000)
+        elapsed_ms = statistics.median(samples)
+        extra = math.floor(math.log2(target_ms / elapsed_ms)) if elapsed_ms < target_ms else 0
+        self.rounds = min(MAX_CALIBRATED_ROUNDS, min_rounds + extra)
+        return self.rounds
+
+    def needs_rehash(self, hashed_password: str) -> bool:
+        """Whether a stored hash was created with a lower cost than the current one."""
+        try:
+            return hash_rounds(hashed_password) < self.rounds
+        except (IndexError, ValueError):
+            return True
+
+    @property
+    def pending(self) -> int:
+        """Number of password operations queued or running."""
+        return self._pending
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # Spawn rather than fork: the server process runs threads
+                self._executor = ProcessPoolExecutor(
+                    max_workers=settings.PASSWORD_HASH_WORKERS,
+                    mp_context=multiprocessing.get_context("spawn"),
+                )
+            return self._executor
+
+    async def _run(self, func: Callable[..., Any], *args: Any) -> Any:
+        with self._lock:
+            if self._pending >= settings.PASSWORD_HASH_MAX_PENDING:
+                raise _overloaded()
+            self._pending += 1
+        try:
+            executor = self._get_executor()
+            return await asyncio.get_running_loop().run_in_executor(executor, func, *args)
+        except BrokenProcessPool:
+            # A worker died; start a fresh pool for the next request
+            with self._lock:
+                if self._executor is executor:
+                    self._executor = None
+            raise _overloaded()
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    async def hash(self, password: str) -> str:
+        """
+        Hash a password in the worker pool.
+
+        Raises:
+            HTTPException: 503 if too many password operations are pending
+        """
+        return await self._run(hash_password, password, self.rounds)
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        """
+        Verify a password against a bcrypt hash in the worker pool.
+
+        Raises:
+            HTTPException: 503 if too many password operations are pending
+        """
+        return await self._run(check_password, password, hashed_password)
+
+    def shutdown(self) -> None:
+        """Stop the worker processes."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+def _overloaded() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many password operations in progress, please retry shortly",
+        headers={"Retry-After": "1"},
+    )
+
+
+password_hasher = PasswordHasher()
@@ -0,0 +1,131 @@
+"""Best-available seat allocation.
+
+Finds the block of adjacent free seats closest to the centre of the room in a
+single pass over the cached room layout and availability bitmap, then books
+it with the regular transactional booking service.
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+from fastapi import HTTPException, status
+from sqlmodel import Session
+
+from app.models.ticket import Ticket
+from app.services.cinema import _get_bookable_screening, book_tickets
+from app.services.seat_index import ScreeningAvailability, seat_index
+
+# Bookings that lose a race for the chosen block are retried on fresh state
+MAX_ALLOCATION_ATTEMPTS = 3
+
+
+def _row_sort_key(row_label: str) -> Tuple[int, str]:
+    """Order row labels A..Z, AA, AB, ... as bulk seat creation assigns them."""
+    return len(row_label), row_label
+
+
+def find_best_block(
+    availability: ScreeningAvailability,
+    party_size: int,
+    seat_type: Optional[str] = None
+) -> Optional[List[int]]:
+    """
+    Find the best block of adjacent free seats for a party.
+    
+    Seats are adjacent when they share a row and have consecutive seat
+    numbers. Blocks are ranked by the distance of their centre to the centre
+    row, then to the centre of their row; ties go to the front-most, then
+    left-most block.
+    
+    Args:
+        availability: Availability bitmap of the screening
+        party_size: Number of seats wanted
+        seat_type: Restrict the block to this seat type
+        
+    Returns:
+        Seat IDs of the best block, or None if no block fits
+    """
+    rows: Dict[str, List[Tuple[int, int, bool]]] = {}
+    for seat in availability.layout.seats:
+        usable = (seat_type is None or seat.seat_type == seat_type) and availability.is_available(seat.id)
+        rows.setdefault(seat.row_label, []).append((seat.seat_number, seat.id, usable))
+    
+    row_labels = sorted(rows, key=_row_sort_key)
+    centre_row = (len(row_labels) - 1) / 2
+    best: Optional[Tuple[float, float, int, int]] = None
+    best_block: Optional[List[int]] = None
+    
+    for row_index, row_label in enumerate(row_labels):
+        seats = sorted(rows[row_label])
+        centre_seat = (seats[0][0] + seats[-1][0]) / 2
+        row_distance = abs(row_index - centre_row)
+        if best is not None and row_distance > best[0]:
+            continue
+        
+        # Length of the current run of usable, consecutive seats ending at i
+        run = 0
+        for i, (seat_number, _, usable) in enumerate(seats):
+            if not usable:
+                run = 0
+                continue
+            run = run + 1 if run and seats[i - 1][0] == seat_number - 1 else 1
+            if run < party_size:
+                continue
+            first_number = seats[i - party_size + 1][0]
+            score = (row_distance, abs((first_number + seat_number) / 2 - centre_seat), row_index, first_number)
+            if best is None or score < best:
+                best = score
+                best_block = [seat_id for _, seat_id, _ in seats[i - party_size + 1:i + 1]]
+    
+    return best_block
+
+
+def book_best_available(
+    session: Session,
+    user_id: int,
+    screening_id: int,
+    party_size: int,
+    seat_type: Optional[str] = None
+) -> List[Ticket]:
+    """
+    Book the best block of adjacent seats for a party.
+    
+    Args:
+        session: Database session
+        user_id: ID of the user booking tickets
+        screening_id: ID of the screening
+        party_size: Number of adjacent seats to book
+        seat_type: Restrict the block to this seat type
+        
+    Returns:
+        List of created tickets, in seat order
+        
+    Raises:
+        HTTPException: If the screening is not bookable, or 409 if no block
+            of adjacent seats is available
+    """
+    # The maintained counters rule out sold-out screenings without a scan
+    screening = _get_bookable_screening(session, screening_id)
+    if screening.available_seats_count < party_size:
+        raise _no_block_available(party_size, seat_type)
+    
+    for _ in range(MAX_ALLOCATION_ATTEMPTS):
+        block = find_best_block(seat_index.get(session, screening_id), party_size, seat_type)
+        if block is None:
+            raise _no_block_available(party_size, seat_type)
+        try:
+            return book_tickets(session, user_id, screening_id, block)
+        except HTTPException as exc:
+            if exc.status_code != status.HTTP_409_CONFLICT:
+                raise
+            # Someone else took part of the block: retry on fresh state
+            seat_index.invalidate_screening(screening_id)
+    
+    raise _no_block_available(party_size, seat_type)
+
+
+def _no_block_available(party_size: int, seat_type: Optional[str]) -> HTTPException:
+    seat_kind = f"{seat_type} seats" if seat_type else "seats"
+    return HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail=f"No block of {party_size} adjacent {seat_kind} is available"
+    )
@@ -0,0 +1,258 @@
+"""In-process seat availability index for screenings.
+
+Each screening is tracked as a bitmap over its room layout (one bit per seat,
+in seat id order). The bitmap is built lazily from the ``Ticket`` and
+``SeatHold`` tables on first access and then kept in sync by the booking
+services, so availability lookups are answered from memory instead of
+querying Seat and Ticket rows.
+
+Layouts and bitmaps also carry content hashes (``RoomLayout.version`` and
+``ScreeningAvailability.etag``) so HTTP clients can revalidate seat maps
+cheaply. The hashes only depend on the data, so every worker process
+computes the same value for the same state.
+"""
+
+import base64
+import hashlib
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from fastapi import HTTPException, status
+from sqlmodel import Session, select
+
+from app.config import settings
+from app.models.cinema import Seat
+from app.models.screening import Screening
+from app.models.seat_hold import SeatHold
+from app.models.ticket import Ticket
+from app.schemas.cinema import SeatRead
+
+
+class RoomLayout:
+    """Immutable snapshot of the seats of a room, in seat id order."""
+
+    __slots__ = ("room_id", "seats", "positions", "full_mask", "version", "built_at")
+
+    def __init__(self, room_id: int, seats: Iterable[SeatRead]):
+        self.room_id = room_id
+        self.seats = tuple(seats)
+        self.positions = {seat.id: index for index, seat in enumerate(self.seats)}
+        self.full_mask = (1 << len(self.seats)) - 1
+        digest = hashlib.sha256(str(room_id).encode())
+        for seat in self.seats:
+            digest.update(f"|{seat.id}:{seat.row_label}:{seat.seat_number}:{seat.seat_type}".encode())
+        self.version = digest.hexdigest()[:16]
+        self.built_at = time.monotonic()
+
+    def mask_for(self, seat_ids: Iterable[int]) -> int:
+        """Return the bitmask of the given seat IDs (unknown IDs are ignored)."""
+        mask = 0
+        for seat_id in seat_ids:
+            position = self.positions.get(seat_id)
+            if position is not None:
+                mask |= 1 << position
+        return mask
+
+
+class ScreeningAvailability:
+    """Booked-seat bitmap of a screening over its room layout."""
+
+    __slots__ = ("screening_id", "layout", "booked", "built_at")
+
+    def __init__(self, screening_id: int, layout: RoomLayout, booked: int):
+        self.screening_id = screening_id
+        self.layout = layout
+        self.booked = booked
+        self.built_at = time.monotonic()
+
+    @property
+    def room_id(self) -> int:
+        return self.layout.room_id
+
+    @property
+    def available_mask(self) -> int:
+        return self.layout.full_mask & ~self.booked
+
+    @property
+    def available_count(self) -> int:
+        return self.available_mask.bit_count()
+
+    def is_available(self, seat_id: int) -> bool:
+        """Check whether a seat of the room is free for this screening."""
+        position = self.layout.positions.get(seat_id)
+        return position is not None and not (self.booked >> position) & 1
+
+    def packed_availability(self) -> str:
+        """
+        Return the availability bitmap as base64.
+        
+        Bit ``i`` (least significant bit of byte ``i // 8`` first) is set when
+        ``layout.seats[i]`` is free.
+        """
+        size = (len(self.layout.seats) + 7) // 8
+        return base64.b64encode(self.available_mask.to_bytes(size, "little")).decode("ascii")
+
+    @property
+    def etag(self) -> str:
+        """Strong validator of the layout version and the availability bitmap."""
+        digest = hashlib.sha256(f"{self.layout.version}:{self.booked:x}".encode())
+        return digest.hexdigest()[:32]
+
+    def available_seats(self) -> List[SeatRead]:
+        """Return the free seats of the room, in seat id order."""
+        seats = self.layout.seats
+        mask = self.available_mask
+        available = []
+        while mask:
+            lowest = mask & -mask
+            available.append(seats[lowest.bit_length() - 1])
+            mask ^= lowest
+        return available
+
+
+class SeatAvailabilityIndex:
+    """Per-process cache of seat availability bitmaps, keyed by screening ID.
+
+    Entries are rebuilt from the database once they are older than
+    ``settings.SEAT_INDEX_TTL_SECONDS`` so that bookings made by other worker
+    processes become visible within a bounded delay. Booking correctness never
+    depends on this cache: the booking services always validate against the
+    database.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._layouts: Dict[int, RoomLayout] = {}
+        self._screenings: Dict[int, ScreeningAvailability] = {}
+        # Bumped on every change so a build racing with a booking is discarded
+        self._generations: Dict[int, int] = {}
+
+    def _is_fresh(self, built_at: float) -> bool:
+        return time.monotonic() - built_at < settings.SEAT_INDEX_TTL_SECONDS
+
+    def get(self, session: Session, screening_id: int) -> ScreeningAvailability:
+        """
+        Get the availability bitmap of a screening, building it if needed.
+
+        Args:
+            session: Database session (only used when the entry must be built)
+            screening_id: ID of the screening
+
+        Returns:
+            Availability entry for the screening
+
+        Raises:
+            HTTPException: If the screening does not exist
+        """
+        entry = self._screenings.get(screening_id)
+        if entry is not None and self._is_fresh(entry.built_at):
+            return entry
+        return self._build(session, screening_id)
+
+    def _build(self, session: Session, screening_id: int) -> ScreeningAvailability:
+        generation = self._generations.get(screening_id, 0)
+
+        screening = session.get(Screening, screening_id)
+        if not screening:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Screening with id {screening_id} not found"
+            )
+
+        layout = self._get_layout(session, screening.room_id)
+
+        booked_seats_stmt = select(Ticket.seat_id).where(
+            Ticket.screening_id == screening_id,
+            Ticket.status != "cancelled"
+        )
+        held_seats_stmt = select(SeatHold.seat_id).where(
+            SeatHold.screening_id == screening_id,
+            SeatHold.expires_at > datetime.utcnow()
+        )
+        taken_seat_ids = session.exec(booked_seats_stmt.union_all(held_seats_stmt)).scalars().all()
+        booked = layout.mask_for(taken_seat_ids)
+        entry = ScreeningAvailability(screening_id, layout, booked)
+
+        with self._lock:
+            if self._generations.get(screening_id, 0) == generation:
+                self._screenings[screening_id] = entry
+        return entry
+
+    def get_layout(self, session: Session, room_id: int) -> RoomLayout:
+        """Get the seat layout of a room, building it if needed."""
+        return self._get_layout(session, room_id)
+
+    def cached_layout(self, room_id: int) -> Optional[RoomLayout]:
+        """Get the seat layout of a room if it is cached and fresh, without touching the database."""
+        layout = self._layouts.get(room_id)
+        if layout is not None and self._is_fresh(layout.built_at):
+            return layout
+        return None
+
+    def _get_layout(self, session: Session, room_id: int) -> RoomLayout:
+        layout = self.cached_layout(room_id)
+        if layout is not None:
+            return layout
+
+        seats = session.exec(
+            select(Seat).where(Seat.room_id == room_id).order_by(Seat.id)
+        ).all()
+        layout = RoomLayout(
+            room_id,
+            (
+                SeatRead(
+                    id=seat.id,
+                    room_id=seat.room_id,
+                    row_label=seat.row_label,
+                    seat_number=seat.seat_number,
+                    seat_type=seat.seat_type,
+                )
+                for seat in seats
+            ),
+        )
+        with self._lock:
+            self._layouts[room_id] = layout
+        return layout
+
+    def mark_booked(self, screening_id: int, seat_ids: Iterable[int]) -> None:
+        """Flag seats as booked for a screening after a committed booking."""
+        with self._lock:
+            self._generations[screening_id] = self._generations.get(screening_id, 0) + 1
+            entry = self._screenings.get(screening_id)
+            if entry is not None:
+                entry.booked |= entry.layout.mask_for(seat_ids)
+
+    def mark_released(self, screening_id: int, seat_ids: Iterable[int]) -> None:
+        """Flag seats as free again for a screening after a committed cancellation."""
+        with self._lock:
+            self._generations[screening_id] = self._generations.get(screening_id, 0) + 1
+            entry = self._screenings.get(screening_id)
+            if entry is not None:
+                entry.booked &= ~entry.layout.mask_for(seat_ids)
+
+    def invalidate_screening(self, screening_id: int) -> None:
+        """Drop the cached bitmap of a screening so it is rebuilt on next access."""
+        with self._lock:
+            self._generations[screening_id] = self._generations.get(screening_id, 0) + 1
+            self._screenings.pop(screening_id, None)
+
+    def invalidate_room(self, room_id: int) -> None:
+        """Drop the cached layout of a room and the bitmaps built on top of it."""
+        with self._lock:
+            self._layouts.pop(room_id, None)
+            for screening_id, entry in list(self._screenings.items()):
+                if entry.room_id == room_id:
+                    self._generations[screening_id] = self._generations.get(screening_id, 0) + 1
+                    del self._screenings[screening_id]
+
+    def clear(self) -> None:
+        """Drop every cached layout and bitmap."""
+        with self._lock:
+            self._layouts.clear()
+            self._screenings.clear()
+            self._generations.clear()
+
+
+seat_index = SeatAvailabilityIndex()
@@ -0,0 +1,71 @@
+"""In-process cache of verified JWT claims.
+
+Clients send the same bearer token with every request, and verifying it
+(HMAC signature check plus JSON parsing) gives the same answer each time
+until the token expires. Verified claims are therefore cached under the
+SHA-256 of the raw token until the token's ``exp``, in a bounded LRU of
+``settings.TOKEN_CLAIMS_CACHE_MAX_ENTRIES`` tokens.
+
+Only tokens that verified successfully are cached, and an expired entry is
+verified again, so expiry is still reported by python-jose. Revocation is not
+part of the claims and is checked separately on every request.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Tuple
+
+from jose import jwt
+
+from app.config import settings
+
+
+class TokenClaimsCache:
+    """LRU cache of verified claims, keyed by the SHA-256 of the token."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[bytes, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+
+    def decode(self, token: str) -> Dict[str, Any]:
+        """
+        Verify a token and return its claims, reusing earlier verifications.
+
+        Args:
+            token: Encoded JWT
+
+        Returns:
+            The token claims
+
+        Raises:
+            JWTError: If the token is invalid or expired
+        """
+        key = hashlib.sha256(token.encode()).digest()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, claims = entry
+                if time.time() < expires_at:
+                    self._entries.move_to_end(key)
+                    return dict(claims)
+                del self._entries[key]
+
+        claims = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        expires_at = claims.get("exp")
+        if isinstance(expires_at, (int, float)):
+            with self._lock:
+                self._entries[key] = (expires_at, claims)
+                self._entries.move_to_end(key)
+                while len(self._entries) > settings.TOKEN_CLAIMS_CACHE_MAX_ENTRIES:
+                    self._entries.popitem(last=False)
+        return dict(claims)
+
+    def clear(self) -> None:
+        """Drop every cached token."""
+        with self._lock:
+            self._entries.clear()
+
+
+claims_cache = TokenClaimsCache()
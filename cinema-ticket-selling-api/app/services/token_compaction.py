@@ -0,0 +1,278 @@
+"""Compaction of expired ``TokenBlacklist`` rows.
+
+A revoked token only needs its blacklist row until the token itself expires,
+but logouts keep inserting rows and nothing removed them. A daemon thread now
+deletes expired rows every ``settings.TOKEN_BLACKLIST_PURGE_INTERVAL_SECONDS``
+in batches of ``settings.TOKEN_BLACKLIST_PURGE_BATCH_SIZE``, committing after
+each batch so no long-running transaction holds locks on the table.
+
+Expired refresh tokens are purged the same way; until they expire, used
+refresh tokens are kept for reuse detection.
+
+On PostgreSQL the blacklist table can be range-partitioned by month of
+``expires_at`` (``settings.TOKEN_BLACKLIST_PARTITIONED``, applied by the
+``e6f1a9c3b472`` migration). The compactor then drops whole partitions once
+their month has passed and creates the partitions for upcoming months ahead
+of time; the batched delete only has to clean up the current month.
+"""
+
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Type
+
+from sqlalchemy import delete, func, text
+from sqlmodel import Session, SQLModel, select
+
+from app.config import settings
+from app.models.refresh_token import RefreshToken
+from app.models.token_blacklist import TokenBlacklist
+
+PARTITION_PREFIX = "tokenblacklist_p"
+
+
+def _month_start(value: datetime) -> datetime:
+    return datetime(value.year, value.month, 1)
+
+
+def _next_month(month: datetime) -> datetime:
+    return datetime(month.year + month.month // 12, month.month % 12 + 1, 1)
+
+
+def partition_name(month: datetime) -> str:
+    """Name of the partition holding tokens that expire in the given month."""
+    return f"{PARTITION_PREFIX}{month:%Y%m}"
+
+
+def is_partitioned(session: Session) -> bool:
+    """Whether the blacklist table is managed as monthly partitions."""
+    return settings.TOKEN_BLACKLIST_PARTITIONED and session.get_bind().dialect.name == "postgresql"
+
+
+def purge_expired_tokens(
+    session: Session,
+    now: datetime,
+    batch_size: int,
+    model: Type[SQLModel] = TokenBlacklist
+) -> int:
+    """
+    Delete expired token rows in batches.
+
+    Args:
+        session: Database session
+        now: Current UTC time
+        batch_size: Rows deleted per transaction
+        model: Token table with ``id`` and ``expires_at`` columns
+
+    Returns:
+        Number of rows deleted
+    """
+    purged = 0
+    while True:
+        expired_ids = session.exec(
+            select(model.id)
+            .where(model.expires_at <= now)
+            .limit(batch_size)
+        ).all()
+        if not expired_ids:
+            return purged
+        session.exec(delete(model).where(model.id.in_(expired_ids)))
+        session.commit()
+        purged += len(expired_ids)
+        if len(expired_ids) < batch_size:
+            return purged
+
+
+def list_partitions(session: Session) -> List[str]:
+    """Names of the monthly partitions of the blacklist table (PostgreSQL only)."""
+    return list(session.exec(
+        text(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE parent.relname = 'tokenblacklist' AND child.relname LIKE :prefix "
+            "ORDER BY child.relname"
+        ).bindparams(prefix=f"{PARTITION_PREFIX}%")
+    ).scalars().all())
+
+
+def drop_expired_partitions(session: Session, now: datetime) -> int:
+    """
+    Drop the partitions whose whole month lies before ``now``.
+
+    Args:
+        session: Database session
+        now: Current UTC time
+
+    Returns:
+        Number of partitions dropped
+    """
+    current = partition_name(_month_start(now))
+    expired = [name for name in list_partitions(session) if name < current]
+    for name in expired:
+        session.exec(text(f'DROP TABLE IF EXISTS "{name}"'))
+    session.commit()
+    return len(expired)
+
+
+def ensure_partitions(session: Session, now: datetime) -> int:
+    """
+    Create the partitions every token issued from now on can expire into.
+
+    Partitions are created through the month after the longest token
+    lifetime, so new rows never land in the default partition.
+
+    Args:
+        session: Database session
+        now: Current UTC time
+
+    Returns:
+        Number of partitions created
+    """
+    existing = set(list_partitions(session))
+    last = _month_start(now + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES))
+    month = _month_start(now)
+    created = 0
+    while month <= _next_month(last):
+        name = partition_name(month)
+        if name not in existing:
+            session.exec(text(
+                f'CREATE TABLE IF NOT EXISTS "{name}" PARTITION OF tokenblacklist '
+                f"FOR VALUES FROM ('{month:%Y-%m-%d}') TO ('{_next_month(month):%Y-%m-%d}')"
+            ))
+            created += 1
+        month = _next_month(month)
+    session.commit()
+    return created
+
+
+class TokenBlacklistCompactor:
+    """Periodically removes expired blacklist rows and records what it did."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._run_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._session_factory: Optional[Callable[[], Session]] = None
+        self._reset_stats()
+
+    def _reset_stats(self) -> None:
+        self.runs = 0
+        self.total_purged = 0
+        self.total_partitions_dropped = 0
+        self.total_refresh_tokens_purged = 0
+        self.last_run_at: Optional[datetime] = None
+        self.last_purged = 0
+        self.last_partitions_dropped = 0
+        self.last_refresh_tokens_purged = 0
+        self.last_duration_ms = 0.0
+        self.last_error: Optional[str] = None
+
+    def run_once(self, session: Session, now: Optional[datetime] = None) -> int:
+        """
+        Compact the blacklist table once.
+
+        Args:
+            session: Database session
+            now: Current UTC time (defaults to now)
+
+        Returns:
+            Number of rows deleted by the batched purge
+        """
+        now = now or datetime.utcnow()
+        with self._run_lock:
+            started = time.perf_counter()
+            partitions_dropped = 0
+            if is_partitioned(session):
+                partitions_dropped = drop_expired_partitions(session, now)
+                ensure_partitions(session, now)
+            purged = purge_expired_tokens(session, now, settings.TOKEN_BLACKLIST_PURGE_BATCH_SIZE)
+            refresh_tokens_purged = purge_expired_tokens(
+                session, now, settings.TOKEN_BLACKLIST_PURGE_BATCH_SIZE, RefreshToken
+            )
+
+            with self._lock:
+                self.runs += 1
+                self.total_purged += purged
+                self.total_partitions_dropped += partitions_dropped
+                self.total_refresh_tokens_purged += refresh_tokens_purged
+                self.last_run_at = now
+                self.last_purged = purged
+                self.last_partitions_dropped = partitions_dropped
+                self.last_refresh_tokens_purged = refresh_tokens_purged
+                self.last_duration_ms = round((time.perf_counter() - started) * 1000, 2)
+                self.last_error = None
+        return purged
+
+    def metrics(self, session: Session, now: Optional[datetime] = None) -> Dict[str, object]:
+        """
+        Report the size of the blacklist table and the compaction history.
+
+        Args:
+            session: Database session
+            now: Current UTC time (defaults to now)
+
+        Returns:
+            Row counts and purge statistics
+        """
+        now = now or datetime.utcnow()
+        rows = session.exec(select(func.count(TokenBlacklist.id))).one()
+        expired_rows = session.exec(
+            select(func.count(TokenBlacklist.id)).where(TokenBlacklist.expires_at <= now)
+        ).one()
+        refresh_tokens = session.exec(select(func.count(RefreshToken.id))).one()
+        partitioned = is_partitioned(session)
+        with self._lock:
+            return {
+                "rows": rows,
+                "expired_rows": expired_rows,
+                "refresh_tokens": refresh_tokens,
+                "partitioned": partitioned,
+                "partitions": len(list_partitions(session)) if partitioned else 0,
+                "runs": self.runs,
+                "total_purged": self.total_purged,
+                "total_partitions_dropped": self.total_partitions_dropped,
+                "last_run_at": self.last_run_at,
+                "last_purged": self.last_purged,
+                "last_partitions_dropped": self.last_partitions_dropped,
+                "total_refresh_tokens_purged": self.total_refresh_tokens_purged,
+                "last_refresh_tokens_purged": self.last_refresh_tokens_purged,
+                "last_duration_ms": self.last_duration_ms,
+                "last_error": self.last_error,
+            }
+
+    def start(self, session_factory: Callable[[], Session]) -> None:
+        """Start the compaction thread (the first run happens immediately)."""
+        if self._thread is not None:
+            return
+        self._session_factory = session_factory
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name="token-blacklist-compactor", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the compaction thread."""
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def clear(self) -> None:
+        """Forget the recorded statistics."""
+        with self._lock:
+            self._reset_stats()
+
+    def _run(self) -> None:
+        while not self._stop_event.is_set():
+            try:
+                with self._session_factory() as session:
+                    self.run_once(session)
+            except Exception as exc:
+                # Keep the thread alive; expired rows are harmless until the next run
+                with self._lock:
+                    self.last_error = repr(exc)
+            self._stop_event.wait(settings.TOKEN_BLACKLIST_PURGE_INTERVAL_SECONDS)
+
+
+token_blacklist_compactor = TokenBlacklistCompactor()
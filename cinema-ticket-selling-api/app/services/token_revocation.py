@@ -0,0 +1,146 @@
+"""In-process cache of revoked access tokens.
+
+Almost no token is ever revoked, yet every authenticated request has to
+check. Revoked JWT IDs are therefore mirrored in memory: a Bloom filter
+answers the common "not revoked" case without touching the set or the
+database, and the set of JWT IDs confirms the rare positives.
+
+The cache is loaded from ``TokenBlacklist`` on first use. Logouts handled by
+this process are added immediately. Logouts handled by other workers are
+picked up by an incremental refresh at most every
+``settings.TOKEN_REVOCATION_REFRESH_SECONDS``. That refresh reads only rows
+created after the newest ``created_at`` seen so far, minus a small overlap
+window for rows committed out of order.
+"""
+
+import hashlib
+import math
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional
+
+from sqlmodel import Session, select
+
+from app.config import settings
+from app.models.token_blacklist import TokenBlacklist
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings."""
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        self.capacity = max(capacity, 1)
+        self.size = max(8, int(-self.capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / self.capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, item: str):
+        digest = hashlib.sha256(item.encode()).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:16], "little") | 1
+        for i in range(self.hash_count):
+            yield (first + i * second) % self.size
+
+    def add(self, item: str) -> None:
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, item: str) -> bool:
+        return all(self._bits[position >> 3] >> (position & 7) & 1 for position in self._positions(item))
+
+
+def _as_utc(value: datetime) -> datetime:
+    """Treat naive datetimes read back from the database as UTC."""
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+
+class RevocationCache:
+    """Revoked JWT IDs held in memory, with a Bloom filter in front."""
+
+    MIN_CAPACITY = 1024
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._revoked: Dict[str, datetime] = {}
+        self._bloom = BloomFilter(self.MIN_CAPACITY)
+        self._high_water: Optional[datetime] = None
+        self._loaded = False
+        self._refreshed_at = 0.0
+
+    def needs_refresh(self) -> bool:
+        """Whether the next check should first pull revocations from the database."""
+        return (
+            not self._loaded
+            or time.monotonic() - self._refreshed_at >= settings.TOKEN_REVOCATION_REFRESH_SECONDS
+        )
+
+    def is_revoked(self, jti: str) -> bool:
+        """Check a JWT ID against the cached revocations (no database access)."""
+        if jti not in self._bloom:
+            return False
+        return jti in self._revoked
+
+    def add(self, jti: str, expires_at: datetime) -> None:
+        """Record a revocation made by this process."""
+        with self._lock:
+            self._add(jti, _as_utc(expires_at))
+
+    def _add(self, jti: str, expires_at: datetime) -> None:
+        if jti in self._revoked:
+            return
+        self._revoked[jti] = expires_at
+        if self._bloom.count >= self._bloom.capacity:
+            self._rebuild()
+        else:
+            self._bloom.add(jti)
+
+    def _rebuild(self) -> None:
+        """Drop expired revocations and size a new Bloom filter for the rest."""
+        now = datetime.now(timezone.utc)
+        self._revoked = {jti: exp for jti, exp in self._revoked.items() if exp > now}
+        bloom = BloomFilter(max(self.MIN_CAPACITY, 2 * len(self._revoked)))
+        for jti in self._revoked:
+            bloom.add(jti)
+        self._bloom = bloom
+
+    def refresh(self, session: Session) -> None:
+        """
+        Pull revocations recorded since the last refresh.
+
+        The first call loads every unexpired revocation; later calls only
+        read rows created after the high-water mark, minus an overlap window.
+
+        Args:
+            session: Database session
+        """
+        statement = select(TokenBlacklist.token_jti, TokenBlacklist.expires_at, TokenBlacklist.created_at)
+        if self._loaded and self._high_water is not None:
+            overlap = timedelta(seconds=settings.TOKEN_REVOCATION_OVERLAP_SECONDS)
+            statement = statement.where(TokenBlacklist.created_at >= self._high_water - overlap)
+        rows = session.exec(statement).all()
+
+        now = datetime.now(timezone.utc)
+        with self._lock:
+            for jti, expires_at, created_at in rows:
+                if self._high_water is None or created_at > self._high_water:
+                    self._high_water = created_at
+                expires_at = _as_utc(expires_at)
+                if expires_at > now:
+                    self._add(jti, expires_at)
+            self._loaded = True
+            self._refreshed_at = time.monotonic()
+
+    def clear(self) -> None:
+        """Forget every cached revocation."""
+        with self._lock:
+            self._revoked = {}
+            self._bloom = BloomFilter(self.MIN_CAPACITY)
+            self._high_water = None
+            self._loaded = False
+            self._refreshed_at = 0.0
+
+
+revocation_cache = RevocationCache()
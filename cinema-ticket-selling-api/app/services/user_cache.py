@@ -0,0 +1,81 @@
+"""In-process cache of the users behind access tokens.
+
+Every authenticated request resolves the token subject (the user's email) to
+a ``User`` row, and the same user typically hits many endpoints in a row.
+The column values of recently seen users are therefore kept in a bounded LRU
+cache for ``settings.USER_CACHE_TTL_SECONDS``.
+
+Each lookup returns a new detached ``User`` built from the cached values, so
+routes can still attach and modify it without affecting other requests. The
+routes that write users invalidate the entry right after committing, which
+makes suspensions and profile changes visible immediately in this process;
+other worker processes see them once their entry expires.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import inspect
+from sqlalchemy.orm import make_transient_to_detached
+
+from app.config import settings
+from app.models.user import User
+
+_COLUMNS = tuple(column.key for column in inspect(User).column_attrs)
+
+
+class UserCache:
+    """LRU + TTL cache of user column values, keyed by email."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+
+    def get(self, email: str) -> Optional[User]:
+        """
+        Get a cached user by email.
+
+        Args:
+            email: User email (the access token subject)
+
+        Returns:
+            A detached User, or None if the user is not cached or has expired
+        """
+        with self._lock:
+            entry = self._entries.get(email)
+            if entry is None:
+                return None
+            cached_at, values = entry
+            if time.monotonic() - cached_at >= settings.USER_CACHE_TTL_SECONDS:
+                del self._entries[email]
+                return None
+            self._entries.move_to_end(email)
+
+        user = User(**values)
+        make_transient_to_detached(user)
+        return user
+
+    def put(self, user: User) -> None:
+        """Cache the current column values of a loaded user."""
+        values = {key: getattr(user, key) for key in _COLUMNS}
+        with self._lock:
+            self._entries[user.email] = (time.monotonic(), values)
+            self._entries.move_to_end(user.email)
+            while len(self._entries) > settings.USER_CACHE_MAX_ENTRIES:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, *emails: str) -> None:
+        """Drop the cached users with the given emails."""
+        with self._lock:
+            for email in emails:
+                self._entries.pop(email, None)
+
+    def clear(self) -> None:
+        """Drop every cached user."""
+        with self._lock:
+            self._entries.clear()
+
+
+user_cache = UserCache()
@@ -0,0 +1,134 @@
+"""Movie list serialization benchmark.
+
+Loads pages of wide movie rows (several JSON columns) from an in-memory
+SQLite database and times turning them into the JSON body of a movie list
+response, per item:
+
+* ``response_model``: what FastAPI does for a route returning ORM rows
+  (validate into ``List[MovieRead]``, dump to Python, ``json.dumps``)
+* ``fast path``: ``movie_list_serializer`` (one pydantic-core pass to bytes)
+
+Both bodies are checked to decode to the same document.
+
+Usage (from the project root):
+
+    python -m benchmarks.movie_serialization
+    python -m benchmarks.movie_serialization --page-sizes 100 1000 5000 --repeat 50
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from datetime import date, datetime
+from typing import Callable, Dict, List
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute, serialize_response
+from sqlmodel import Session, SQLModel, create_engine, select
+
+from app.main import app
+from app.models import Movie
+from app.services.fast_json import movie_list_serializer
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark movie list serialization")
+    parser.add_argument("--page-sizes", type=int, nargs="+", default=[100, 1000], help="Items per page")
+    parser.add_argument("--repeat", type=int, default=20, help="Timed runs per page size")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    return parser.parse_args()
+
+
+def make_movie(index: int) -> Movie:
+    return Movie(
+        title=f"Benchmark Movie {index}",
+        description="A long enough description of the movie. " * 5,
+        duration_minutes=90 + index % 60,
+        genre=["Action", "Drama", "Sci-Fi"][: 1 + index % 3],
+        rating="PG-13",
+        cast=[f"Actor {index}-{n}" for n in range(6)],
+        director=f"Director {index % 50}",
+        writers=[f"Writer {index % 30}", f"Writer {index % 17}"],
+        producers=[f"Producer {index % 20}"],
+        release_date=date(2000 + index % 25, 1 + index % 12, 1 + index % 28),
+        country="USA",
+        language="English",
+        budget=1_000_000.0 + index,
+        revenue=5_000_000.0 + index,
+        production_company="Benchmark Pictures",
+        distributor="Benchmark Distribution",
+        image_url=f"https://example.com/posters/{index}.jpg",
+        trailer_url=f"https://example.com/trailers/{index}.mp4",
+        awards=["Best Picture"] if index % 10 == 0 else [],
+        details={"imdb_id": f"tt{index:07d}", "tags": ["benchmark", "wide"], "scores": {"critics": 7.5}},
+        created_at=datetime(2024, 1, 1),
+        updated_at=datetime(2024, 1, 1),
+    )
+
+
+def time_per_item(serialize: Callable[[], bytes], items: int, repeat: int) -> float:
+    serialize()  # warm up
+    runs = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        serialize()
+        runs.append(time.perf_counter() - started)
+    return statistics.median(runs) / items * 1_000_000
+
+
+def run_benchmark(args: argparse.Namespace) -> Dict[str, object]:
+    route = next(
+        route for route in app.routes
+        if isinstance(route, APIRoute) and route.path == "/api/v1/movies/" and "GET" in route.methods
+    )
+
+    def response_model_path(rows: List[Movie]) -> bytes:
+        content = asyncio.run(serialize_response(field=route.response_field, response_content=rows))
+        return JSONResponse(content).body
+
+    engine = create_engine("sqlite://")
+    SQLModel.metadata.create_all(engine)
+    results = []
+    with Session(engine) as session:
+        session.add_all(make_movie(index) for index in range(max(args.page_sizes)))
+        session.commit()
+
+        for page_size in args.page_sizes:
+            rows = session.exec(select(Movie).order_by(Movie.id).limit(page_size)).all()
+            slow_body = response_model_path(rows)
+            fast_body = movie_list_serializer.dumps(rows)
+            if json.loads(slow_body) != json.loads(fast_body):
+                raise SystemExit(f"Bodies differ for {page_size} items")
+
+            slow = time_per_item(lambda: response_model_path(rows), page_size, args.repeat)
+            fast = time_per_item(lambda: movie_list_serializer.dumps(rows), page_size, args.repeat)
+            results.append({
+                "items": page_size,
+                "body_bytes": len(fast_body),
+                "response_model_us_per_item": round(slow, 2),
+                "fast_path_us_per_item": round(fast, 2),
+                "speedup": round(slow / fast, 1),
+            })
+    return {"repeat": args.repeat, "results": results}
+
+
+def main() -> None:
+    args = parse_args()
+    report = run_benchmark(args)
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print(f"{'Items':>6}  {'Body (KB)':>9}  {'response_model (us/item)':>24}  {'fast path (us/item)':>19}  {'Speedup':>7}")
+    for result in report["results"]:
+        print(
+            f"{result['items']:>6}  {result['body_bytes'] / 1024:>9.1f}  "
+            f"{result['response_model_us_per_item']:>24}  {result['fast_path_us_per_item']:>19}  "
+            f"{result['speedup']:>6}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -15,6 +15,7 @@ from app.models.search_history import SearchHistory
 from app.models.cast import Cast
 from app.models.ticket import Ticket
 from app.services.auth import get_password_hash
+from app.services.cinema import rebuild_seat_counters
 from sqlmodel import SQLModel
 
 
@@ -757,6 +758,7 @@ def seed_database():
         for ticket in tickets:
             session.add(ticket)
         session.commit()
+        rebuild_seat_counters(session)
         print(f"   ✓ Created {len(tickets)} tickets")
 
         print("\n✅ Database seeding completed successfully!")
@@ -1,36 +1,85 @@
 """Test configuration and fixtures."""
 
 import pytest
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
 from sqlmodel import Session, SQLModel, create_engine
-from sqlmodel.pool import StaticPool
+from sqlmodel.ext.asyncio.session import AsyncSession
 from fastapi.testclient import TestClient
 
 from app.main import app
-from app.database import get_session
+from app.database import get_async_database_url, get_async_session, get_session
 from app.models import User, Cinema, Room, Seat, Movie, Screening, Ticket
 from app.services.auth import get_password_hash, create_access_token
+from app.services.catalog_index import catalog_index
+from app.services.hold_reaper import hold_reaper
+from app.services.movie_facets import facet_cache
+from app.services.seat_index import seat_index
+from app.services.token_claims import claims_cache
+from app.services.token_compaction import token_blacklist_compactor
+from app.services.token_revocation import revocation_cache
+from app.services.user_cache import user_cache
+
+
+@pytest.fixture(autouse=True)
+def reset_in_process_caches():
+    """Clear process-wide caches so state never leaks between test databases."""
+    seat_index.clear()
+    hold_reaper.clear()
+    revocation_cache.clear()
+    user_cache.clear()
+    token_blacklist_compactor.clear()
+    claims_cache.clear()
+    catalog_index.clear()
+    facet_cache.clear()
+    yield
+    seat_index.clear()
+    hold_reaper.clear()
+    revocation_cache.clear()
+    user_cache.clear()
+    token_blacklist_compactor.clear()
+    claims_cache.clear()
+    catalog_index.clear()
+    facet_cache.clear()
 
 
 @pytest.fixture(name="session")
-def session_fixture():
-    """Create a test database session."""
+def session_fixture(tmp_path):
+    """Create a test database session.
+    
+    The database is a temporary SQLite file so that the async engine used by
+    async routes sees the same data as this session.
+    """
     engine = create_engine(
-        "sqlite:///:memory:",
+        f"sqlite:///{tmp_path / 'test.db'}",
         connect_args={"check_same_thread": False},
-        poolclass=StaticPool,
     )
     SQLModel.metadata.create_all(engine)
     with Session(engine) as session:
         yield session
+    engine.dispose()
 
 
 @pytest.fixture(name="client")
 def client_fixture(session: Session):
-    """Create a test client with overridden database session."""
+    """Create a test client with overridden database sessions."""
+    # TestClient runs each request on a fresh event loop, so async
+    # connections must not be pooled across requests
+    async_engine = create_async_engine(
+        get_async_database_url(str(session.get_bind().url)),
+        poolclass=NullPool,
+    )
+    
     def get_session_override():
-        return session
+        with Session(session.get_bind()) as request_session:
+            yield request_session
+    
+    async def get_async_session_override():
+        async with AsyncSession(async_engine, expire_on_commit=False) as async_session:
+            yield async_session
     
     app.dependency_overrides[get_session] = get_session_override
+    app.dependency_overrides[get_async_session] = get_async_session_override
     client = TestClient(app)
     yield client
     app.dependency_overrides.clear()
@@ -135,6 +184,8 @@ def test_seats_fixture(session: Session, test_room: Room):
             )
             session.add(seat)
             seats.append(seat)
+    test_room.capacity = len(seats)
+    session.add(test_room)
     session.commit()
     for seat in seats:
         session.refresh(seat)
@@ -1,6 +1,11 @@
 """Tests for admin dashboard endpoints."""
 
+from datetime import datetime, timedelta
+
 from fastapi.testclient import TestClient
+from sqlmodel import Session, select
+
+from app.models.token_blacklist import TokenBlacklist
 
 
 def test_get_movies_count_admin(client: TestClient, admin_headers):
@@ -158,4 +163,48 @@ def test_admin_stats_regular_user(client: TestClient, auth_headers):
 
     for endpoint in endpoints:
         response = client.get(endpoint, headers=auth_headers)
-        assert response.status_code == 403
\ No newline at end of file
+        assert response.status_code == 403
+
+
+def test_purge_token_blacklist(
+    client: TestClient, admin_headers, admin_user, session: Session, monkeypatch
+):
+    """Test that expired blacklist entries are purged in batches and reported."""
+    from app.config import settings
+
+    now = datetime.utcnow()
+    session.add_all(
+        TokenBlacklist(token_jti=f"expired-{index}", user_id=admin_user.id, expires_at=now - timedelta(hours=1))
+        for index in range(5)
+    )
+    session.add(TokenBlacklist(token_jti="live", user_id=admin_user.id, expires_at=now + timedelta(hours=1)))
+    session.commit()
+
+    response = client.get("/api/v1/admin/maintenance/token-blacklist", headers=admin_headers)
+    assert response.status_code == 200
+    assert response.json()["rows"] == 6
+    assert response.json()["expired_rows"] == 5
+
+    monkeypatch.setattr(settings, "TOKEN_BLACKLIST_PURGE_BATCH_SIZE", 2)
+    response = client.post("/api/v1/admin/maintenance/token-blacklist/purge", headers=admin_headers)
+    assert response.status_code == 200
+    assert response.json()["purged"] == 5
+
+    remaining = session.exec(select(TokenBlacklist.token_jti)).all()
+    assert remaining == ["live"]
+
+    data = client.get("/api/v1/admin/maintenance/token-blacklist", headers=admin_headers).json()
+    assert data["rows"] == 1
+    assert data["expired_rows"] == 0
+    assert data["runs"] == 1
+    assert data["last_purged"] == 5
+    assert data["total_purged"] == 5
+    assert data["partitioned"] is False
+
+
+def test_token_blacklist_maintenance_regular_user(client: TestClient, auth_headers):
+    """Test token blacklist maintenance endpoints as regular user fails."""
+    response = client.get("/api/v1/admin/maintenance/token-blacklist", headers=auth_headers)
+    assert response.status_code == 403
+    response = client.post("/api/v1/admin/maintenance/token-blacklist/purge", headers=auth_headers)
+    assert response.status_code == 403
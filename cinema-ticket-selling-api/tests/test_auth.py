@@ -67,6 +67,93 @@ def test_login_wrong_password(client: TestClient, test_user):
     assert response.status_code == 401
 
 
+def test_login_password_pool_overloaded(client: TestClient, test_user, monkeypatch):
+    """Test login is rejected fast when the password workers are saturated."""
+    from app.config import settings
+    
+    monkeypatch.setattr(settings, "PASSWORD_HASH_MAX_PENDING", 0)
+    response = client.post(
+        "/api/v1/auth/login",
+        data={
+            "username": test_user.email,
+            "password": "testpassword123"
+        }
+    )
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "1"
+
+
+def test_password_hasher_round_trip():
+    """Test hashing and verifying passwords in the worker pool."""
+    import asyncio
+    from app.services.password_hasher import password_hasher
+    
+    async def round_trip():
+        hashed = await password_hasher.hash("s3cret-password")
+        return (
+            await password_hasher.verify("s3cret-password", hashed),
+            await password_hasher.verify("wrong-password", hashed),
+        )
+    
+    assert asyncio.run(round_trip()) == (True, False)
+    assert password_hasher.pending == 0
+
+
+def test_password_worker_imports_only_bcrypt():
+    """Test that spawned password workers do not import the rest of the app."""
+    import subprocess
+    import sys
+    from pathlib import Path
+    
+    script = (
+        "import sys, app.password_worker; "
+        "print(sorted(m for m in sys.modules if m.split('.')[0] in ('app', 'sqlalchemy', 'sqlmodel', 'fastapi')))"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", script], cwd=Path(__file__).resolve().parents[1],
+        capture_output=True, text=True, check=True
+    ).stdout
+    assert output.strip() == "['app', 'app.password_worker']"
+
+
+def test_login_rehashes_outdated_hash(client: TestClient, test_user, session: Session, monkeypatch):
+    """Test that login upgrades a stored hash created with a lower cost."""
+    from app.services.password_hasher import hash_password, hash_rounds, password_hasher
+    
+    test_user.hashed_password = hash_password("testpassword123", 4)
+    session.add(test_user)
+    session.commit()
+    monkeypatch.setattr(password_hasher, "rounds", 5)
+    
+    login = {"username": test_user.email, "password": "testpassword123"}
+    assert client.post("/api/v1/auth/login", data=login).status_code == 200
+    session.refresh(test_user)
+    assert hash_rounds(test_user.hashed_password) == 5
+    assert not password_hasher.needs_rehash(test_user.hashed_password)
+    
+    # A worker calibrated to a lower cost keeps the stronger hash
+    monkeypatch.setattr(password_hasher, "rounds", 4)
+    assert not password_hasher.needs_rehash(test_user.hashed_password)
+    
+    # The new hash still verifies
+    assert client.post("/api/v1/auth/login", data=login).status_code == 200
+
+
+def test_password_hasher_calibration(monkeypatch):
+    """Test that calibration picks a cost within the configured bounds."""
+    from app.config import settings
+    from app.services.password_hasher import MAX_CALIBRATED_ROUNDS, password_hasher
+    
+    monkeypatch.setattr(settings, "BCRYPT_MIN_ROUNDS", 4)
+    monkeypatch.setattr(password_hasher, "rounds", password_hasher.rounds)
+    
+    assert password_hasher.calibrate(target_ms=0.001) == 4
+    assert password_hasher.calibrate(target_ms=10 ** 9) == MAX_CALIBRATED_ROUNDS
+    rounds = password_hasher.calibrate(target_ms=50)
+    assert 4 <= rounds <= MAX_CALIBRATED_ROUNDS
+    assert password_hasher.rounds == rounds
+
+
 def test_login_nonexistent_user(client: TestClient):
     """Test login with nonexistent user fails."""
     response = client.post(
@@ -94,6 +181,96 @@ def test_get_current_user_no_auth(client: TestClient):
     assert response.status_code == 401
 
 
+def test_current_user_served_from_cache(client: TestClient, test_user, auth_headers):
+    """Test that repeated requests resolve the token user without querying the database."""
+    from sqlalchemy import event
+    from sqlalchemy.engine import Engine
+
+    assert client.get("/api/v1/auth/me", headers=auth_headers).status_code == 200
+
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(Engine, "before_cursor_execute", listener)
+    try:
+        response = client.get("/api/v1/auth/me", headers=auth_headers)
+    finally:
+        event.remove(Engine, "before_cursor_execute", listener)
+    assert response.status_code == 200
+    assert response.json()["email"] == test_user.email
+    assert statements == []
+
+
+def test_cached_user_updates_are_saved(client: TestClient, test_user, auth_headers, session: Session):
+    """Test that a cached user can still be modified by profile routes."""
+    assert client.get("/api/v1/auth/me", headers=auth_headers).status_code == 200
+
+    response = client.put("/api/v1/users/me", headers=auth_headers, json={"full_name": "Renamed User"})
+    assert response.status_code == 200
+    assert response.json()["full_name"] == "Renamed User"
+
+    session.refresh(test_user)
+    assert test_user.full_name == "Renamed User"
+    assert client.get("/api/v1/auth/me", headers=auth_headers).json()["full_name"] == "Renamed User"
+
+
+def test_suspension_invalidates_cached_user(client: TestClient, test_user, auth_headers, admin_headers):
+    """Test that suspending a user takes effect even when the user is cached."""
+    assert client.get("/api/v1/auth/me", headers=auth_headers).status_code == 200
+
+    response = client.patch(
+        f"/api/v1/users/admin/users/{test_user.id}/status",
+        params={"is_active": False},
+        headers=admin_headers
+    )
+    assert response.status_code == 200
+
+    response = client.get("/api/v1/auth/me", headers=auth_headers)
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Inactive user"
+
+
+def test_token_signature_verified_once(client: TestClient, test_user, auth_headers, monkeypatch):
+    """Test that repeated requests with the same token reuse the verified claims."""
+    from app.services import token_claims
+
+    calls = []
+    original_decode = token_claims.jwt.decode
+    def counting_decode(*args, **kwargs):
+        calls.append(args[0])
+        return original_decode(*args, **kwargs)
+    monkeypatch.setattr(token_claims.jwt, "decode", counting_decode)
+
+    for _ in range(3):
+        assert client.get("/api/v1/auth/me", headers=auth_headers).status_code == 200
+    assert client.post("/api/v1/auth/logout", headers=auth_headers).status_code == 200
+    assert len(calls) == 1
+
+
+def test_token_claims_reverified_after_expiry(test_user, monkeypatch):
+    """Test that cached claims are dropped once the token expires."""
+    import time
+    from types import SimpleNamespace
+    from app.services import token_claims
+    from app.services.auth import create_access_token
+
+    token = create_access_token(data={"sub": test_user.email}, expires_delta=timedelta(hours=1))
+    calls = []
+    original_decode = token_claims.jwt.decode
+    def counting_decode(*args, **kwargs):
+        calls.append(args[0])
+        return original_decode(*args, **kwargs)
+    monkeypatch.setattr(token_claims.jwt, "decode", counting_decode)
+
+    assert token_claims.claims_cache.decode(token)["sub"] == test_user.email
+    assert token_claims.claims_cache.decode(token)["sub"] == test_user.email
+    assert len(calls) == 1
+
+    # Two hours later the cached entry is stale and the token is verified again
+    monkeypatch.setattr(token_claims, "time", SimpleNamespace(time=lambda: time.time() + 7200))
+    token_claims.claims_cache.decode(token)
+    assert len(calls) == 2
+
+
 # ============= Logout Tests =============
 
 def test_logout_success(client: TestClient, test_user, auth_headers, session: Session):
@@ -126,56 +303,140 @@ def test_logout_token_is_invalidated(client: TestClient, test_user, auth_headers
     assert "revoked" in response.json()["detail"].lower()
 
 
+def test_logout_revocation_served_from_cache(client: TestClient, test_user, auth_headers):
+    """Test that a logged-out token is rejected without querying the database."""
+    from sqlalchemy import event
+    from sqlalchemy.engine import Engine
+    from app.services.token_revocation import revocation_cache
+
+    response = client.post("/api/v1/auth/logout", headers=auth_headers)
+    assert response.status_code == 200
+    assert not revocation_cache.needs_refresh()
+
+    # Listen on every engine: the route runs on the async engine
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(Engine, "before_cursor_execute", listener)
+    try:
+        response = client.get("/api/v1/auth/me", headers=auth_headers)
+    finally:
+        event.remove(Engine, "before_cursor_execute", listener)
+    assert response.status_code == 401
+    # Rejected before the user is even loaded
+    assert statements == []
+
+
+def test_revocation_by_other_worker_picked_up_on_refresh(
+    client: TestClient, test_user, auth_token, auth_headers, session: Session, monkeypatch
+):
+    """Test that revocations written by another process are seen after the refresh interval."""
+    from jose import jwt
+    from app.config import settings
+
+    assert client.get("/api/v1/auth/me", headers=auth_headers).status_code == 200
+
+    # Another worker logs the token out directly in the database
+    payload = jwt.decode(auth_token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    session.add(TokenBlacklist(
+        token_jti=payload["jti"],
+        user_id=test_user.id,
+        expires_at=datetime.fromtimestamp(payload["exp"], tz=timezone.utc)
+    ))
+    session.commit()
+
+    # Still inside the refresh interval: served from the cache
+    assert client.get("/api/v1/auth/me", headers=auth_headers).status_code == 200
+
+    monkeypatch.setattr(settings, "TOKEN_REVOCATION_REFRESH_SECONDS", 0)
+    response = client.get("/api/v1/auth/me", headers=auth_headers)
+    assert response.status_code == 401
+    assert "revoked" in response.json()["detail"].lower()
+
+
+def test_bloom_filter_membership():
+    """Test that the Bloom filter never reports false negatives."""
+    from app.services.token_revocation import BloomFilter
+
+    bloom = BloomFilter(capacity=100)
+    items = [f"jti-{index}" for index in range(100)]
+    for item in items:
+        bloom.add(item)
+    assert all(item in bloom for item in items)
+    false_positives = sum(f"other-{index}" in bloom for index in range(1000))
+    assert false_positives < 20
+
+
 # ============= Refresh Token Tests =============
 
-def test_refresh_token_success(client: TestClient, test_user, auth_token):
+def _login(client: TestClient, password: str = "testpassword123") -> dict:
+    response = client.post(
+        "/api/v1/auth/login",
+        data={"username": "test@example.com", "password": password}
+    )
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_login_returns_refresh_token(client: TestClient, test_user):
+    """Test that login issues a short-lived access token and a refresh token."""
+    from app.config import settings
+
+    data = _login(client)
+    assert data["refresh_token"]
+    assert data["expires_in"] == settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60
+
+
+def test_refresh_token_success(client: TestClient, test_user):
     """Test successful token refresh."""
-    headers = {"Authorization": f"Bearer {auth_token}"}
-    response = client.post("/api/v1/auth/refresh-token", headers=headers)
+    tokens = _login(client)
+    response = client.post("/api/v1/auth/refresh-token", json={"token": tokens["refresh_token"]})
     
     assert response.status_code == 200
     data = response.json()
     assert "access_token" in data
     assert data["token_type"] == "bearer"
-    assert data["access_token"] != auth_token  # New token should be different
+    assert data["access_token"] != tokens["access_token"]  # New token should be different
+    assert data["refresh_token"] != tokens["refresh_token"]  # Refresh tokens rotate
 
 
-def test_refresh_token_no_auth(client: TestClient):
-    """Test refresh token without authentication fails."""
+def test_refresh_token_missing(client: TestClient):
+    """Test refresh without a refresh token fails."""
     response = client.post("/api/v1/auth/refresh-token")
-    assert response.status_code == 401
+    assert response.status_code == 422
 
 
 def test_refresh_token_invalid_token(client: TestClient):
     """Test refresh token with invalid token fails."""
-    headers = {"Authorization": "Bearer invalid_token_here"}
-    response = client.post("/api/v1/auth/refresh-token", headers=headers)
+    response = client.post("/api/v1/auth/refresh-token", json={"token": "invalid_token_here"})
+    assert response.status_code == 401
+
+
+def test_refresh_token_rejects_access_token(client: TestClient, test_user, auth_token):
+    """Test that an access token cannot be used as a refresh token."""
+    response = client.post("/api/v1/auth/refresh-token", json={"token": auth_token})
     assert response.status_code == 401
 
 
 def test_refresh_token_inactive_user(client: TestClient, session: Session, test_user):
     """Test refresh token for inactive user fails."""
-    from app.services.auth import create_access_token
-    
-    # Create token before deactivating user
-    token = create_access_token(data={"sub": test_user.email})
+    # Log in before deactivating user
+    tokens = _login(client)
     
     # Deactivate user
     test_user.is_active = False
     session.add(test_user)
     session.commit()
     
-    headers = {"Authorization": f"Bearer {token}"}
-    response = client.post("/api/v1/auth/refresh-token", headers=headers)
+    response = client.post("/api/v1/auth/refresh-token", json={"token": tokens["refresh_token"]})
     assert response.status_code == 401
 
 
-def test_refreshed_token_works(client: TestClient, test_user, auth_token):
+def test_refreshed_token_works(client: TestClient, test_user):
     """Test that refreshed token can be used for authentication."""
-    headers = {"Authorization": f"Bearer {auth_token}"}
+    tokens = _login(client)
     
     # Refresh token
-    response = client.post("/api/v1/auth/refresh-token", headers=headers)
+    response = client.post("/api/v1/auth/refresh-token", json={"token": tokens["refresh_token"]})
     assert response.status_code == 200
     new_token = response.json()["access_token"]
     
@@ -186,6 +447,57 @@ def test_refreshed_token_works(client: TestClient, test_user, auth_token):
     assert response.json()["email"] == test_user.email
 
 
+def test_refresh_token_reuse_revokes_family(client: TestClient, test_user):
+    """Test that reusing a rotated refresh token revokes every token of the login."""
+    first = _login(client)["refresh_token"]
+    second = client.post("/api/v1/auth/refresh-token", json={"token": first}).json()["refresh_token"]
+
+    response = client.post("/api/v1/auth/refresh-token", json={"token": first})
+    assert response.status_code == 401
+    assert "already been used" in response.json()["detail"]
+
+    # The legitimate holder's current token is revoked too
+    response = client.post("/api/v1/auth/refresh-token", json={"token": second})
+    assert response.status_code == 401
+
+
+def test_refresh_token_families_are_independent(client: TestClient, test_user):
+    """Test that reuse in one login does not revoke other logins."""
+    stolen = _login(client)["refresh_token"]
+    other = _login(client)["refresh_token"]
+    client.post("/api/v1/auth/refresh-token", json={"token": stolen})
+    client.post("/api/v1/auth/refresh-token", json={"token": stolen})
+
+    response = client.post("/api/v1/auth/refresh-token", json={"token": other})
+    assert response.status_code == 200
+
+
+def test_logout_revokes_refresh_token(client: TestClient, test_user):
+    """Test that logging out with the refresh token revokes it."""
+    tokens = _login(client)
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+    response = client.post("/api/v1/auth/logout", headers=headers, json={"token": tokens["refresh_token"]})
+    assert response.status_code == 200
+
+    response = client.post("/api/v1/auth/refresh-token", json={"token": tokens["refresh_token"]})
+    assert response.status_code == 401
+
+
+def test_change_password_revokes_refresh_tokens(client: TestClient, test_user):
+    """Test that changing the password ends every refresh token of the user."""
+    tokens = _login(client)
+    headers = {"Authorization": f"Bearer {tokens['access_token']}"}
+    response = client.put(
+        "/api/v1/auth/change-password",
+        headers=headers,
+        json={"current_password": "testpassword123", "new_password": "newpassword456"}
+    )
+    assert response.status_code == 200
+
+    response = client.post("/api/v1/auth/refresh-token", json={"token": tokens["refresh_token"]})
+    assert response.status_code == 401
+
+
 # ============= Forgot Password Tests =============
 
 def test_forgot_password_success(client: TestClient, test_user, session: Session):
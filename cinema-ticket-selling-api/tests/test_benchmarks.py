@@ -0,0 +1,16 @@
+"""Smoke tests keeping the benchmarks runnable."""
+
+import asyncio
+
+from benchmarks.booking_contention import parse_args, run_benchmark
+
+
+def test_booking_contention_benchmark_runs():
+    """Test that the booking benchmark works end to end against its own database."""
+    report = asyncio.run(run_benchmark(parse_args(["--clients", "2", "--requests", "1", "--screenings", "1"])))
+    assert report["requests"] == 2
+    assert report["errors"] == 0
+    assert report["succeeded"] + report["conflicts"] == 2
+    assert report["double_booked_seats"] == 0
+    assert report["lost_or_phantom_tickets"] == 0
+    assert report["counter_mismatches"] == 0
@@ -155,6 +155,25 @@ def test_search_cinemas_case_insensitive(client: TestClient, test_cinema):
     assert len(data) >= 1
 
 
+def test_search_cinemas_tolerates_typos_and_follows_writes(client: TestClient, admin_headers, test_cinema):
+    """Test fuzzy cinema search and that admin changes are searchable right away."""
+    response = client.get("/api/v1/cinemas/search?q=Cinmea")
+    assert [c["id"] for c in response.json()] == [test_cinema.id]
+
+    response = client.post(
+        "/api/v1/cinemas/",
+        headers=admin_headers,
+        json={"name": "Grand Rex", "address": "1 Boulevard Poissonniere", "city": "Paris"}
+    )
+    assert response.status_code == 201
+    cinema_id = response.json()["id"]
+    assert [c["id"] for c in client.get("/api/v1/cinemas/search?q=pari").json()] == [cinema_id]
+
+    response = client.delete(f"/api/v1/cinemas/{cinema_id}", headers=admin_headers)
+    assert response.status_code == 204
+    assert client.get("/api/v1/cinemas/search?q=paris").json() == []
+
+
 # ============= Cinema Amenities Tests =============
 
 def test_get_cinema_amenities(client: TestClient, test_cinema):
@@ -205,6 +224,19 @@ def test_get_cinema_movies(client: TestClient, test_cinema, test_movie, test_scr
     assert any(m["id"] == test_movie.id for m in data)
 
 
+def test_get_cinema_movies_card_fields(client: TestClient, test_cinema, test_movie, test_screening):
+    """Test the card projection of the movies showing at a cinema."""
+    response = client.get(f"/api/v1/cinemas/{test_cinema.id}/movies?fields=card")
+    assert response.status_code == 200
+    assert response.json() == {
+        "movies": [{
+            "id": test_movie.id, "title": "Test Movie", "image_url": test_movie.image_url,
+            "genre": ["Action"], "rating": "PG-13"
+        }],
+        "total": 1
+    }
+
+
 def test_get_cinema_movies_no_screenings(client: TestClient, session):
     """Test getting movies for cinema with no screenings."""
     from app.models import Cinema
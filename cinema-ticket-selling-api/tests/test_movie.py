@@ -107,7 +107,7 @@ def test_update_movie(client: TestClient, test_movie, admin_headers):
     assert data["cast"] == ["New Actor 1", "New Actor 2"]
     assert data["budget"] == 2000000
     # Other fields should remain unchanged
-    assert data["genre"] == [test_movie.genre]
+    assert data["genre"] == ["Action"]
 
 
 def test_update_nonexistent_movie(client: TestClient, admin_headers):
@@ -150,6 +150,300 @@ def test_delete_nonexistent_movie(client: TestClient, admin_headers):
     assert response.status_code == 404
 
 
+def test_movie_list_fast_serialization_matches_schema(client: TestClient, session, test_movie):
+    """Test that list endpoints return exactly the MovieRead document of each movie."""
+    from app.schemas.movie import MovieRead
+    expected = [MovieRead.model_validate(test_movie).model_dump(mode="json")]
+
+    for url in ["/api/v1/movies/", "/api/v1/movies/filter", "/api/v1/movies/search?q=test"]:
+        response = client.get(url)
+        assert response.headers["content-type"] == "application/json"
+        assert response.json() == expected
+
+
+def test_fast_serializer_loads_expired_rows(session, test_movie):
+    """Test that rows expired by a commit are reloaded rather than serialized empty."""
+    import json
+    from app.services.fast_json import movie_list_serializer
+    session.commit()
+    assert json.loads(movie_list_serializer.dumps([test_movie]))[0]["title"] == "Test Movie"
+
+
+def test_movie_list_sparse_fieldsets(client: TestClient, test_movie):
+    """Test that fields= restricts both the SELECT and the response."""
+    import sqlalchemy
+    from sqlalchemy import event
+
+    statements = []
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    event.listen(sqlalchemy.engine.Engine, "before_cursor_execute", record)
+    try:
+        response = client.get("/api/v1/movies/?fields=card")
+    finally:
+        event.remove(sqlalchemy.engine.Engine, "before_cursor_execute", record)
+    assert response.json() == [{
+        "id": test_movie.id, "title": "Test Movie", "image_url": test_movie.image_url,
+        "genre": ["Action"], "rating": "PG-13"
+    }]
+    movie_select = next(statement for statement in statements if "FROM movie" in statement)
+    assert "movie.description" not in movie_select and "movie.details" not in movie_select
+
+    response = client.get("/api/v1/movies/filter?fields=title,director")
+    assert response.json() == [{"id": test_movie.id, "title": "Test Movie", "director": "Test Director"}]
+
+    response = client.get("/api/v1/movies/search?q=test&fields=card,duration_minutes")
+    assert set(response.json()[0]) == {"id", "title", "image_url", "genre", "rating", "duration_minutes"}
+
+    assert client.get("/api/v1/movies/?fields=title,password").status_code == 400
+
+
+# ============= Pagination Tests =============
+
+def test_cursor_pagination_walks_every_movie_once(client: TestClient, session):
+    """Test that following X-Next-Cursor visits every movie once, in sort order, including NULLs and ties."""
+    from app.models import Movie
+    release_dates = [date(2024, 1, 1), None, date(2023, 5, 1), date(2024, 1, 1), None, date(2022, 2, 2), date(2024, 1, 1)]
+    session.add_all([
+        Movie(title=f"Movie {index}", duration_minutes=90, release_date=release_date)
+        for index, release_date in enumerate(release_dates)
+    ])
+    session.commit()
+
+    for url in ["/api/v1/movies/filter", "/api/v1/movies/advanced-search?sort_by=release_date&sort_order=asc"]:
+        expected = [m["id"] for m in client.get(url, params={"limit": 100}).json()]
+        seen, cursor = [], None
+        while True:
+            response = client.get(url, params={"limit": 2, "cursor": cursor} if cursor else {"limit": 2})
+            assert response.status_code == 200
+            seen.extend(m["id"] for m in response.json())
+            cursor = response.headers.get("X-Next-Cursor")
+            if not cursor:
+                break
+        assert seen == expected
+        assert len(seen) == len(release_dates)
+
+
+def test_cursor_pagination_seeks_instead_of_offset(client: TestClient, session):
+    """Test that a cursor page seeks past the last row and that bad cursors are rejected."""
+    import sqlalchemy
+    from sqlalchemy import event
+    from app.models import Movie
+    session.add_all([Movie(title=f"Movie {index}", duration_minutes=90) for index in range(5)])
+    session.commit()
+
+    first_page = client.get("/api/v1/movies/?limit=2")
+    cursor = first_page.headers["X-Next-Cursor"]
+
+    statements = []
+    def record(conn, cursor_, statement, parameters, context, executemany):
+        statements.append(statement)
+    event.listen(sqlalchemy.engine.Engine, "before_cursor_execute", record)
+    try:
+        second_page = client.get(f"/api/v1/movies/?limit=2&cursor={cursor}")
+    finally:
+        event.remove(sqlalchemy.engine.Engine, "before_cursor_execute", record)
+    assert [m["id"] for m in second_page.json()] == [m["id"] + 2 for m in first_page.json()]
+    assert any("movie.id > ?" in statement for statement in statements)
+
+    assert client.get("/api/v1/movies/?cursor=not-a-cursor").status_code == 400
+    # A cursor from another sort order is rejected too
+    assert client.get(f"/api/v1/movies/filter?cursor={cursor}").status_code == 400
+
+
+def test_cursor_pages_range_scan_an_index(client: TestClient, session):
+    """Test that a cursor page on release date is answered from an index range, not a table scan."""
+    import sqlalchemy
+    from sqlalchemy import event, text
+    from app.models import Movie
+    session.add_all([
+        Movie(title=f"Movie {index}", duration_minutes=90,
+              release_date=None if index % 5 == 0 else date(2000 + index % 20, 1, 1))
+        for index in range(200)
+    ])
+    session.commit()
+    cursor = client.get("/api/v1/movies/filter?limit=10").headers["X-Next-Cursor"]
+
+    queries = []
+    def record(conn, cursor_, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            queries.append((statement, parameters))
+    event.listen(sqlalchemy.engine.Engine, "before_cursor_execute", record)
+    try:
+        assert client.get(f"/api/v1/movies/filter?limit=10&cursor={cursor}").status_code == 200
+    finally:
+        event.remove(sqlalchemy.engine.Engine, "before_cursor_execute", record)
+
+    statement, parameters = queries[-1]
+    plan = [row[-1] for row in session.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)]
+    assert any("ix_movie_release_date_id" in step for step in plan)
+    assert not any(step.startswith("SCAN movie") for step in plan)
+
+
+# ============= Rating Aggregate Tests =============
+
+def test_review_routes_maintain_rating_aggregates(
+    client: TestClient, session, auth_headers, admin_headers, test_movie
+):
+    """Test that avg_rating and review_count follow review creation, edits and deletion."""
+    from app.services.movie_ratings import recompute_movie_ratings
+
+    def aggregates():
+        movie = client.get(f"/api/v1/movies/{test_movie.id}").json()
+        return movie["avg_rating"], movie["review_count"]
+
+    assert aggregates() == (None, 0)
+    review = client.post(f"/api/v1/movies/{test_movie.id}/reviews", headers=auth_headers, json={"rating": 5}).json()
+    client.post(f"/api/v1/movies/{test_movie.id}/reviews", headers=admin_headers, json={"rating": 2})
+    assert aggregates() == (3.5, 2)
+
+    client.put(f"/api/v1/movies/reviews/{review['id']}", headers=auth_headers, json={"rating": 3})
+    assert aggregates() == (2.5, 2)
+
+    session.exec(recompute_movie_ratings(test_movie.id))
+    session.commit()
+    assert aggregates() == (2.5, 2)
+
+    client.delete(f"/api/v1/movies/reviews/{review['id']}", headers=auth_headers)
+    assert aggregates() == (2.0, 1)
+
+
+def test_filter_and_sort_by_average_rating(client: TestClient, session):
+    """Test min_rating filtering and rating sorting, with unrated movies last."""
+    from app.models import Movie
+    session.add_all([
+        Movie(title="Great", duration_minutes=90, avg_rating=4.5, review_count=10),
+        Movie(title="Unrated", duration_minutes=90),
+        Movie(title="Fine", duration_minutes=90, avg_rating=3.0, review_count=4),
+    ])
+    session.commit()
+
+    response = client.get("/api/v1/movies/filter?min_rating=4")
+    assert [m["title"] for m in response.json()] == ["Great"]
+
+    response = client.get("/api/v1/movies/advanced-search?sort_by=rating&sort_order=desc")
+    assert [m["title"] for m in response.json()] == ["Great", "Fine", "Unrated"]
+    response = client.get("/api/v1/movies/advanced-search?sort_by=rating&sort_order=asc")
+    assert [m["title"] for m in response.json()] == ["Fine", "Great", "Unrated"]
+
+
+# ============= Facet Tests =============
+
+def test_filter_movies_with_facets(client: TestClient, session, test_movie):
+    """Test that facet counts cover every match, not just the returned page."""
+    from app.models import Movie
+    session.add_all([
+        Movie(title="Drama One", duration_minutes=90, genre=["Drama", "action"], language="French",
+              country="France", rating="R", release_date=date(2023, 5, 1)),
+        Movie(title="Drama Two", duration_minutes=90, genre=["Drama"], language="English",
+              country="USA", rating="PG-13", release_date=date(2024, 3, 1)),
+    ])
+    session.commit()
+
+    response = client.get("/api/v1/movies/filter?facets=true&limit=1")
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data["movies"]) == 1
+    assert "X-Next-Cursor" in response.headers
+    assert data["facets"] == {
+        "genre": {"Action": 2, "Drama": 2},
+        "language": {"English": 2, "French": 1},
+        "country": {"USA": 2, "France": 1},
+        "rating": {"PG-13": 2, "R": 1},
+        "release_year": {"2024": 2, "2023": 1},
+    }
+
+    response = client.get("/api/v1/movies/filter?facets=true&language=english&fields=card")
+    data = response.json()
+    assert set(data["movies"][0]) == {"id", "title", "image_url", "genre", "rating"}
+    assert data["facets"]["genre"] == {"Action": 1, "Drama": 1}
+    assert data["facets"]["language"] == {"English": 2}
+
+    # Without facets=true the response is still a plain list
+    assert isinstance(client.get("/api/v1/movies/filter?language=english").json(), list)
+
+
+def test_facet_counts_take_one_query_and_are_cached(client: TestClient, session, admin_headers, test_movie):
+    """Test that facets add one query, are reused across pages, and follow admin writes."""
+    import sqlalchemy
+    from sqlalchemy import event
+    from app.models import Movie
+
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    def count_statements(url):
+        statements.clear()
+        event.listen(sqlalchemy.engine.Engine, "before_cursor_execute", record)
+        try:
+            response = client.get(url)
+        finally:
+            event.remove(sqlalchemy.engine.Engine, "before_cursor_execute", record)
+        assert response.status_code == 200
+        return len(statements), response.json()
+
+    plain, _ = count_statements("/api/v1/movies/advanced-search?genre=Action")
+    faceted, data = count_statements("/api/v1/movies/advanced-search?genre=Action&facets=true")
+    assert faceted == plain + 1
+    assert data["facets"]["genre"] == {"Action": 1}
+
+    # Same filters, another spelling and page: served from the cache
+    session.add(Movie(title="Unseen", duration_minutes=90, genre=["Action"]))
+    session.commit()
+    cached, data = count_statements("/api/v1/movies/advanced-search?genre=ACTION&facets=true&sort_by=title")
+    assert cached == plain
+    assert data["facets"]["genre"] == {"Action": 1}
+
+    response = client.post(
+        "/api/v1/movies/",
+        json={"title": "Fresh", "duration_minutes": 100, "genre": ["Action", "Comedy"]},
+        headers=admin_headers
+    )
+    assert response.status_code == 201
+    _, data = count_statements("/api/v1/movies/advanced-search?genre=action&facets=true")
+    assert data["facets"]["genre"] == {"Action": 3, "Comedy": 1}
+
+
+# ============= Genre Tests =============
+
+def test_filter_movies_by_genre_is_exact(client: TestClient, session, test_movie):
+    """Test that genre filters match whole genre names only, ignoring case."""
+    from app.models import Movie
+    session.add(Movie(title="Quiet Drama", duration_minutes=90, genre=["Non-Action", "Drama"]))
+    session.commit()
+
+    response = client.get("/api/v1/movies/filter?genre=action")
+    assert [m["id"] for m in response.json()] == [test_movie.id]
+
+    response = client.get("/api/v1/movies/advanced-search?genre=Drama")
+    assert [m["title"] for m in response.json()] == ["Quiet Drama"]
+
+
+def test_movie_genres_stay_in_sync(client: TestClient, session, admin_headers, test_movie):
+    """Test that genre rows follow movie updates and deletes, and strings become lists."""
+    from sqlmodel import select
+    from app.models import MovieGenre
+
+    def genre_rows():
+        return session.exec(select(MovieGenre.genre).where(MovieGenre.movie_id == test_movie.id)).all()
+
+    assert genre_rows() == ["action"]
+
+    response = client.patch(
+        f"/api/v1/movies/{test_movie.id}",
+        headers=admin_headers,
+        json={"genre": "Sci-Fi"}
+    )
+    assert response.json()["genre"] == ["Sci-Fi"]
+    assert genre_rows() == ["sci-fi"]
+    assert client.get("/api/v1/movies/filter?genre=Action").json() == []
+
+    client.delete(f"/api/v1/movies/{test_movie.id}", headers=admin_headers)
+    assert genre_rows() == []
+
+
 # ============= Search Tests =============
 
 def test_search_movies_by_title(client: TestClient, test_movie, session):
@@ -205,6 +499,163 @@ def test_search_movies_case_insensitive(client: TestClient, test_movie):
     assert len(data) >= 1
 
 
+def test_search_movies_ranked_by_relevance(client: TestClient, session):
+    """Test that title matches rank above description matches."""
+    from app.models import Movie
+    session.add_all([
+        Movie(title="Quiet Night", duration_minutes=90, description="A story about a storm at sea"),
+        Movie(title="Storm Chasers", duration_minutes=100, description="Weather experts"),
+    ])
+    session.commit()
+
+    response = client.get("/api/v1/movies/search?q=storm")
+    assert response.status_code == 200
+    assert [m["title"] for m in response.json()] == ["Storm Chasers", "Quiet Night"]
+
+
+def test_search_movies_prefix_and_all_words(client: TestClient, test_movie):
+    """Test that the last word matches as a prefix and every word must match."""
+    response = client.get("/api/v1/movies/search?q=test dir")
+    assert [m["id"] for m in response.json()] == [test_movie.id]
+
+    response = client.get("/api/v1/movies/search?q=test comedy")
+    assert response.json() == []
+
+
+def test_search_movies_ignores_query_syntax(client: TestClient, test_movie):
+    """Test that search operators and punctuation in the query are treated as text."""
+    response = client.get('/api/v1/movies/search?q="Test" OR NEAR(*')
+    assert response.status_code == 200
+
+    response = client.get("/api/v1/movies/search?q=!!!")
+    assert response.status_code == 200
+    assert response.json() == []
+
+
+def test_search_index_follows_updates_and_deletes(client: TestClient, admin_headers, test_movie):
+    """Test that the search index reflects movie changes immediately."""
+    response = client.patch(
+        f"/api/v1/movies/{test_movie.id}",
+        headers=admin_headers,
+        json={"title": "Renamed Feature"}
+    )
+    assert response.status_code == 200
+    assert client.get("/api/v1/movies/search?q=renamed").json()[0]["id"] == test_movie.id
+    assert all(m["title"] != "Test Movie" for m in client.get("/api/v1/movies/search?q=movie").json())
+
+    response = client.delete(f"/api/v1/movies/{test_movie.id}", headers=admin_headers)
+    assert response.status_code == 204
+    assert client.get("/api/v1/movies/search?q=renamed").json() == []
+
+
+def test_search_index_rebuilds_in_background(client: TestClient, admin_headers, test_movie, monkeypatch):
+    """Test that an expired index is served while one thread rebuilds it, keeping writes made meanwhile."""
+    import threading
+    from app.config import settings
+    from app.services.catalog_index import Suggester, catalog_index
+
+    assert client.get("/api/v1/movies/search?q=test").json()[0]["id"] == test_movie.id
+    builds = []
+    building = threading.Event()
+    release = threading.Event()
+    warm = Suggester.warm
+
+    def blocking_warm(suggester):
+        builds.append(suggester)
+        building.set()
+        assert release.wait(timeout=10)
+        warm(suggester)
+
+    monkeypatch.setattr(Suggester, "warm", blocking_warm)
+    monkeypatch.setattr(settings, "CATALOG_INDEX_TTL_SECONDS", 0)
+    for _ in range(3):
+        assert client.get("/api/v1/movies/search?q=test").json()[0]["id"] == test_movie.id
+    assert building.wait(timeout=10)
+
+    # Committed after the rebuild read the catalog
+    response = client.patch(
+        f"/api/v1/movies/{test_movie.id}",
+        headers=admin_headers,
+        json={"title": "Renamed Feature"}
+    )
+    assert response.status_code == 200
+    monkeypatch.setattr(settings, "CATALOG_INDEX_TTL_SECONDS", 300)
+    release.set()
+    assert catalog_index._build_lock.acquire(timeout=10)
+    catalog_index._build_lock.release()
+
+    assert len(builds) == 1
+    assert client.get("/api/v1/movies/search?q=renamed").json()[0]["id"] == test_movie.id
+    assert len(builds) == 1
+
+
+def test_search_movies_tolerates_typos(client: TestClient, test_movie):
+    """Test that misspelled words still find the movie, exact matches first."""
+    response = client.get("/api/v1/movies/search?q=Tset Moive")
+    assert [m["id"] for m in response.json()] == [test_movie.id]
+
+    response = client.get("/api/v1/movies/search?q=Directro")
+    assert [m["id"] for m in response.json()] == [test_movie.id]
+
+
+def test_search_movies_by_cast_member(client: TestClient, test_movie):
+    """Test that cast members added through the cast routes are searchable."""
+    assert client.get("/api/v1/movies/search?q=Zendaya").json() == []
+
+    response = client.post(
+        "/api/v1/casts/",
+        json={"movie_id": test_movie.id, "actor_name": "Zendaya", "character_name": "Chani", "role": "Lead"}
+    )
+    assert response.status_code == 201
+    assert [m["id"] for m in client.get("/api/v1/movies/search?q=zendya").json()] == [test_movie.id]
+
+    client.delete(f"/api/v1/casts/{response.json()['id']}")
+    assert client.get("/api/v1/movies/search?q=Zendaya").json() == []
+
+
+def test_advanced_search_matches_each_field(client: TestClient, test_movie):
+    """Test that advanced-search text filters only match their own field."""
+    response = client.get("/api/v1/movies/advanced-search?director=Test Director&title=movi")
+    assert [m["id"] for m in response.json()] == [test_movie.id]
+
+    response = client.get("/api/v1/movies/advanced-search?title=Director")
+    assert response.json() == []
+
+    response = client.get("/api/v1/movies/advanced-search?cast=Actor Two")
+    assert [m["id"] for m in response.json()] == [test_movie.id]
+
+
+def test_advanced_search_passes_every_match_to_the_database(client: TestClient, session, monkeypatch):
+    """Test that text filters keep every index match, across IN-list chunks, cursor pages and facets."""
+    from app.models import Movie
+    import app.services.catalog_index as catalog_index_module
+    session.add_all([
+        Movie(title="Stormy Night", duration_minutes=90, release_date=date(2021, 1, 1)),
+        Movie(title="Storm", duration_minutes=100, release_date=date(2022, 1, 1)),
+        Movie(title="Storm Chasers", duration_minutes=110, release_date=date(2023, 1, 1)),
+        Movie(title="Calm Sea", duration_minutes=95, release_date=date(2024, 1, 1)),
+    ])
+    session.commit()
+    monkeypatch.setattr(catalog_index_module, "IN_LIST_CHUNK_SIZE", 1)
+
+    titles = []
+    cursor = None
+    while True:
+        params = {"title": "storm", "limit": 1, **({"cursor": cursor} if cursor else {})}
+        response = client.get("/api/v1/movies/advanced-search", params=params)
+        titles += [m["title"] for m in response.json()]
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+    assert titles == ["Storm Chasers", "Storm", "Stormy Night"]
+
+    response = client.get("/api/v1/movies/advanced-search?title=storm&facets=true")
+    assert response.json()["facets"]["release_year"] == {"2021": 1, "2022": 1, "2023": 1}
+
+    response = client.get("/api/v1/movies/advanced-search?title=storm&description=storm")
+    assert response.json() == []
+
+
 # ============= Cast Tests =============
 
 def test_get_movie_cast(client: TestClient, test_movie, session):
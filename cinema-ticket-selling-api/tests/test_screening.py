@@ -121,3 +121,182 @@ def test_get_available_seats_nonexistent_screening(client: TestClient):
     """Test getting available seats for nonexistent screening fails."""
     response = client.get("/api/v1/screenings/99999/available-seats")
     assert response.status_code == 404
+
+
+def test_available_seats_reflect_booking_and_cancellation(client: TestClient, auth_headers, test_screening, test_seats):
+    """Test available seats stay in sync with bookings and cancellations."""
+    url = f"/api/v1/screenings/{test_screening.id}/available-seats"
+    assert len(client.get(url).json()) == len(test_seats)
+    
+    book_response = client.post(
+        "/api/v1/tickets/book",
+        headers=auth_headers,
+        json={
+            "screening_id": test_screening.id,
+            "seat_ids": [test_seats[0].id, test_seats[1].id]
+        }
+    )
+    assert book_response.status_code == 201
+    
+    available_ids = {s["id"] for s in client.get(url).json()}
+    assert len(available_ids) == len(test_seats) - 2
+    assert test_seats[0].id not in available_ids
+    assert test_seats[1].id not in available_ids
+    
+    ticket_id = book_response.json()[0]["id"]
+    client.delete(f"/api/v1/tickets/{ticket_id}", headers=auth_headers)
+    
+    available_ids = {s["id"] for s in client.get(url).json()}
+    assert test_seats[0].id in available_ids
+    assert test_seats[1].id not in available_ids
+
+
+def test_available_seats_include_new_room_seats(client: TestClient, admin_headers, test_screening, test_seats):
+    """Test seats added to the room after the first lookup are visible."""
+    url = f"/api/v1/screenings/{test_screening.id}/available-seats"
+    assert len(client.get(url).json()) == len(test_seats)
+    
+    response = client.post(
+        f"/api/v1/rooms/{test_screening.room_id}/seats/bulk",
+        json={"rows": 1, "seats_per_row": 3},
+        headers=admin_headers
+    )
+    assert response.status_code == 201
+    assert len(client.get(url).json()) == len(test_seats) + 3
+
+
+def test_available_seats_count_follows_counters(client: TestClient, auth_headers, admin_headers, test_screening, test_seats):
+    """Test the screening's seat counters track bookings, cancellations and new seats."""
+    url = f"/api/v1/screenings/{test_screening.id}"
+    data = client.get(url).json()
+    assert data["available_seats_count"] == len(test_seats)
+    assert data["sold_seats_by_type"] == {}
+    
+    book_response = client.post(
+        "/api/v1/tickets/book",
+        headers=auth_headers,
+        json={
+            "screening_id": test_screening.id,
+            "seat_ids": [test_seats[0].id, test_seats[1].id]
+        }
+    )
+    assert book_response.status_code == 201
+    data = client.get(url).json()
+    assert data["available_seats_count"] == len(test_seats) - 2
+    assert data["sold_seats_by_type"] == {"standard": 2}
+    
+    ticket_id = book_response.json()[0]["id"]
+    client.delete(f"/api/v1/tickets/{ticket_id}", headers=auth_headers)
+    data = client.get(url).json()
+    assert data["available_seats_count"] == len(test_seats) - 1
+    assert data["sold_seats_by_type"] == {"standard": 1}
+    
+    client.post(
+        f"/api/v1/rooms/{test_screening.room_id}/seats/bulk",
+        json={"rows": 1, "seats_per_row": 3, "seat_type": "vip"},
+        headers=admin_headers
+    )
+    assert client.get(url).json()["available_seats_count"] == len(test_seats) + 2
+    
+    listed = client.get("/api/v1/screenings/").json()
+    assert listed[0]["available_seats_count"] == len(test_seats) + 2
+
+
+def test_rebuild_seat_counters(session, test_user, test_screening, test_seats):
+    """Test counters can be recomputed from seats and active tickets."""
+    from app.models import Ticket
+    from app.services.cinema import get_seat_sales, rebuild_seat_counters
+    
+    for seat, ticket_status in zip(test_seats, ["booked", "confirmed", "cancelled"]):
+        session.add(Ticket(user_id=test_user.id, screening_id=test_screening.id,
+                           seat_id=seat.id, price=test_screening.price, status=ticket_status))
+    session.commit()
+    
+    rebuild_seat_counters(session)
+    session.refresh(test_screening)
+    
+    assert test_screening.sold_count == 2
+    assert test_screening.available_seats_count == len(test_seats) - 2
+    assert get_seat_sales(session, test_screening.id) == {"standard": 2}
+
+
+def test_seat_map(client: TestClient, auth_headers, test_screening, test_seats):
+    """Test the packed seat map and its ETag revalidation."""
+    import base64
+    
+    url = f"/api/v1/screenings/{test_screening.id}/seat-map"
+    response = client.get(url)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["seat_count"] == len(test_seats)
+    assert data["available_count"] == len(test_seats)
+    assert [s["id"] for s in data["layout"]["seats"]] == [s.id for s in test_seats]
+    assert base64.b64decode(data["availability"]) == bytes([0xFF, 0x03])
+    
+    # Clients that already have the layout only get the bitmap
+    layout_version = data["layout_version"]
+    response = client.get(url, params={"layout_version": layout_version})
+    assert response.json()["layout"] is None
+    etag = response.headers["etag"]
+    
+    response = client.get(url, params={"layout_version": layout_version}, headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    
+    client.post(
+        "/api/v1/tickets/book",
+        headers=auth_headers,
+        json={"screening_id": test_screening.id, "seat_ids": [test_seats[0].id]}
+    )
+    response = client.get(url, params={"layout_version": layout_version}, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert base64.b64decode(response.json()["availability"]) == bytes([0xFE, 0x03])
+
+
+def test_seat_map_nonexistent_screening(client: TestClient):
+    """Test the seat map of a missing screening."""
+    response = client.get("/api/v1/screenings/99999/seat-map")
+    assert response.status_code == 404
+
+
+def test_room_layout_etag(client: TestClient, admin_headers, test_room, test_seats):
+    """Test the room layout version changes when seats are added."""
+    url = f"/api/v1/rooms/{test_room.id}/layout"
+    response = client.get(url)
+    assert response.status_code == 200
+    assert len(response.json()["seats"]) == len(test_seats)
+    etag = response.headers["etag"]
+    assert etag == f'"{response.json()["version"]}"'
+    
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+    
+    client.post(
+        f"/api/v1/rooms/{test_room.id}/seats/bulk",
+        json={"rows": 1, "seats_per_row": 2},
+        headers=admin_headers
+    )
+    response = client.get(url, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert len(response.json()["seats"]) == len(test_seats) + 2
+    
+    assert client.get("/api/v1/rooms/99999/layout").status_code == 404
+
+
+def test_room_layout_not_modified_without_queries(client: TestClient, test_room, test_seats):
+    """Test that a cached layout answers If-None-Match without touching the database."""
+    import sqlalchemy
+    from sqlalchemy import event
+    
+    url = f"/api/v1/rooms/{test_room.id}/layout"
+    etag = client.get(url).headers["etag"]
+    statements = []
+    
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    
+    event.listen(sqlalchemy.engine.Engine, "before_cursor_execute", record)
+    try:
+        assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+    finally:
+        event.remove(sqlalchemy.engine.Engine, "before_cursor_execute", record)
+    assert statements == []
@@ -0,0 +1,67 @@
+"""Tests for catalog-wide search endpoints."""
+
+import sqlalchemy
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+
+def suggestions(client: TestClient, q: str, **params):
+    response = client.get("/api/v1/search/suggest", params={"q": q, **params})
+    assert response.status_code == 200
+    return [(s["type"], s["text"]) for s in response.json()]
+
+
+def test_suggest_ranks_names_by_kind_and_word(client: TestClient, test_movie, test_cinema):
+    """Test that suggestions match any word of a name, whole-name prefixes first."""
+    assert suggestions(client, "te") == [
+        ("movie", "Test Movie"), ("cinema", "Test Cinema"), ("director", "Test Director")
+    ]
+    assert suggestions(client, "te", limit=1) == [("movie", "Test Movie")]
+    assert suggestions(client, "direc") == [("director", "Test Director")]
+    assert suggestions(client, "actor t") == [("actor", "Actor Two")]
+    assert suggestions(client, "xyz") == []
+
+    response = client.get("/api/v1/search/suggest", params={"q": "test mov"})
+    assert response.json() == [{"type": "movie", "text": "Test Movie", "id": test_movie.id}]
+
+
+def test_suggest_is_served_from_memory(client: TestClient, test_movie):
+    """Test that suggestions do not query the database once the index is built."""
+    suggestions(client, "test")
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(sqlalchemy.engine.Engine, "before_cursor_execute", record)
+    try:
+        assert suggestions(client, "act") == [("actor", "Actor One"), ("actor", "Actor Two")]
+    finally:
+        event.remove(sqlalchemy.engine.Engine, "before_cursor_execute", record)
+    assert statements == []
+
+
+def test_suggest_follows_admin_writes(client: TestClient, admin_headers, test_movie, test_cinema):
+    """Test that created, shared and deleted names are reflected immediately."""
+    assert suggestions(client, "test") == [
+        ("movie", "Test Movie"), ("cinema", "Test Cinema"), ("director", "Test Director")
+    ]
+
+    response = client.post(
+        "/api/v1/movies/",
+        json={"title": "Sequel", "duration_minutes": 100, "director": "Test Director", "cast": ["Actor Three"]},
+        headers=admin_headers
+    )
+    assert response.status_code == 201
+    sequel_id = response.json()["id"]
+    # A director of two movies outranks a single cinema
+    assert suggestions(client, "test") == [
+        ("movie", "Test Movie"), ("director", "Test Director"), ("cinema", "Test Cinema")
+    ]
+    assert suggestions(client, "seq") == [("movie", "Sequel")]
+    assert ("actor", "Actor Three") in suggestions(client, "actor")
+
+    client.delete(f"/api/v1/movies/{sequel_id}", headers=admin_headers)
+    client.delete(f"/api/v1/cinemas/{test_cinema.id}", headers=admin_headers)
+    assert suggestions(client, "test") == [("movie", "Test Movie"), ("director", "Test Director")]
+    assert suggestions(client, "actor th") == []
@@ -1,5 +1,6 @@
 """Tests for ticket booking endpoints."""
 
+import pytest
 from fastapi.testclient import TestClient
 
 
@@ -107,8 +108,85 @@ def test_book_already_booked_seat(client: TestClient, auth_headers, test_screeni
             "seat_ids": [test_seats[0].id]
         }
     )
-    assert response.status_code == 400
+    assert response.status_code == 409
     assert "already booked" in response.json()["detail"].lower()
+    assert str(test_seats[0].id) in response.json()["detail"]
+
+
+def test_book_partially_booked_seats_is_atomic(client: TestClient, auth_headers, test_screening, test_seats, session):
+    """Test a booking with one taken seat creates no tickets at all."""
+    from sqlmodel import select
+    from app.models import Ticket
+    
+    client.post(
+        "/api/v1/tickets/book",
+        headers=auth_headers,
+        json={"screening_id": test_screening.id, "seat_ids": [test_seats[1].id]}
+    )
+    
+    response = client.post(
+        "/api/v1/tickets/book",
+        headers=auth_headers,
+        json={
+            "screening_id": test_screening.id,
+            "seat_ids": [test_seats[0].id, test_seats[1].id]
+        }
+    )
+    assert response.status_code == 409
+    assert f"[{test_seats[1].id}]" in response.json()["detail"]
+    
+    tickets = session.exec(select(Ticket).where(Ticket.seat_id == test_seats[0].id)).all()
+    assert tickets == []
+
+
+def test_book_duplicate_seat_ids(client: TestClient, auth_headers, test_screening, test_seats):
+    """Test booking the same seat twice in one request fails."""
+    response = client.post(
+        "/api/v1/tickets/book",
+        headers=auth_headers,
+        json={
+            "screening_id": test_screening.id,
+            "seat_ids": [test_seats[0].id, test_seats[0].id]
+        }
+    )
+    assert response.status_code == 400
+
+
+def test_rebook_cancelled_seat(client: TestClient, auth_headers, test_screening, test_seats):
+    """Test a seat can be booked again once its ticket is cancelled."""
+    book_response = client.post(
+        "/api/v1/tickets/book",
+        headers=auth_headers,
+        json={"screening_id": test_screening.id, "seat_ids": [test_seats[0].id]}
+    )
+    ticket_id = book_response.json()[0]["id"]
+    client.delete(f"/api/v1/tickets/{ticket_id}", headers=auth_headers)
+    
+    response = client.post(
+        "/api/v1/tickets/book",
+        headers=auth_headers,
+        json={"screening_id": test_screening.id, "seat_ids": [test_seats[0].id]}
+    )
+    assert response.status_code == 201
+
+
+def test_active_ticket_unique_index(session, test_user, test_screening, test_seats):
+    """Test the database rejects a second active ticket for the same seat."""
+    import pytest
+    from sqlalchemy.exc import IntegrityError
+    from app.models import Ticket
+    
+    for _ in range(2):
+        session.add(Ticket(
+            user_id=test_user.id,
+            screening_id=test_screening.id,
+            seat_id=test_seats[0].id,
+            price=15.0,
+            status="booked"
+        ))
+    with pytest.raises(IntegrityError):
+        session.commit()
+    session.rollback()
 
 
 def test_get_my_tickets(client: TestClient, auth_headers, test_screening, test_seats):
@@ -222,3 +300,292 @@ def test_cancel_ticket_no_auth(client: TestClient):
     """Test cancelling ticket without auth fails."""
     response = client.delete("/api/v1/tickets/1")
     assert response.status_code == 401
+
+
+# ============= Seat Hold Tests =============
+
+def _other_user_headers(session):
+    """Create a second user and return its auth headers."""
+    from app.models import User
+    from app.services.auth import get_password_hash, create_access_token
+    
+    other_user = User(
+        email="other@example.com",
+        full_name="Other User",
+        hashed_password=get_password_hash("password123"),
+        is_active=True
+    )
+    session.add(other_user)
+    session.commit()
+    token = create_access_token(data={"sub": other_user.email})
+    return {"Authorization": f"Bearer {token}"}
+
+
+def test_hold_seats(client: TestClient, auth_headers, test_screening, test_seats):
+    """Test holding seats makes them unavailable."""
+    response = client.post(
+        "/api/v1/tickets/hold",
+        headers=auth_headers,
+        json={"screening_id": test_screening.id, "seat_ids": [test_seats[0].id], "minutes": 5}
+    )
+    assert response.status_code == 201
+    data = response.json()
+    assert len(data) == 1
+    assert data[0]["seat_id"] == test_seats[0].id
+    
+    available = client.get(f"/api/v1/screenings/{test_screening.id}/available-seats").json()
+    assert test_seats[0].id not in {s["id"] for s in available}
+
+
+def test_hold_race_reports_only_taken_seats(
+    client: TestClient, auth_headers, session, test_screening, test_seats, monkeypatch
+):
+    """Test that a hold losing a race to another user lists only the seats it lost."""
+    from app.services import cinema
+    
+    response = client.post(
+        "/api/v1/tickets/hold",
+        headers=_other_user_headers(session),
+        json={"screening_id": test_screening.id, "seat_ids": [test_seats[1].id]}
+    )
+    assert response.status_code == 201
+    
+    # Let the insert hit the unique index, as when both requests validate first
+    monkeypatch.setattr(cinema, "_validate_seats", lambda *args: None)
+    response = client.post(
+        "/api/v1/tickets/hold",
+        headers=auth_headers,
+        json={"screening_id": test_screening.id, "seat_ids": [test_seats[0].id, test_seats[1].id]}
+    )
+    assert response.status_code == 409
+    assert response.json()["detail"] == f"Seats {[test_seats[1].id]} were just taken by another user"
+
+
+def test_hold_too_long(client: TestClient, auth_headers, test_screening, test_seats):
+    """Test holding seats beyond the maximum duration fails."""
+    response = client.post(
+        "/api/v1/tickets/hold",
+        headers=auth_headers,
+        json={"screening_id": test_screening.id, "seat_ids": [test_seats[0].id], "minutes": 10000}
+    )
+    assert response.status_code == 400
+
+
+def test_held_seat_blocks_other_users(client: TestClient, auth_headers, session, test_screening, test_seats):
+    """Test a seat held by one user cannot be held or booked by another."""
+    client.post(
+        "/api/v1/tickets/hold",
+        headers=auth_headers,
+        json={"screening_id": test_screening.id, "seat_ids": [test_seats[0].id]}
+    )
+    other_headers = _other_user_headers(session)
+    
+    for url in ("/api/v1/tickets/hold", "/api/v1/tickets/book"):
+        response = client.post(
+            url,
+            headers=other_headers,
+            json={"screening_id": test_screening.id, "seat_ids": [test_seats[0].id]}
+        )
+        assert response.status_code == 409
+
+
+def test_book_held_seats_promotes_hold(client: TestClient, auth_headers, session, test_screening, test_seats):
+    """Test booking seats you hold turns the holds into tickets."""
+    from sqlmodel import select
+    from app.models import SeatHold
+    
+    client.post(
+        "/api/v1/tickets/hold",
+        headers=auth_headers,
+        json={"screening_id": test_screening.id, "seat_ids": [test_seats[0].id, test_seats[1].id]}
+    )
+    response = client.post(
+        "/api/v1/tickets/book",
+        headers=auth_headers,
+        json={"screening_id": test_screening.id, "seat_ids": [test_seats[0].id, test_seats[1].id]}
+    )
+    assert response.status_code == 201
+    assert session.exec(select(SeatHold)).all() == []
+
+
+def test_expired_hold_does_not_block(client: TestClient, auth_headers, session, test_screening, test_seats):
+    """Test an expired hold no longer blocks other users."""
+    from datetime import datetime, timedelta
+    from app.models import SeatHold
+    
+    hold_id = client.post(
+        "/api/v1/tickets/hold",
+        headers=auth_headers,
+        json={"screening_id": test_screening.id, "seat_ids": [test_seats[0].id]}
+    ).json()[0]["id"]
+    hold = session.get(SeatHold, hold_id)
+    hold.expires_at = datetime.utcnow() - timedelta(minutes=1)
+    session.add(hold)
+    session.commit()
+    
+    response = client.post(
+        "/api/v1/tickets/book",
+        headers=_other_user_headers(session),
+        json={"screening_id": test_screening.id, "seat_ids": [test_seats[0].id]}
+    )
+    assert response.status_code == 201
+
+
+def test_release_hold(client: TestClient, auth_headers, session, test_screening, test_seats):
+    """Test releasing a hold frees the seat, and only the owner can release it."""
+    hold_id = client.post(
+        "/api/v1/tickets/hold",
+        headers=auth_headers,
+        json={"screening_id": test_screening.id, "seat_ids": [test_seats[0].id]}
+    ).json()[0]["id"]
+    
+    response = client.delete(f"/api/v1/tickets/holds/{hold_id}", headers=_other_user_headers(session))
+    assert response.status_code == 403
+    
+    response = client.delete(f"/api/v1/tickets/holds/{hold_id}", headers=auth_headers)
+    assert response.status_code == 204
+    
+    available = client.get(f"/api/v1/screenings/{test_screening.id}/available-seats").json()
+    assert test_seats[0].id in {s["id"] for s in available}
+
+
+def test_hold_reaper_expires_due_holds(session, test_user, test_screening, test_seats):
+    """Test the reaper pops holds in expiry order and deletes expired ones."""
+    from datetime import datetime, timedelta
+    from app.models import SeatHold
+    from app.services.hold_reaper import HoldReaper, expire_holds
+    
+    now = datetime.utcnow()
+    expired = SeatHold(user_id=test_user.id, screening_id=test_screening.id,
+                       seat_id=test_seats[0].id, expires_at=now - timedelta(seconds=1))
+    active = SeatHold(user_id=test_user.id, screening_id=test_screening.id,
+                      seat_id=test_seats[1].id, expires_at=now + timedelta(minutes=5))
+    session.add_all([expired, active])
+    session.commit()
+    
+    reaper = HoldReaper()
+    reaper.schedule([active, expired])
+    due = reaper.pop_due(now)
+    assert due == [expired.id]
+    
+    assert expire_holds(session, due, now) == 1
+    assert session.get(SeatHold, active.id) is not None
+    assert reaper.pop_due(now + timedelta(minutes=10)) == [active.id]
+
+
+# ============= Booking Queue Tests =============
+
+@pytest.fixture(name="queued_booking")
+def queued_booking_fixture(session, monkeypatch):
+    """Route bookings through the per-screening queue."""
+    from sqlmodel import Session
+    from app.config import settings
+    from app.services.booking_queue import booking_coordinator
+    
+    monkeypatch.setattr(settings, "BOOKING_QUEUE_ENABLED", True)
+    monkeypatch.setattr(booking_coordinator, "session_factory", lambda: Session(session.get_bind()))
+    return booking_coordinator
+
+
+def test_queued_booking(client: TestClient, auth_headers, queued_booking, test_screening, test_seats):
+    """Test booking through the queue behaves like a direct booking."""
+    response = client.post(
+        "/api/v1/tickets/book",
+        headers=auth_headers,
+        json={"screening_id": test_screening.id, "seat_ids": [test_seats[0].id, test_seats[1].id]}
+    )
+    assert response.status_code == 201
+    assert {t["seat_id"] for t in response.json()} == {test_seats[0].id, test_seats[1].id}
+    
+    response = client.post(
+        "/api/v1/tickets/book",
+        headers=auth_headers,
+        json={"screening_id": test_screening.id, "seat_ids": [test_seats[1].id]}
+    )
+    assert response.status_code == 409
+
+
+def test_queued_booking_batch_resolves_conflicts(session, queued_booking, test_user, test_screening, test_seats):
+    """Test concurrent bookings in one batch never sell a seat twice."""
+    import asyncio
+    from fastapi import HTTPException
+    from sqlmodel import select
+    from app.models import Ticket
+    
+    seat_ids = [seat.id for seat in test_seats]
+    requests = [
+        [seat_ids[0], seat_ids[1]],
+        [seat_ids[1], seat_ids[2]],  # conflicts with the first request
+        [seat_ids[3]],
+        [seat_ids[3]],  # conflicts with the third request
+        [seat_ids[4]],
+    ]
+    
+    async def book_all():
+        return await asyncio.gather(
+            *(queued_booking.submit(test_user.id, test_screening.id, ids) for ids in requests),
+            return_exceptions=True
+        )
+    
+    results = asyncio.run(book_all())
+    
+    assert [len(r) for r in results if not isinstance(r, Exception)] == [2, 1, 1]
+    assert [t.seat_id for t in results[0]] == [seat_ids[0], seat_ids[1]]
+    conflicts = [r for r in results if isinstance(r, HTTPException)]
+    assert [c.status_code for c in conflicts] == [409, 409]
+    
+    booked = session.exec(
+        select(Ticket.seat_id).where(Ticket.screening_id == test_screening.id)
+    ).all()
+    assert sorted(booked) == sorted([seat_ids[0], seat_ids[1], seat_ids[3], seat_ids[4]])
+
+
+# ============= Best Available Seat Tests =============
+
+def test_book_best_centre_block(client: TestClient, auth_headers, test_screening, test_seats):
+    """Test the allocator picks the block closest to the centre."""
+    # Rows A and B have seats 1-5; a party of 3 gets A2-A4 (the front row
+    # wins the tie between the two equally central rows)
+    response = client.post(
+        "/api/v1/tickets/book-best",
+        headers=auth_headers,
+        json={"screening_id": test_screening.id, "party_size": 3}
+    )
+    assert response.status_code == 201
+    booked = {t["seat_id"] for t in response.json()}
+    assert booked == {test_seats[1].id, test_seats[2].id, test_seats[3].id}
+
+
+def test_book_best_skips_broken_blocks(client: TestClient, auth_headers, test_screening, test_seats):
+    """Test blocks interrupted by booked seats are not used."""
+    client.post(
+        "/api/v1/tickets/book",
+        headers=auth_headers,
+        json={"screening_id": test_screening.id, "seat_ids": [test_seats[2].id]}
+    )
+    response = client.post(
+        "/api/v1/tickets/book-best",
+        headers=auth_headers,
+        json={"screening_id": test_screening.id, "party_size": 3}
+    )
+    assert response.status_code == 201
+    booked = {t["seat_id"] for t in response.json()}
+    assert booked == {test_seats[6].id, test_seats[7].id, test_seats[8].id}
+
+
+def test_book_best_no_block(client: TestClient, auth_headers, test_screening, test_seats):
+    """Test no block is found for too large parties or missing seat types."""
+    response = client.post(
+        "/api/v1/tickets/book-best",
+        headers=auth_headers,
+        json={"screening_id": test_screening.id, "party_size": 6}
+    )
+    assert response.status_code == 409
+    
+    response = client.post(
+        "/api/v1/tickets/book-best",
+        headers=auth_headers,
+        json={"screening_id": test_screening.id, "party_size": 2, "seat_type": "vip"}
+    )
+    assert response.status_code == 409
+    assert "vip" in response.json()["detail"]